@@ -0,0 +1,175 @@
+"""
+Asset Upload
+Finds local image references in generated markdown, uploads the files concurrently and
+rewrites the references to hosted URLs so published pages show them. Assets are content
+addressed: each is stored as <sha256><ext>, and a local store records which of those names
+are already on the host, so a chart shared across companies or unchanged between runs is
+never uploaded again.
+
+The host is any endpoint that accepts `PUT <ASSET_UPLOAD_URL>/<name>` (an S3/R2/GCS bucket
+endpoint, a WebDAV share, a static file server) and serves the file at
+`<ASSET_PUBLIC_URL>/<name>`. Without ASSET_UPLOAD_URL, markdown is published unchanged.
+
+Only image files inside the page's directory are uploaded: references are resolved
+relative to where the page's markdown (and its chart) was written, symlinks and `..` are
+resolved, and anything outside that directory or without an image extension is skipped.
+"""
+
+import os
+import re
+import json
+import asyncio
+import hashlib
+import mimetypes
+
+from rate_limiter import async_transport
+
+ASSET_STORE_PATH = os.environ.get("ASSET_STORE", os.path.join(".cache", "assets.json"))
+IMAGE_REF_PATTERN = re.compile(r'(!\[[^\]]*\]\()([^)\s]+)(\))')
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
+# Names are content hashes, so hosts and CDNs can cache them forever
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _is_remote(ref):
+    return re.match(r'^[a-z][a-z0-9+.-]*:', ref, re.IGNORECASE) is not None
+
+
+def page_dir(base_dir, title):
+    """Directory a page's image references resolve against; base_dir is a path or {title: path}"""
+    if isinstance(base_dir, dict):
+        return base_dir.get(title, '.')
+    return base_dir
+
+
+def resolve_local_image(ref, base_dir='.'):
+    """Real path of a local image reference contained in base_dir, or None"""
+    if _is_remote(ref):
+        return None
+    root = os.path.realpath(base_dir)
+    path = os.path.realpath(os.path.join(root, ref))
+    if os.path.commonpath([root, path]) != root:
+        print(f"Warning: Skipping image outside {base_dir}: {ref}")
+        return None
+    if os.path.splitext(path)[1].lower() not in IMAGE_EXTENSIONS:
+        print(f"Warning: Skipping non-image file: {ref}")
+        return None
+    return path if os.path.isfile(path) else None
+
+
+def find_local_images(markdown, base_dir='.'):
+    """{reference: file path} for image references to image files inside base_dir"""
+    images = {}
+    for ref in dict.fromkeys(match.group(2) for match in IMAGE_REF_PATTERN.finditer(markdown)):
+        path = resolve_local_image(ref, base_dir)
+        if path:
+            images[ref] = path
+    return images
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def asset_name(digest, path):
+    return digest + os.path.splitext(path)[1].lower()
+
+
+def load_store(path=ASSET_STORE_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_store(store, path=ASSET_STORE_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(store, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def rewrite_images(markdown, urls):
+    """Replace image references found in {reference: url}"""
+    return IMAGE_REF_PATTERN.sub(
+        lambda m: m.group(1) + urls.get(m.group(2), m.group(2)) + m.group(3), markdown)
+
+
+async def upload_page_assets_async(pages, base_dir='.', upload_url=None, public_url=None, token=None,
+                                   concurrency=8, store_path=ASSET_STORE_PATH):
+    """Upload the local images of {title: markdown}; returns (rewritten pages, stats).
+
+    base_dir is the directory the markdown was written to, or {title: directory}.
+    """
+    upload_url = (upload_url or os.environ.get("ASSET_UPLOAD_URL") or '').rstrip('/')
+    public_url = (public_url or os.environ.get("ASSET_PUBLIC_URL") or upload_url).rstrip('/')
+    token = token or os.environ.get("ASSET_UPLOAD_TOKEN")
+    stats = {"found": 0, "unique": 0, "uploaded": 0, "reused": 0, "failed": 0}
+
+    refs = {title: find_local_images(md, page_dir(base_dir, title)) for title, md in pages.items()}
+    paths = {path for images in refs.values() for path in images.values()}
+    stats["found"] = len(paths)
+    if not paths or not upload_url:
+        return pages, stats
+
+    # One upload per distinct content, however many files or pages reference it
+    names = {path: asset_name(file_digest(path), path) for path in paths}
+    store = load_store(store_path)
+    uploaded = store.setdefault(public_url, {})
+    pending = {}
+    for path, name in names.items():
+        if name not in uploaded:
+            pending.setdefault(name, path)
+    stats["unique"] = len(set(names.values()))
+    stats["reused"] = stats["unique"] - len(pending)
+
+    if pending:
+        import httpx
+
+        headers = {"Cache-Control": CACHE_CONTROL}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        semaphore = asyncio.Semaphore(concurrency)
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+        async with httpx.AsyncClient(transport=async_transport("assets", limits=limits),
+                                     headers=headers, timeout=60) as client:
+            async def upload(name, path):
+                async with semaphore:
+                    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+                    try:
+                        with open(path, 'rb') as f:
+                            data = f.read()
+                        response = await client.put(f"{upload_url}/{name}", content=data,
+                                                    headers={"Content-Type": content_type})
+                        response.raise_for_status()
+                    except Exception as e:
+                        print(f"Warning: Could not upload {path}: {e}")
+                        stats["failed"] += 1
+                        return
+                    uploaded[name] = os.path.basename(path)
+                    stats["uploaded"] += 1
+
+            await asyncio.gather(*(upload(name, path) for name, path in pending.items()))
+        save_store(store, store_path)
+
+    # Failed uploads keep their local reference (rendered as alt text)
+    rewritten = {}
+    for title, markdown in pages.items():
+        urls = {ref: f"{public_url}/{names[path]}" for ref, path in refs[title].items()
+                if names[path] in uploaded}
+        rewritten[title] = rewrite_images(markdown, urls) if urls else markdown
+    return rewritten, stats
+
+
+def upload_page_assets(pages, **kwargs):
+    """Synchronous wrapper around upload_page_assets_async"""
+    return asyncio.run(upload_page_assets_async(pages, **kwargs))
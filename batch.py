@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Batch Guide Builder
+Builds guides, funnel charts and quality checks for many companies in a process pool,
+streaming each company's result (with per-stage timings) as soon as it finishes.
+
+Usage:
+    python batch.py companies.json --workers 8 --out output
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Workers render charts off-screen; pick the non-interactive backend before pyplot loads
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from takehome_implementation import (
+    load_data,
+    scrape_spec_requirements,
+    build_meesho_guide,
+    build_meta_viz_question,
+    grade_and_refine_content,
+    check_quality_gates,
+)
+import rate_limiter
+
+# Per-process state, filled once by _init_worker so each task skips the CSV load
+_WORKER_STATE = {}
+
+
+def company_slug(name):
+    """Turn a company name into a filesystem-safe directory name"""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'company'
+
+
+def normalize_company_specs(company_specs):
+    """Accept plain names or dicts and return a list of spec dicts with 'company' and 'slug'"""
+    specs = []
+    for spec in company_specs:
+        if isinstance(spec, str):
+            spec = {"company": spec}
+        else:
+            spec = dict(spec)
+        spec.setdefault("slug", company_slug(spec["company"]))
+        specs.append(spec)
+    return specs
+
+
+def _init_worker(spec_requirements, workers=1):
+    """Load the question bank once per worker process"""
+    # Batch requests yield to interactive ones, and each worker gets a share of every API's quota
+    rate_limiter.set_default_priority("batch")
+    for service in rate_limiter.SERVICE_LIMITS:
+        limiter = rate_limiter.bucket(service)
+        rate_limiter.configure(service, rate=limiter.rate / workers, burst=max(1, limiter.burst // workers))
+    df_q, df_ops = load_data()
+    _WORKER_STATE['df_q'] = df_q
+    _WORKER_STATE['df_ops'] = df_ops
+    _WORKER_STATE['spec_requirements'] = spec_requirements
+
+
+def build_company(company_spec, out_dir):
+    """Build guide, chart and quality checks for one company and write them under out_dir"""
+    started = time.perf_counter()
+    timings = {}
+
+    if not _WORKER_STATE:
+        _init_worker(scrape_spec_requirements())
+    df_q = _WORKER_STATE['df_q']
+    spec_requirements = company_spec.get('spec_requirements') or _WORKER_STATE['spec_requirements']
+
+    company = company_spec['company']
+    company_dir = os.path.join(out_dir, company_spec['slug'])
+    os.makedirs(company_dir, exist_ok=True)
+
+    t0 = time.perf_counter()
+    guide_md = build_meesho_guide(df_q, spec_requirements, company=company,
+                                  generate=company_spec.get('generate', False), profile=company_spec)
+    timings['guide'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    chart_path = os.path.join(company_dir, 'funnel.png')
+    viz_md = build_meta_viz_question(chart_path=chart_path, df_ops=_WORKER_STATE['df_ops'])
+    timings['chart'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    guide_md, viz_md = grade_and_refine_content(guide_md, viz_md, spec_requirements,
+                                                verbose=False, company=company, profile=company_spec)
+    issues = check_quality_gates(guide_md, spec_requirements)
+    timings['quality'] = time.perf_counter() - t0
+
+    guide_path = os.path.join(company_dir, 'guide.md')
+    viz_path = os.path.join(company_dir, 'viz.md')
+    with open(guide_path, 'w', encoding='utf-8') as f:
+        f.write(guide_md)
+    with open(viz_path, 'w', encoding='utf-8') as f:
+        f.write(viz_md)
+
+    timings['total'] = time.perf_counter() - started
+    return {
+        "company": company,
+        "guide_path": guide_path,
+        "viz_path": viz_path,
+        "chart_path": chart_path,
+        "issues": issues,
+        "timings": timings,
+        "pid": os.getpid(),
+    }
+
+
+def run_batch(company_specs, out_dir='output', max_workers=None, spec_requirements=None):
+    """Build all companies in a process pool, yielding each result as it completes"""
+    specs = normalize_company_specs(company_specs)
+    if spec_requirements is None:
+        spec_requirements = scrape_spec_requirements()
+    os.makedirs(out_dir, exist_ok=True)
+    workers = max_workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(spec_requirements, workers)) as pool:
+        futures = {pool.submit(build_company, spec, out_dir): spec for spec in specs}
+        for future in as_completed(futures):
+            spec = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {"company": spec['company'], "error": str(e), "timings": {}}
+
+
+def main(argv=None):
+    """Command-line entry point for batch builds"""
+    parser = argparse.ArgumentParser(description="Build guides for many companies in parallel")
+    parser.add_argument("companies", help="JSON file with a list of company names or spec objects")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--out", default="output", help="Output directory")
+    parser.add_argument("--generate", action="store_true",
+                        help="Write section introductions with the LLM (shared cache across companies)")
+    args = parser.parse_args(argv)
+
+    with open(args.companies, encoding='utf-8') as f:
+        company_specs = json.load(f)
+    if args.generate:
+        company_specs = [dict(spec, generate=True) for spec in normalize_company_specs(company_specs)]
+
+    print(f"Building {len(company_specs)} companies...")
+    started = time.perf_counter()
+    results = []
+    for result in run_batch(company_specs, out_dir=args.out, max_workers=args.workers):
+        results.append(result)
+        if result.get("error"):
+            print(f"✗ {result['company']}: Error - {result['error']}")
+        else:
+            t = result["timings"]
+            status = "PASS" if not result["issues"] else f"{len(result['issues'])} issue(s)"
+            print(f"✓ {result['company']}: {status} "
+                  f"(guide {t['guide']:.2f}s, chart {t['chart']:.2f}s, "
+                  f"quality {t['quality']:.2f}s, total {t['total']:.2f}s)")
+
+    elapsed = time.perf_counter() - started
+    failed = sum(1 for r in results if r.get("error"))
+    print(f"\nBuilt {len(results) - failed}/{len(results)} companies in {elapsed:.1f}s")
+
+    with open(os.path.join(args.out, 'batch_results.json'), 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark
+Measures cold start of the entry points in fresh interpreters and fails if the
+preflight path exceeds its budget. Uses -X importtime to name the slowest imports.
+
+Usage:
+    python benchmarks/bench_imports.py [--budget-ms 200] [--runs 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (module, whether it must stay within the startup budget)
+ENTRY_POINTS = [
+    ("preflight", True),
+    ("takehome_implementation", True),
+    ("pipeline", False),
+    ("batch", False),
+]
+
+
+def time_import(module, runs):
+    """Best-of-n wall time to start an interpreter and import module"""
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], cwd=ROOT, check=True)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def slowest_imports(module, top=5):
+    """Largest cumulative import times reported by -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        rows.append((int(cumulative), name))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark entry-point import time")
+    parser.add_argument("--budget-ms", type=float, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    baseline = time_import("sys", args.runs)
+    print(f"Interpreter startup: {baseline * 1000:.0f} ms")
+    over_budget = []
+    for module, budgeted in ENTRY_POINTS:
+        try:
+            elapsed = time_import(module, args.runs)
+        except subprocess.CalledProcessError:
+            print(f"  {module:<26} import failed (missing dependency?)")
+            continue
+        flag = ""
+        if budgeted and elapsed * 1000 > args.budget_ms:
+            flag = f"  OVER {args.budget_ms:.0f} ms BUDGET"
+            over_budget.append(module)
+        print(f"  {module:<26} {elapsed * 1000:6.0f} ms{flag}")
+        for cumulative_us, name in slowest_imports(module, top=3):
+            print(f"      {cumulative_us / 1000:6.1f} ms  {name}")
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Linter throughput benchmark
+Lints a batch of synthetic guides shaped like the generated Meesho guide and reports
+guides/sec and MB/s, so bulk CI validation cost can be tracked.
+
+Usage:
+    python benchmarks/bench_linter.py --guides 5000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quality_linter import lint_markdown, DEFAULT_QUALITY_GATES  # noqa: E402
+
+SECTIONS = ['Role Overview & Culture', 'Interview Process', 'SQL Challenges',
+            'Python for Data Science', 'Machine Learning', 'Experiment Design', 'Metric Definition']
+
+
+def synthetic_guide(rng, company):
+    """A guide with the same structure as build_meesho_guide's output"""
+    parts = [f"# {company} Data Science Interview Guide\n"]
+    for section in SECTIONS:
+        parts.append(f"\n## {section}\n")
+        parts.append(f"{company} expects strong fundamentals in {section.lower()}. " * rng.randint(2, 6))
+        parts.append("\n\n```mermaid\nflowchart TD\n    A[Apply] --> B[Screen]\n```\n" if rng.random() < 0.2 else "\n")
+        parts.append(f"\n### {section} Questions\n\n")
+        for i in range(1, rng.randint(3, 5) + 1):
+            parts.append(f"{i}. Sample question {i} about {section.lower()} at {company}?\n")
+        parts.append("\n")
+        for i in range(rng.randint(3, 6)):
+            parts.append(f"- **Tip {i}**: see [resource {i}](https://www.interviewquery.com/r/{i})\n")
+    parts.append("\n---\n*This guide is part of the Interview Query take-home assignment series.*\n")
+    return ''.join(parts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the quality-gate linter")
+    parser.add_argument("--guides", type=int, default=5000, help="Number of guides to lint")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    guides = [synthetic_guide(rng, f"Company{i}") for i in range(args.guides)]
+    total_bytes = sum(len(g.encode('utf-8')) for g in guides)
+
+    started = time.perf_counter()
+    failing = 0
+    for guide in guides:
+        report = lint_markdown(guide, required_sections=SECTIONS, quality_gates=DEFAULT_QUALITY_GATES)
+        failing += not report["passed"]
+    elapsed = time.perf_counter() - started
+
+    print(f"Linted {len(guides)} guides ({total_bytes / 1e6:.1f} MB) in {elapsed:.2f}s")
+    print(f"  {len(guides) / elapsed:,.0f} guides/sec, {total_bytes / 1e6 / elapsed:.1f} MB/s")
+    print(f"  {failing} guides with violations")
+
+
+if __name__ == "__main__":
+    main()
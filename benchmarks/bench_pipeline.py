@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Pipeline benchmark
+Times load_data, build_meesho_guide (in-memory and streamed from the CSV) and
+grade_and_refine_content on synthetic question banks from 1k to 1M rows, compute_funnel
+on event tables of the same sizes, plus create_funnel_chart and publishing against the
+local Notion stub, recording wall time and tracemalloc peak memory for each. Results are
+compared with stored baselines and the run fails on regressions beyond the threshold.
+
+Usage:
+    python benchmarks/bench_pipeline.py                      # compare with baselines.json
+    python benchmarks/bench_pipeline.py --sizes 1000,10000   # smaller banks
+    python benchmarks/bench_pipeline.py --save-baseline      # record the current numbers
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import tracing  # noqa: E402
+from bench_linter import SECTIONS  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_THRESHOLD = 0.25
+# Differences below these are noise, whatever the ratio
+MIN_DELTA_S = 0.005
+MIN_DELTA_BYTES = 1 << 20
+
+CATEGORIES = ['SQL', 'Python', 'Statistics', 'Machine Learning', 'Analytics',
+              'Product Metrics', 'A/B Testing', 'Probability', 'Algorithms', 'Case Study']
+WORDS = ['query', 'window', 'join', 'aggregate', 'pandas', 'function', 'regression', 'model',
+         'feature', 'experiment', 'p-value', 'metric', 'funnel', 'retention', 'conversion',
+         'revenue', 'customers', 'sellers', 'orders', 'recommendation', 'churn', 'outlier',
+         'distribution', 'sample', 'hypothesis', 'evaluate', 'design', 'estimate', 'rank']
+SPEC = {
+    'meesho_sections': SECTIONS,
+    'meta_requirements': ['context', 'visualization', 'solution'],
+    'quality_gates': ['no_h4_headers', 'max_5_bullets', 'anchor_links'],
+    'conclusion_links': ['success_story', 'question_list', 'learning_path'],
+}
+
+
+def write_synthetic_bank(path, rows, seed=0):
+    """Write a question bank CSV with the real bank's columns"""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Category', 'Question', 'Difficulty'])
+        for i in range(rows):
+            words = ' '.join(rng.choices(WORDS, k=rng.randint(6, 14)))
+            writer.writerow([rng.choice(CATEGORIES), f"Q{i}: How would you {words}?",
+                             rng.choice(('Easy', 'Medium', 'Hard'))])
+
+
+def write_synthetic_ops(path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Operation', 'Time_Hours', 'Success_Rate'])
+        for name, hours, rate in [('Data Collection', 2, 0.95), ('Data Processing', 4, 0.90),
+                                  ('Model Training', 8, 0.85), ('Deployment', 3, 0.92)]:
+            writer.writerow([name, hours, rate])
+
+
+def write_synthetic_events(path, rows, seed=0):
+    """Event-level ops data: one row per shipment reaching a funnel stage"""
+    from funnel_engine import FUNNEL_STAGES
+
+    rng = random.Random(seed)
+    survival = (1.0, 0.85, 0.82, 0.86, 0.75)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Shipment_ID', 'Stage'])
+        written, shipment = 0, 0
+        while written < rows:
+            for stage, keep in zip(FUNNEL_STAGES, survival):
+                if rng.random() > keep or written >= rows:
+                    break
+                writer.writerow([shipment, stage])
+                written += 1
+            shipment += 1
+
+
+def measure(tracer, name, fn, repeat=3, setup=None):
+    """Best-of-n wall time and the largest peak memory; returns (record, last result)"""
+    walls, peaks = [], []
+    result = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        with tracer.span(name) as span:
+            result = fn()
+        walls.append(span["wall_s"])
+        peaks.append(span.get("peak_mem_bytes", 0))
+    return {"wall_s": min(walls), "peak_mem_bytes": max(peaks)}, result
+
+
+def start_notion_stub():
+    import notion_stub
+    import rate_limiter
+
+    # Measure the publishing code, not the client-side Notion quota
+    rate_limiter.configure("notion", rate=1000.0, burst=1000)
+    server = notion_stub.make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def run_benchmarks(sizes, repeat, workdir):
+    """Run every benchmark inside workdir (so caches start empty); returns {name: record}"""
+    import chart_service
+    import takehome_implementation as ti
+    from funnel_engine import compute_funnel
+    from question_store import load_table
+
+    tracer = tracing.Tracer()
+    results = {}
+    ops_path = os.path.join(workdir, 'ops.csv')
+    write_synthetic_ops(ops_path)
+    table_cache = os.path.join(workdir, '.cache', 'tables')
+
+    guide_md = meta_md = None
+    for rows in sizes:
+        bank_path = os.path.join(workdir, f'bank_{rows}.csv')
+        write_synthetic_bank(bank_path, rows)
+
+        def load():
+            return ti.load_data(bank_path, ops_path)
+
+        results[f"load_data[{rows},cold]"], _ = measure(
+            tracer, f"load_data[{rows},cold]", load, repeat,
+            setup=lambda: shutil.rmtree(table_cache, ignore_errors=True))
+        results[f"load_data[{rows},warm]"], (df_q, _) = measure(tracer, f"load_data[{rows},warm]", load, repeat)
+        results[f"build_meesho_guide[{rows}]"], guide_md = measure(
+            tracer, f"build_meesho_guide[{rows}]", lambda: ti.build_meesho_guide(df_q, SPEC), repeat)
+        if meta_md is None:
+            meta_md = ti.build_meta_viz_question(os.path.join(workdir, 'meta_funnel.png'))
+        results[f"grade_and_refine_content[{rows}]"], _ = measure(
+            tracer, f"grade_and_refine_content[{rows}]",
+            lambda: ti.grade_and_refine_content(guide_md, meta_md, SPEC, verbose=False), repeat)
+        results[f"build_meesho_guide[{rows},stream]"], _ = measure(
+            tracer, f"build_meesho_guide[{rows},stream]",
+            lambda: ti.build_meesho_guide(bank_path, SPEC), repeat)
+        os.remove(bank_path)
+
+        events_path = os.path.join(workdir, f'events_{rows}.csv')
+        write_synthetic_events(events_path, rows)
+        events = load_table(events_path, cache_dir=table_cache)
+        results[f"compute_funnel[{rows}]"], _ = measure(
+            tracer, f"compute_funnel[{rows}]", lambda: compute_funnel(events), repeat)
+        results[f"compute_funnel[{rows},per-shipment]"], _ = measure(
+            tracer, f"compute_funnel[{rows},per-shipment]",
+            lambda: compute_funnel(events, entity_column='Shipment_ID'), repeat)
+        os.remove(events_path)
+
+    chart_path = os.path.join(workdir, 'funnel.png')
+
+    def clear_chart_cache():
+        chart_service._memory_cache.clear()
+        shutil.rmtree(os.path.join(workdir, '.cache', 'charts'), ignore_errors=True)
+        if os.path.exists(chart_path):
+            os.remove(chart_path)
+
+    results["create_funnel_chart[cold]"], _ = measure(
+        tracer, "create_funnel_chart[cold]", lambda: ti.create_funnel_chart(chart_path), repeat,
+        setup=clear_chart_cache)
+    results["create_funnel_chart[warm]"], _ = measure(
+        tracer, "create_funnel_chart[warm]", lambda: ti.create_funnel_chart(chart_path), repeat)
+
+    server, base_url = start_notion_stub()
+    try:
+        pages = {"Meesho Data Scientist Guide": guide_md, "Meta Supply-Chain Viz Question": meta_md}
+        results["publish_pages[stub]"], urls = measure(
+            tracer, "publish_pages[stub]",
+            lambda: ti.publish_pages(pages, parent_id="bench", token="stub", base_url=base_url), repeat)
+        if any('/mock-' in url for url in urls.values()):
+            raise RuntimeError("publishing to the Notion stub failed")
+    finally:
+        server.shutdown()
+    return results
+
+
+def compare(results, baselines, threshold):
+    """Return a list of regression messages"""
+    regressions = []
+    for name, record in results.items():
+        base = baselines.get(name)
+        if not base:
+            continue
+        for metric, floor in (("wall_s", MIN_DELTA_S), ("peak_mem_bytes", MIN_DELTA_BYTES)):
+            current, previous = record[metric], base.get(metric, 0)
+            if previous and current > previous * (1 + threshold) and current - previous > floor:
+                regressions.append(f"{name} {metric}: {previous:,.4g} -> {current:,.4g} "
+                                   f"(+{(current / previous - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages with regression checks")
+    parser.add_argument("--sizes", default=','.join(str(s) for s in SIZES),
+                        help="Comma-separated question bank sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark (best wall time wins)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown / memory growth as a fraction (default 0.25)")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--json", default=None, help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    import tracemalloc
+    tracemalloc.start()
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    workdir = tempfile.mkdtemp(prefix='bench-pipeline-')
+    cwd = os.getcwd()
+    try:
+        os.chdir(workdir)
+        started = time.perf_counter()
+        results = run_benchmarks(sizes, args.repeat, workdir)
+        elapsed = time.perf_counter() - started
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    try:
+        with open(args.baseline, encoding='utf-8') as f:
+            baselines = json.load(f)
+    except (OSError, ValueError):
+        baselines = {}
+
+    print(f"{'benchmark':<40} {'wall':>10} {'peak mem':>12} {'vs baseline':>12}")
+    for name, record in results.items():
+        base = baselines.get(name, {}).get("wall_s")
+        change = f"{(record['wall_s'] / base - 1) * 100:+.0f}%" if base else "-"
+        print(f"{name:<40} {record['wall_s'] * 1000:8.1f}ms {record['peak_mem_bytes'] / 1e6:9.1f} MB "
+              f"{change:>12}")
+    print(f"Finished in {elapsed:.1f}s")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        baselines.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baselines, args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if not baselines:
+        print("No baseline yet; run with --save-baseline to record one")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Publish load test
+Publishes N synthetic guides through the real publishing code (notion_blocks client,
+rate limiter and all) against the local Notion stub, at one or more concurrency levels,
+and reports pages/sec, p50/p99 page latency and errors. The stub can add latency, enforce
+a server-side rate limit and inject 429s, so concurrency can be tuned before a large batch
+hits the real API.
+
+Usage:
+    python benchmarks/load_publish.py --pages 50 --concurrency 1,5,10
+    python benchmarks/load_publish.py --latency 0.1 --rate-limit 3      # Notion-like server
+    python benchmarks/load_publish.py --throttle 0.05 --client-rate 50  # retries under 429s
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import threading
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import rate_limiter  # noqa: E402
+
+WORDS = ['query', 'window', 'join', 'pandas', 'regression', 'experiment', 'metric', 'funnel',
+         'retention', 'conversion', 'sellers', 'orders', 'churn', 'hypothesis', 'sample']
+
+
+def synthetic_guide(index, blocks=150, seed=0):
+    """A guide-shaped markdown page of about `blocks` blocks"""
+    rng = random.Random(seed * 100_003 + index)
+    lines = [f"# Synthetic Guide {index}", "", "Prepared with Interview Query.", ""]
+    while len(lines) < blocks:
+        lines.append(f"## {' '.join(rng.sample(WORDS, 2)).title()}")
+        lines.append(' '.join(rng.choice(WORDS) for _ in range(rng.randint(20, 60))) + '.')
+        lines.extend(f"- **{rng.choice(WORDS)}**: {' '.join(rng.sample(WORDS, 5))}" for _ in range(5))
+        if rng.random() < 0.3:
+            lines.extend(["```sql", "SELECT seller_id, COUNT(*) FROM orders GROUP BY 1;", "```"])
+    return '\n'.join(lines)
+
+
+def percentile(values, q):
+    """Nearest-rank percentile (q in 0-100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered))) - 1))]
+
+
+def start_stub(**options):
+    import notion_stub
+
+    server = notion_stub.make_server(port=0, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _error_name(error):
+    code = getattr(error, 'code', None)
+    return f"{type(error).__name__}({code})" if code else type(error).__name__
+
+
+async def publish_all(pages, base_url, concurrency):
+    """Publish {title: markdown} like publish_pages_async, timing each page"""
+    from notion_blocks import create_async_client, publish_page_async
+
+    notion = create_async_client("stub", base_url, max_connections=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors, urls = [], Counter(), {}
+
+    async def publish_one(title, markdown):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                urls[title] = await publish_page_async(notion, "load-test", title, markdown)
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                errors[_error_name(e)] += 1
+
+    try:
+        await asyncio.gather(*(publish_one(t, md) for t, md in pages.items()))
+    finally:
+        await notion.aclose()
+    return latencies, errors, urls
+
+
+def run_level(pages, concurrency, stub_options, verify=False):
+    server, base_url = start_stub(**stub_options)
+    store = server.RequestHandlerClass.store
+    before = rate_limiter.stats().get("notion", {})
+    try:
+        started = time.perf_counter()
+        latencies, errors, urls = asyncio.run(publish_all(pages, base_url, concurrency))
+        elapsed = time.perf_counter() - started
+        failing = 0
+        if verify and urls:
+            from url_verifier import verify_urls
+            failing = sum(r["status"] != "PASS" for r in verify_urls(urls).values())
+    finally:
+        server.shutdown()
+    after = rate_limiter.stats().get("notion", {})
+    return {
+        "concurrency": concurrency,
+        "pages": len(pages),
+        "published": len(latencies),
+        "seconds": elapsed,
+        "pages_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_s": percentile(latencies, 50),
+        "p99_s": percentile(latencies, 99),
+        "errors": dict(errors),
+        "requests": store.requests,
+        "server_429s": store.throttled,
+        "server_400s": store.rejected,
+        "client_wait_s": after.get("wait_s", 0.0) - before.get("wait_s", 0.0),
+        "verify_failures": failing,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test publishing against the local Notion stub")
+    parser.add_argument("--pages", type=int, default=50, help="Synthetic guides to publish per level")
+    parser.add_argument("--blocks", type=int, default=150, help="Approximate blocks per guide")
+    parser.add_argument("--concurrency", default="1,5,10", help="Comma-separated concurrency levels")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Stub random extra seconds per request")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Stub requests/second before 429")
+    parser.add_argument("--throttle", type=float, default=0.0, help="Stub chance of a random 429")
+    parser.add_argument("--client-rate", type=float, default=None,
+                        help="Override the client-side Notion rate limit (requests/second)")
+    parser.add_argument("--verify", action="store_true", help="Also self-test the published URLs")
+    parser.add_argument("--json", default=None, help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.client_rate:
+        rate_limiter.configure("notion", rate=args.client_rate, burst=max(1, int(args.client_rate)))
+    stub_options = {"latency": args.latency, "jitter": args.jitter, "rate_limit": args.rate_limit,
+                    "throttle": args.throttle}
+    pages = {f"Synthetic Guide {i}": synthetic_guide(i, args.blocks) for i in range(args.pages)}
+
+    results = []
+    print(f"{'concurrency':>11} {'pages/s':>9} {'p50':>9} {'p99':>9} {'requests':>9} {'429s':>6} "
+          f"{'wait':>8}  errors")
+    for level in [int(c) for c in args.concurrency.split(',') if c]:
+        result = run_level(pages, level, stub_options, args.verify)
+        results.append(result)
+        errors = ', '.join(f"{name}×{n}" for name, n in result["errors"].items()) or "none"
+        if result["verify_failures"]:
+            errors += f"; {result['verify_failures']} failed self-test"
+        print(f"{level:>11} {result['pages_per_s']:9.2f} {result['p50_s'] * 1000:7.0f}ms "
+              f"{result['p99_s'] * 1000:7.0f}ms {result['requests']:>9} {result['server_429s']:>6} "
+              f"{result['client_wait_s']:7.1f}s  {errors}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 1 if any(r["errors"] or r["verify_failures"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
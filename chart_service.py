@@ -0,0 +1,152 @@
+"""
+Chart Service
+Renders charts with matplotlib's object-oriented Agg API into in-memory PNG buffers
+(no global pyplot state, so worker processes and threads render independently).
+Outputs are cached under a hash of the chart data and style, and PNGs over the size
+budget are re-rendered at lower dpi or palette-quantized until they fit.
+"""
+
+import os
+import json
+import hashlib
+from io import BytesIO
+
+CHART_CACHE_DIR = os.path.join(".cache", "charts")
+# takehome.yaml: meta_funnel.png must stay under 50 KB
+DEFAULT_MAX_BYTES = 50 * 1024
+DPI_LADDER = (150, 120, 100, 80, 72)
+QUANTIZE_COLORS = (64, 32, 16)
+# Bump when rendering code changes so stale cached PNGs are not reused
+RENDERER_VERSION = 1
+
+FUNNEL_STYLE = {
+    "title": "Meta Supply Chain Efficiency Funnel",
+    "colors": ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7'],
+    "figsize": [10, 8],
+}
+
+_memory_cache = {}
+
+
+def chart_key(kind, data, style, max_bytes):
+    """Content address for a chart: data, style, budget and renderer version"""
+    payload = json.dumps({"kind": kind, "data": data, "style": style, "max_bytes": max_bytes,
+                          "version": RENDERER_VERSION}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def draw_funnel(fig, data, style):
+    """Draw a centered horizontal-bar funnel onto a Figure"""
+    stages, values = data["stages"], data["values"]
+    colors = style["colors"]
+    ax = fig.add_subplot(111)
+    top = max(values) if values and max(values) > 0 else 100
+    labels = data.get("labels") or [f'{v:g}%' for v in values]
+
+    for i, (stage, value, label) in enumerate(zip(stages, values, labels)):
+        # Calculate bar width based on value
+        width = value / top * 8  # Scale to reasonable width
+        x_center = 5 - width / 2  # Center the bars
+
+        ax.barh(i, width, left=x_center, height=0.6,
+                color=colors[i % len(colors)], alpha=0.8, edgecolor='white', linewidth=2)
+        ax.text(5, i, label, ha='center', va='center',
+                fontweight='bold', fontsize=12, color='white')
+        ax.text(1, i, stage, ha='left', va='center',
+                fontweight='bold', fontsize=11)
+
+    ax.set_xlim(0, 10)
+    ax.set_ylim(-0.5, len(stages) - 0.5)
+    ax.set_yticks([])
+    ax.set_xticks([])
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    ax.set_title(style["title"], fontsize=16, fontweight='bold', pad=20)
+
+
+DRAWERS = {"funnel": draw_funnel}
+
+
+def render_png(kind, data, style, dpi):
+    """Render one chart to PNG bytes using a standalone Agg canvas"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=style.get("figsize", [10, 8]))
+    FigureCanvasAgg(fig)
+    DRAWERS[kind](fig, data, style)
+    fig.tight_layout()
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight',
+                facecolor='white', edgecolor='none')
+    return buf.getvalue()
+
+
+def quantize_png(png, colors):
+    """Reduce a PNG to an adaptive palette; flat-colored charts lose nothing visible"""
+    from PIL import Image
+
+    image = Image.open(BytesIO(png)).convert('RGB').quantize(colors=colors)
+    buf = BytesIO()
+    image.save(buf, format='PNG', optimize=True)
+    return buf.getvalue()
+
+
+def render_within_budget(kind, data, style, max_bytes=DEFAULT_MAX_BYTES):
+    """Render at the highest dpi that fits the budget, quantizing before dropping dpi.
+
+    Returns (png_bytes, info) where info records the dpi and palette used.
+    """
+    smallest = None
+    for dpi in DPI_LADDER:
+        png = render_png(kind, data, style, dpi)
+        if len(png) <= max_bytes:
+            return png, {"dpi": dpi, "colors": None, "bytes": len(png)}
+        for colors in QUANTIZE_COLORS:
+            quantized = quantize_png(png, colors)
+            if smallest is None or len(quantized) < len(smallest[0]):
+                smallest = (quantized, {"dpi": dpi, "colors": colors, "bytes": len(quantized)})
+            if len(quantized) <= max_bytes:
+                return quantized, {"dpi": dpi, "colors": colors, "bytes": len(quantized)}
+
+    print(f"Warning: chart is {smallest[1]['bytes']} bytes, over the {max_bytes} byte budget")
+    return smallest
+
+
+def get_chart(kind, data, style, max_bytes=DEFAULT_MAX_BYTES, cache_dir=CHART_CACHE_DIR):
+    """Return PNG bytes for a chart, rendering only on a cache miss"""
+    key = chart_key(kind, data, style, max_bytes)
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    path = os.path.join(cache_dir, f"{key}.png")
+    try:
+        with open(path, 'rb') as f:
+            png = f.read()
+    except OSError:
+        png, _ = render_within_budget(kind, data, style, max_bytes)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{path}.tmp-{os.getpid()}"
+            with open(tmp_path, 'wb') as f:
+                f.write(png)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not cache chart: {e}")
+
+    _memory_cache[key] = png
+    return png
+
+
+def write_if_changed(path, data):
+    """Write bytes to path unless the file already holds exactly those bytes"""
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
@@ -0,0 +1,135 @@
+"""
+Funnel Engine
+Computes supply-chain funnel stage counts, conversion and drop-off from event-level ops
+data. Stage names are integer-encoded once (reusing a cached table's categorical codes)
+and counted with np.bincount, or with a boolean entity x stage bitmap when each entity
+should count once per stage, so tens of millions of events take seconds. The result feeds
+both the funnel chart and the insight text of the Meta viz question.
+"""
+
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+FUNNEL_STAGES = ['Raw Materials', 'Manufacturing', 'Distribution', 'Retail', 'Customer']
+# Used when ops data has no stage column (e.g. the bundled mock ops table)
+DEFAULT_STAGE_COUNTS = [100, 85, 70, 60, 45]
+STAGE_COLUMN = 'Stage'
+
+# Insight text per stage: what the drop-off into that stage means
+STAGE_NOTES = {
+    'Raw Materials': 'Starting point with all suppliers',
+    'Manufacturing': 'loss due to quality issues and delays',
+    'Distribution': 'loss from logistics inefficiencies',
+    'Retail': 'loss from inventory management issues',
+    'Customer': 'loss from delivery and satisfaction problems',
+}
+BOTTLENECK_LABELS = {
+    'Raw Materials': 'Supplier intake',
+    'Manufacturing': 'Manufacturing quality',
+    'Distribution': 'Distribution logistics',
+    'Retail': 'Retail inventory management',
+    'Customer': 'Customer delivery and satisfaction',
+}
+
+
+def _codes(table, column):
+    """Integer codes and their labels for a column of a CachedTable or DataFrame"""
+    import pandas as pd
+    from question_store import CachedTable
+
+    if isinstance(table, CachedTable):
+        categories = table.categories(column)
+        if categories is not None:
+            return np.asarray(table.codes(column)), categories
+        values = np.asarray(table.column(column), dtype=object)
+    else:
+        values = table[column]
+    codes, labels = pd.factorize(values)
+    return codes, [str(label) for label in labels]
+
+
+def funnel_from_counts(stages, counts, source='ops'):
+    """Conversion and drop-off metrics from per-stage counts"""
+    counts = [int(c) for c in counts]
+    first = counts[0] if counts and counts[0] > 0 else 1
+    percent = [round(c / first * 100, 1) for c in counts]
+    step_conversion = [1.0] + [round(counts[i] / counts[i - 1], 4) if counts[i - 1] else 0.0
+                               for i in range(1, len(counts))]
+    drop_off = [0.0] + [round(percent[i - 1] - percent[i], 1) for i in range(1, len(percent))]
+    return {
+        "stages": list(stages),
+        "counts": counts,
+        "percent": percent,
+        "step_conversion": step_conversion,
+        "drop_off": drop_off,
+        "overall_conversion": percent[-1] if percent else 0.0,
+        "source": source,
+    }
+
+
+def compute_funnel(ops, stages=FUNNEL_STAGES, stage_column=STAGE_COLUMN, entity_column=None):
+    """Funnel metrics from event rows; with entity_column, each entity counts once per stage"""
+    codes, labels = _codes(ops, stage_column)
+    # Map label codes to funnel positions; the trailing -1 catches missing values (code -1)
+    position = {stage: i for i, stage in enumerate(stages)}
+    lookup = np.array([position.get(label, -1) for label in labels] + [-1], dtype=np.int64)
+    stage_ids = lookup[codes]
+    valid = stage_ids >= 0
+
+    if entity_column is None:
+        counts = np.bincount(stage_ids[valid], minlength=len(stages))
+    else:
+        entity_ids, entities = _codes(ops, entity_column)
+        valid &= entity_ids >= 0
+        reached = np.zeros((len(entities), len(stages)), dtype=bool)
+        reached[entity_ids[valid], stage_ids[valid]] = True
+        counts = reached.sum(axis=0)
+    return funnel_from_counts(stages, counts)
+
+
+def default_funnel(stages=FUNNEL_STAGES, counts=DEFAULT_STAGE_COUNTS):
+    return funnel_from_counts(stages, counts, source='default')
+
+
+def funnel_from_ops(ops, stages=FUNNEL_STAGES, stage_column=STAGE_COLUMN, entity_column=None):
+    """compute_funnel when ops has event data, otherwise the default funnel"""
+    if ops is None or stage_column not in ops.columns or len(ops) == 0:
+        return default_funnel(stages)
+    if entity_column is not None and entity_column not in ops.columns:
+        entity_column = None
+    return compute_funnel(ops, stages, stage_column, entity_column)
+
+
+def _fmt(value):
+    return f"{value:g}"
+
+
+def chart_data(funnel):
+    """Chart input: stage names and percentages of the first stage"""
+    return {"stages": funnel["stages"],
+            "values": [int(p) if p == int(p) else p for p in funnel["percent"]]}
+
+
+def funnel_summary(funnel):
+    """Pre-formatted insight text for the viz question template"""
+    stages, percent, drop_off = funnel["stages"], funnel["percent"], funnel["drop_off"]
+    insights = []
+    for i, stage in enumerate(stages):
+        note = STAGE_NOTES.get(stage, 'loss at this stage')
+        text = note if i == 0 else f"{_fmt(drop_off[i])}% {note}"
+        insights.append(f"**{stage} ({_fmt(percent[i])}%)**: {text}")
+
+    # Largest losses first; on ties the stage closer to the customer comes first
+    ranked = sorted(range(1, len(stages)), key=lambda i: (-drop_off[i], -i))
+
+    def bottleneck(i):
+        return f"{BOTTLENECK_LABELS.get(stages[i], stages[i])} ({_fmt(drop_off[i])}% loss)"
+
+    return {
+        "insights": insights,
+        "overall": _fmt(funnel["overall_conversion"]),
+        "bottleneck": bottleneck(ranked[0]) if ranked else "None",
+        "secondary": bottleneck(ranked[1]) if len(ranked) > 1 else "None",
+        "stage_percent": {stage: _fmt(p) for stage, p in zip(stages, percent)},
+    }
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Guide Server
+A long-running build server that keeps the question bank, spec requirements, question
+selections, compiled templates and the Agg chart backend warm in memory, and serves
+build, lint and publish requests over a local HTTP API. Work runs on a bounded thread
+pool; requests beyond the queue limit get 503 with Retry-After instead of piling up.
+
+Usage:
+    python guide_server.py --port 8770 --workers 4 --max-queue 32
+
+    curl -s localhost:8770/build -d '{"company": "Flipkart"}'
+    curl -s localhost:8770/lint -d '{"markdown": "# Title\\n#### Too deep"}'
+    curl -s localhost:8770/publish -d '{"company": "Flipkart", "upsert": true}'
+    curl -s localhost:8770/publish -d '{"build_id": "<id from /build>"}'
+
+Builds write their chart into a server-owned directory (one per build, under --output-dir)
+and /publish only publishes guides the server built itself.
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Charts render off-screen; pick the non-interactive backend before matplotlib loads
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import takehome_implementation as ti  # noqa: E402
+from chart_service import FUNNEL_STYLE, get_chart  # noqa: E402
+from funnel_engine import chart_data, funnel_from_ops  # noqa: E402
+from quality_linter import lint_markdown  # noqa: E402
+from question_selection import select_questions  # noqa: E402
+from rate_limiter import priority  # noqa: E402
+from template_engine import get_template  # noqa: E402
+
+DEFAULT_PORT = 8770
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_QUEUE = 32
+REQUEST_TIMEOUT = 120
+MAX_BODY_BYTES = 5 * 1024 * 1024
+OUTPUT_DIR = os.path.join(".cache", "guide_server")
+MAX_BUILDS = 64
+
+
+class QueueFull(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+class WarmState:
+    """Everything a build needs, loaded once and shared by the worker threads"""
+
+    def __init__(self, output_dir=OUTPUT_DIR, max_builds=MAX_BUILDS):
+        self._lock = threading.Lock()
+        self._selections = {}
+        self.output_dir = output_dir
+        self.max_builds = max_builds
+        self._builds = OrderedDict()  # build id -> {"company", "pages", "dir"}
+        self.reload()
+
+    def reload(self):
+        """(Re)load the bank and spec and warm the chart and template backends"""
+        started = time.perf_counter()
+        df_q, df_ops = ti.load_data()
+        spec_requirements = ti.scrape_spec_requirements()
+        # Render once so the chart is in the chart service's memory cache
+        get_chart("funnel", chart_data(funnel_from_ops(df_ops)), FUNNEL_STYLE)
+        for name in ("company_guide.md", "meta_viz.md", "guide_conclusion.md"):
+            get_template(name)
+        with self._lock:
+            self.df_q, self.df_ops, self.spec_requirements = df_q, df_ops, spec_requirements
+            self._selections = {}
+            self.loaded_at = time.time()
+        self.load_seconds = time.perf_counter() - started
+
+    def selections(self, sections):
+        """Question selections don't depend on the company, so compute them once per outline"""
+        key = tuple(sections)
+        with self._lock:
+            cached = self._selections.get(key)
+        if cached is None:
+            cached = select_questions(self.df_q, list(sections), k=5, dedupe=True)
+            with self._lock:
+                self._selections[key] = cached
+        return cached
+
+    def new_build_dir(self):
+        """(build id, directory) for one build's files; names never come from the request"""
+        build_id = uuid.uuid4().hex
+        build_dir = os.path.join(self.output_dir, build_id)
+        os.makedirs(build_dir)
+        return build_id, build_dir
+
+    def remember(self, build_id, build):
+        """Keep a build for /publish, dropping (and deleting) the oldest beyond max_builds"""
+        with self._lock:
+            self._builds[build_id] = build
+            evicted = []
+            while len(self._builds) > self.max_builds:
+                evicted.append(self._builds.popitem(last=False)[1])
+        for old in evicted:
+            shutil.rmtree(old["dir"], ignore_errors=True)
+
+    def get_build(self, build_id):
+        with self._lock:
+            return self._builds.get(build_id)
+
+
+def build(state, request):
+    """Build (and grade) one company's guide and viz question"""
+    started = time.perf_counter()
+    company = request.get("company", "Meesho")
+    overrides = request.get("spec_requirements", {})
+    if not isinstance(overrides, dict):
+        raise BadRequest("spec_requirements must be an object")
+    spec_requirements = dict(state.spec_requirements, **overrides)
+    sections = spec_requirements['meesho_sections']
+    profile = request.get("profile", {})
+    if not isinstance(profile, dict):
+        raise BadRequest("profile must be an object")
+
+    guide_md = ti.build_meesho_guide(state.df_q, spec_requirements, company=company,
+                                     generate=request.get("generate", False),
+                                     selections=state.selections(sections), profile=profile)
+    build_id, build_dir = state.new_build_dir()
+    try:
+        result = {"build_id": build_id, "company": company, "guide": guide_md}
+        if request.get("viz", True):
+            # Each build gets its own chart file, so concurrent builds never share one
+            chart_path = os.path.join(build_dir, "meta_funnel.png")
+            result["viz"] = ti.build_meta_viz_question(chart_path=chart_path, df_ops=state.df_ops)
+        result["guide"], result["viz"] = ti.grade_and_refine_content(result["guide"], result.get("viz"),
+                                                                     spec_requirements, verbose=False,
+                                                                     company=company, profile=profile)
+        if result["viz"] is None:
+            del result["viz"]
+        result["issues"] = ti.check_quality_gates(result["guide"], spec_requirements)
+    except Exception:
+        # Only remembered builds are evicted later, so a failed one cleans up after itself
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+
+    pages = {f"{company} Data Scientist Guide": result["guide"]}
+    if "viz" in result:
+        pages["Meta Supply-Chain Viz Question"] = result["viz"]
+    state.remember(build_id, {"company": company, "pages": pages, "dir": build_dir})
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def lint(state, request):
+    """Lint markdown against the outline sections and quality gates"""
+    sections = request.get("required_sections", state.spec_requirements['meesho_sections'])
+    return lint_markdown(request["markdown"], required_sections=sections)
+
+
+def publish(state, request):
+    """Publish a guide this server built (by build_id), or build a company's guide and publish it"""
+    if "pages" in request:
+        raise BadRequest("publish takes a build_id or a company, not pages")
+    build_id = request.get("build_id")
+    if build_id is None:
+        build_id = build(state, request)["build_id"]
+    built = state.get_build(build_id)
+    if built is None:
+        raise BadRequest(f"unknown build_id {build_id}")
+    pages = built["pages"]
+    if request.get("upsert"):
+        from notion_sync import upsert_pages
+        urls, stats = upsert_pages(pages, base_dir=built["dir"])
+        return {"build_id": build_id, "urls": urls, "stats": stats}
+    return {"build_id": build_id, "urls": ti.publish_pages(pages, base_dir=built["dir"])}
+
+
+def reload(state, request):
+    state.reload()
+    return {"loaded_at": state.loaded_at, "seconds": state.load_seconds}
+
+
+def _interactive(handler, state, request):
+    # API callers are waiting on the response, so their outbound requests skip batch work
+    with priority("interactive"):
+        return handler(state, request)
+
+
+ROUTES = {
+    "/build": build,
+    "/lint": lint,
+    "/publish": publish,
+    "/reload": reload,
+}
+
+
+class WorkerPool:
+    """Thread pool with a cap on queued plus running requests"""
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_queue=DEFAULT_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="guide-worker")
+        self._lock = threading.Lock()
+        self.pending = 0
+
+    def submit(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.workers + self.max_queue:
+                raise QueueFull()
+            self.pending += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self.pending -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+class GuideRequestHandler(BaseHTTPRequestHandler):
+    state = None
+    pool = None
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "pending": self.pool.pending, "workers": self.pool.workers,
+                                  "max_queue": self.pool.max_queue, "loaded_at": self.state.loaded_at})
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        handler = ROUTES.get(self.path)
+        if handler is None:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        if length > MAX_BODY_BYTES:
+            # The unread body would corrupt the next request on this connection
+            self.close_connection = True
+            self._send_json(413, {"error": "request body too large"})
+            return
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._send_json(400, {"error": f"invalid JSON: {e}"})
+            return
+        if not isinstance(request, dict):
+            self._send_json(400, {"error": "request body must be a JSON object"})
+            return
+
+        try:
+            future = self.pool.submit(_interactive, handler, self.state, request)
+        except QueueFull:
+            self._send_json(503, {"error": "server busy, retry later"}, {"Retry-After": "1"})
+            return
+        try:
+            self._send_json(200, future.result(timeout=REQUEST_TIMEOUT))
+        except KeyError as e:
+            self._send_json(400, {"error": f"missing field {e}"})
+        except BadRequest as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": str(e) or type(e).__name__})
+
+    def log_message(self, format, *args):
+        sys.stderr.write(f"{self.address_string()} {format % args}\n")
+
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, workers=DEFAULT_WORKERS, max_queue=DEFAULT_MAX_QUEUE,
+                state=None, output_dir=OUTPUT_DIR):
+    """Create (but don't start) a server with warm state; port 0 picks a free port"""
+    handler = type("Handler", (GuideRequestHandler,), {
+        "state": state or WarmState(output_dir),
+        "pool": WorkerPool(workers, max_queue),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve warm guide builds over a local HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent builds")
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+                        help="Requests allowed to wait for a worker before returning 503")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR,
+                        help="Directory the server writes each build's chart into")
+    args = parser.parse_args(argv)
+
+    print("Warming up (question bank, spec, chart backend, templates)...")
+    server = make_server(args.host, args.port, args.workers, args.max_queue, output_dir=args.output_dir)
+    state = server.RequestHandlerClass.state
+    print(f"Ready in {state.load_seconds:.1f}s: {len(state.df_q)} questions; "
+          f"listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.RequestHandlerClass.pool.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
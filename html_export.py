@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+HTML Export
+Renders guides to standalone HTML from the shared markdown tree (markdown_ast), so export
+reuses the parse the linter and Notion converter already paid for. export_site() writes a
+small static site: one page per guide, an index, and local images copied under assets/
+by content hash. Unchanged files are not rewritten.
+
+Usage:
+    python html_export.py site/ guide.md [viz.md ...]
+"""
+
+import os
+import sys
+import html
+import shutil
+import argparse
+
+from asset_upload import asset_name, file_digest, find_local_images, page_dir
+from chart_service import write_if_changed
+from markdown_ast import children, inline, parse_markdown, slugify
+
+STYLE = """body{max-width:46rem;margin:2rem auto;padding:0 1rem;font:16px/1.6 system-ui,sans-serif;color:#222}
+pre{background:#f6f8fa;padding:1rem;overflow-x:auto}code{font-size:.9em}
+img{max-width:100%}blockquote{border-left:4px solid #ddd;margin:0;padding-left:1rem;color:#555}"""
+MERMAID_SCRIPT = ('<script type="module">import mermaid from "https://cdn.jsdelivr.net/npm/mermaid@10/'
+                  'dist/mermaid.esm.min.mjs";mermaid.initialize({startOnLoad:true});</script>')
+
+
+def inline_html(tokens, image_urls=None):
+    parts = []
+    for token in tokens:
+        kind = token["type"]
+        if kind == 'text':
+            parts.append(html.escape(token["text"]))
+        elif kind == 'code':
+            parts.append(f"<code>{html.escape(token['text'])}</code>")
+        elif kind == 'bold':
+            parts.append(f"<strong>{inline_html(children(token), image_urls)}</strong>")
+        elif kind == 'italic':
+            parts.append(f"<em>{inline_html(children(token), image_urls)}</em>")
+        elif kind == 'image':
+            src = (image_urls or {}).get(token["url"], token["url"])
+            parts.append(f'<img src="{html.escape(src)}" alt="{html.escape(token["alt"])}">')
+        else:
+            text = token.get("text") or token["url"]
+            parts.append(f'<a href="{html.escape(token["url"])}">{html.escape(text)}</a>')
+    return ''.join(parts)
+
+
+def render_html(markdown, image_urls=None):
+    """HTML body for a markdown document; image_urls maps image references to new URLs"""
+    out = []
+    lists = []  # open (tag, indent), innermost last
+    slugs = {}
+
+    def close_lists(indent=-1):
+        while lists and lists[-1][1] > indent:
+            out.append(f"</li></{lists.pop()[0]}>")
+
+    for node in parse_markdown(markdown)["nodes"]:
+        kind = node["type"]
+        if kind in ('bullet', 'numbered'):
+            tag = 'ul' if kind == 'bullet' else 'ol'
+            indent = node["indent"]
+            close_lists(indent)
+            if lists and lists[-1][1] == indent and lists[-1][0] == tag:
+                out.append("</li><li>")
+            else:
+                if lists and lists[-1][1] == indent:
+                    close_lists(indent - 1)
+                out.append(f"<{tag}><li>")
+                lists.append((tag, indent))
+            out.append(inline_html(inline(node), image_urls))
+            out.extend(inline_html(inline(c), image_urls) for c in node["continuations"])
+            continue
+        close_lists()
+
+        if kind == 'heading':
+            # Unique GitHub-style ids so the guides' #anchor links resolve
+            slug = slugify(node["text"])
+            count = slugs.get(slug, 0)
+            slugs[slug] = count + 1
+            anchor = f"{slug}-{count}" if count else slug
+            level = node["level"]
+            out.append(f'<h{level} id="{html.escape(anchor)}">{inline_html(inline(node), image_urls)}</h{level}>')
+        elif kind == 'paragraph':
+            out.append(f"<p>{inline_html(inline(node), image_urls)}</p>")
+        elif kind == 'quote':
+            out.append(f"<blockquote><p>{inline_html(inline(node), image_urls)}</p></blockquote>")
+        elif kind == 'divider':
+            out.append("<hr>")
+        elif kind == 'image':
+            src = (image_urls or {}).get(node["url"], node["url"])
+            out.append(f'<p><img src="{html.escape(src)}" alt="{html.escape(node["alt"])}"></p>')
+        elif node["language"] == 'mermaid':
+            out.append(f'<pre class="mermaid">{html.escape(chr(10).join(node["lines"]))}</pre>')
+        else:
+            language = f' class="language-{html.escape(node["language"])}"' if node["language"] else ''
+            out.append(f"<pre><code{language}>{html.escape(chr(10).join(node['lines']))}</code></pre>")
+    close_lists()
+    return '\n'.join(out)
+
+
+def page_html(title, body):
+    script = MERMAID_SCRIPT if 'class="mermaid"' in body else ''
+    return (f'<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8">'
+            f'<meta name="viewport" content="width=device-width, initial-scale=1">'
+            f'<title>{html.escape(title)}</title><style>{STYLE}</style></head>\n'
+            f'<body>\n{body}\n{script}</body></html>\n')
+
+
+def export_site(pages, out_dir, base_dir='.'):
+    """Write {title: markdown} as a static site under out_dir; returns {title: file path}.
+
+    base_dir is where the markdown was written (or {title: directory}); local images resolve against it.
+    """
+    assets_dir = os.path.join(out_dir, "assets")
+    os.makedirs(assets_dir, exist_ok=True)
+    paths = {}
+    links = []
+    for title, markdown in pages.items():
+        image_urls = {}
+        for ref, path in find_local_images(markdown, page_dir(base_dir, title)).items():
+            name = asset_name(file_digest(path), path)
+            target = os.path.join(assets_dir, name)
+            if not os.path.exists(target):
+                shutil.copyfile(path, target)
+            image_urls[ref] = f"assets/{name}"
+        filename = f"{slugify(title).strip('-') or 'page'}.html"
+        paths[title] = os.path.join(out_dir, filename)
+        write_if_changed(paths[title], page_html(title, render_html(markdown, image_urls)).encode('utf-8'))
+        links.append(f'<li><a href="{html.escape(filename)}">{html.escape(title)}</a></li>')
+    index = page_html("Guides", f"<h1>Guides</h1>\n<ul>{''.join(links)}</ul>")
+    write_if_changed(os.path.join(out_dir, "index.html"), index.encode('utf-8'))
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export markdown guides as a static HTML site")
+    parser.add_argument("out_dir", help="Directory to write the site into")
+    parser.add_argument("files", nargs='+', help="Markdown files (the first heading becomes the title)")
+    args = parser.parse_args(argv)
+
+    pages, base_dirs = {}, {}
+    for path in args.files:
+        with open(path, encoding='utf-8') as f:
+            markdown = f.read()
+        heading = next((n for n in parse_markdown(markdown)["nodes"] if n["type"] == 'heading'), None)
+        title = heading["text"] if heading else os.path.splitext(os.path.basename(path))[0]
+        pages[title] = markdown
+        base_dirs[title] = os.path.dirname(path) or '.'
+    paths = export_site(pages, args.out_dir, base_dir=base_dirs)
+    for title, path in paths.items():
+        print(f"{title}: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+"""
+Lazy Imports
+Module proxies that defer importing heavy backends (numpy, pandas, matplotlib, ...)
+until an attribute is first used, keeping CLI startup and preflight checks fast.
+"""
+
+import importlib
+
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self._name)
+        return getattr(module, attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """Return a proxy for module `name`; the import happens at first use"""
+    return LazyModule(name)
@@ -0,0 +1,182 @@
+"""
+LLM Generation
+Concurrent, cached chat completions for guide sections. Prompts fan out under a
+concurrency limit and a total token budget; responses are stored on disk under a hash of
+prompt + model + parameters, and identical prompts already in flight share one request,
+so reruns and sections shared across companies never pay for the same completion twice.
+
+Set OPENAI_BASE_URL (or pass base_url) to run against a local stub such as openai_stub.py.
+"""
+
+import os
+import json
+import asyncio
+import hashlib
+
+from rate_limiter import async_transport
+
+LLM_CACHE_DIR = os.path.join(".cache", "llm")
+DEFAULT_MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
+DEFAULT_PARAMS = {"temperature": 0.3, "max_tokens": 300}
+SYSTEM_PROMPT = ("You write concise, factual sections of data science interview guides in "
+                 "Markdown. Do not use headings, and keep lists to at most 5 bullets.")
+
+
+def prompt_key(prompt, model, params, system_prompt=SYSTEM_PROMPT):
+    """Cache key for one completion"""
+    payload = json.dumps({"system": system_prompt, "prompt": prompt, "model": model, "params": params},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token) used to reserve budget up front"""
+    return len(text) // 4 + 1
+
+
+class TokenBudget:
+    """Total token allowance; requests reserve an estimate and settle with actual usage"""
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.used = 0
+
+    def reserve(self, tokens):
+        if self.limit is not None and self.used + tokens > self.limit:
+            return False
+        self.used += tokens
+        return True
+
+    def settle(self, reserved, actual):
+        self.used += actual - reserved
+
+
+class Generator:
+    """Generates completions with disk caching, in-flight coalescing and a token budget"""
+
+    def __init__(self, model=DEFAULT_MODEL, concurrency=8, token_budget=None, cache_dir=LLM_CACHE_DIR,
+                 base_url=None, api_key=None, system_prompt=SYSTEM_PROMPT, **params):
+        self.model = model
+        self.params = dict(DEFAULT_PARAMS, **params)
+        self.system_prompt = system_prompt
+        self.cache_dir = cache_dir
+        self.budget = TokenBudget(token_budget)
+        self.base_url = base_url or os.environ.get("OPENAI_BASE_URL")
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY") or ("stub" if self.base_url else None)
+        self.stats = {"cache_hits": 0, "requests": 0, "coalesced": 0, "over_budget": 0,
+                      "errors": 0, "tokens": 0}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._inflight = {}
+        self._client = None
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _read_cache(self, key):
+        try:
+            with open(self._cache_path(key), encoding='utf-8') as f:
+                return json.load(f)["text"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_cache(self, key, record):
+        path = self._cache_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+        os.replace(tmp_path, path)
+
+    def _get_client(self):
+        if self._client is None:
+            import httpx
+            from openai import AsyncOpenAI
+            # Throttling and retries come from the shared "openai" bucket, not the SDK
+            http_client = httpx.AsyncClient(transport=async_transport("openai"), timeout=60)
+            self._client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url,
+                                       http_client=http_client, max_retries=0)
+        return self._client
+
+    async def _complete(self, key, prompt):
+        reserved = (estimate_tokens(self.system_prompt) + estimate_tokens(prompt)
+                    + self.params.get("max_tokens", 0))
+        if not self.budget.reserve(reserved):
+            self.stats["over_budget"] += 1
+            return None
+
+        async with self._semaphore:
+            try:
+                response = await self._get_client().chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "system", "content": self.system_prompt},
+                              {"role": "user", "content": prompt}],
+                    **self.params,
+                )
+            except Exception as e:
+                self.budget.settle(reserved, 0)
+                self.stats["errors"] += 1
+                print(f"Warning: Generation failed: {e}")
+                return None
+        self.stats["requests"] += 1
+
+        text = (response.choices[0].message.content or "").strip()
+        usage = getattr(response, "usage", None)
+        tokens = getattr(usage, "total_tokens", None) or reserved
+        self.budget.settle(reserved, tokens)
+        self.stats["tokens"] += tokens
+        self._write_cache(key, {"model": self.model, "params": self.params, "prompt": prompt,
+                                "text": text, "tokens": tokens})
+        return text
+
+    async def generate(self, prompt):
+        """Return the completion text for prompt, or None if over budget or unavailable"""
+        key = prompt_key(prompt, self.model, self.params, self.system_prompt)
+        cached = self._read_cache(key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            return await task
+        task = self._inflight[key] = asyncio.ensure_future(self._complete(key, prompt))
+        try:
+            return await task
+        finally:
+            self._inflight.pop(key, None)
+
+    async def generate_many(self, prompts):
+        """Generate {name: prompt} concurrently, returning {name: text or None}"""
+        names = list(prompts)
+        texts = await asyncio.gather(*(self.generate(prompts[name]) for name in names))
+        return dict(zip(names, texts))
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.close()
+
+
+async def generate_sections_async(prompts, **kwargs):
+    generator = Generator(**kwargs)
+    if not generator.api_key:
+        print("Note: OPENAI_API_KEY is not set; using static section text")
+        return {name: None for name in prompts}, generator.stats
+    try:
+        return await generator.generate_many(prompts), generator.stats
+    finally:
+        await generator.aclose()
+
+
+def generate_sections(prompts, **kwargs):
+    """Synchronous wrapper: returns ({name: text or None}, stats)"""
+    return asyncio.run(generate_sections_async(prompts, **kwargs))
+
+
+def section_intro_prompts(sections):
+    """Company-independent intro prompts, so every company's guide shares the same completions"""
+    return {
+        section: (f"Write a 2-3 sentence introduction to the {section} questions in a data "
+                  f"science interview: what interviewers assess and how to prepare.")
+        for section in sections
+    }
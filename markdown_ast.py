@@ -0,0 +1,196 @@
+"""
+Markdown AST
+Parses a markdown document once into a flat list of block nodes (headings, paragraphs,
+list items, code fences, images, quotes and dividers) that keep their source line numbers.
+Inline markup (bold, italic, code, links, images, bare URLs) is tokenized on first use.
+Parses are cached by content hash, so the quality linter, the Notion block converter and
+the HTML exporter share one tree per document instead of each re-scanning the text.
+Trees are shared: treat them as read-only.
+"""
+
+import re
+import bisect
+import hashlib
+import threading
+from collections import OrderedDict
+
+CACHE_SIZE = 512
+
+HEADING_PATTERN = re.compile(r'^ {0,3}(#{1,6})\s+(.*?)(?:\s+#+)?\s*$')
+BULLET_PATTERN = re.compile(r'^(\s*)[-*+]\s+(\S.*)$')
+NUMBERED_PATTERN = re.compile(r'^(\s*)\d+[.)]\s+(\S.*)$')
+IMAGE_LINE_PATTERN = re.compile(r'^!\[([^\]]*)\]\(([^)\s]+)\)$')
+DIVIDER_PATTERN = re.compile(r'^(-{3,}|\*{3,}|_{3,})$')
+# The lookahead lets the scanner skip characters that can't start any inline token
+INLINE_PATTERN = re.compile(
+    r'(?=[!\[`*<h])(?:'
+    r'(?P<image>!\[(?P<img_alt>[^\]]*)\]\((?P<img_url>[^)\s]+)[^)]*\))'
+    r'|(?P<link>\[(?P<link_text>[^\]]*)\]\((?P<link_url>[^)\s]*)[^)]*\))'
+    r'|(?P<code>`(?P<code_text>[^`]+)`)'
+    r'|(?P<bold>\*\*(?P<bold_text>.+?)\*\*)'
+    r'|(?P<italic>(?<!\*)\*(?P<italic_text>[^*\s][^*]*?)\*(?!\*))'
+    r'|(?P<url><?(?P<url_href>https?://[^\s)>]+)>?))'
+)
+# Node types whose "text" holds inline markup
+INLINE_TYPES = ('heading', 'paragraph', 'bullet', 'numbered', 'continuation', 'quote')
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def content_hash(markdown):
+    return hashlib.sha256(markdown.encode('utf-8')).hexdigest()
+
+
+def tokenize(text, base=0):
+    """Inline tokens of a text run; "start" is the offset into the node's text.
+
+    Bold and italic tokens hold their inner text; children() tokenizes it on demand.
+    """
+    tokens = []
+    pos = 0
+    for match in INLINE_PATTERN.finditer(text):
+        start = match.start()
+        if start > pos:
+            tokens.append({"type": "text", "text": text[pos:start], "start": base + pos})
+        kind = match.lastgroup
+        if kind == 'image':
+            token = {"type": kind, "alt": match.group('img_alt'), "url": match.group('img_url')}
+        elif kind == 'link':
+            token = {"type": kind, "text": match.group('link_text'), "url": match.group('link_url')}
+        elif kind == 'url':
+            token = {"type": kind, "url": match.group('url_href')}
+        else:
+            token = {"type": kind, "text": match.group(f'{kind}_text')}
+        token["raw"] = match.group(0)
+        token["start"] = base + start
+        tokens.append(token)
+        pos = match.end()
+    if pos < len(text):
+        tokens.append({"type": "text", "text": text[pos:], "start": base + pos})
+    return tokens
+
+
+def inline(node):
+    """The node's inline tokens, tokenized on first use"""
+    tokens = node.get("inline")
+    if tokens is None:
+        tokens = node["inline"] = tokenize(node["text"])
+    return tokens
+
+
+def children(token):
+    """Inline tokens inside a bold or italic token, tokenized on first use"""
+    tokens = token.get("children")
+    if tokens is None:
+        offset = 2 if token["type"] == 'bold' else 1
+        tokens = token["children"] = tokenize(token["text"], token["start"] + offset)
+    return tokens
+
+
+def line_of(node, offset):
+    """Source line of an offset into a node's text (paragraphs span several lines)"""
+    starts = node.get("line_starts")
+    return node["line"] + (bisect.bisect_right(starts, offset) - 1 if starts else 0)
+
+
+def _paragraph(paragraph):
+    starts, offset = [], 0
+    for _, text in paragraph:
+        starts.append(offset)
+        offset += len(text) + 1
+    return {"type": "paragraph", "line": paragraph[0][0], "line_starts": starts,
+            "text": ' '.join(text for _, text in paragraph)}
+
+
+def _parse(lines):
+    nodes = []
+    paragraph = []  # (line_no, stripped text) of the paragraph being collected
+    last_block = None
+    n = len(lines)
+    i = 0
+    while i < n:
+        line = lines[i]
+        i += 1
+        stripped = line.strip()
+        if not stripped:
+            if paragraph:
+                last_block = _paragraph(paragraph)
+                nodes.append(last_block)
+                paragraph = []
+            continue
+
+        # Dispatch on the first character so plain prose lines skip every block regex
+        first = stripped[0]
+        node = None
+        if first in '`~':
+            if stripped[:3] in ('```', '~~~'):
+                start = i
+                while i < n and lines[i].strip()[:3] not in ('```', '~~~'):
+                    i += 1
+                node = {"type": "code", "line": start, "language": stripped[3:].strip().lower(),
+                        "lines": lines[start:i], "closed": i < n}
+                i += i < n
+        elif first == '#':
+            heading = HEADING_PATTERN.match(line)
+            if heading:
+                node = {"type": "heading", "line": i, "level": len(heading.group(1)), "text": heading.group(2)}
+        elif first == '!':
+            image = IMAGE_LINE_PATTERN.match(stripped)
+            if image:
+                node = {"type": "image", "line": i, "alt": image.group(1), "url": image.group(2)}
+        elif first == '>':
+            node = {"type": "quote", "line": i, "text": stripped.lstrip('>').strip()}
+
+        if node is None:
+            if first in '-*_' and DIVIDER_PATTERN.match(stripped):
+                node = {"type": "divider", "line": i}
+            else:
+                item = (BULLET_PATTERN.match(line) if first in '-*+'
+                        else NUMBERED_PATTERN.match(line) if first.isdigit() else None)
+                if item:
+                    node = {"type": "bullet" if first in '-*+' else "numbered", "line": i,
+                            "indent": len(item.group(1)), "text": item.group(2), "continuations": []}
+                elif (not paragraph and line.startswith('   ') and last_block is not None
+                      and last_block["type"] in ('bullet', 'numbered')):
+                    # Indented text after a list item (even across a blank line) continues the item
+                    last_block["continuations"].append({"type": "continuation", "line": i, "text": ' ' + stripped})
+                    continue
+                else:
+                    paragraph.append((i, stripped))
+                    continue
+
+        if paragraph:
+            last_block = _paragraph(paragraph)
+            nodes.append(last_block)
+            paragraph = []
+        nodes.append(node)
+        last_block = node
+
+    if paragraph:
+        last_block = _paragraph(paragraph)
+        nodes.append(last_block)
+    return nodes
+
+
+def parse_markdown(markdown):
+    """{"hash", "nodes", "n_lines"} for a markdown string, cached by content hash"""
+    key = content_hash(markdown)
+    with _cache_lock:
+        doc = _cache.get(key)
+        if doc is not None:
+            _cache.move_to_end(key)
+            return doc
+    lines = markdown.split('\n')
+    doc = {"hash": key, "nodes": _parse(lines), "n_lines": len(lines)}
+    with _cache_lock:
+        _cache[key] = doc
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return doc
+
+
+def slugify(text):
+    """GitHub-style heading anchor, as used by the guides' table-of-contents links"""
+    text = re.sub(r'[*_`]|!?\[([^\]]*)\]\([^)]*\)', lambda m: m.group(1) or '', text)
+    return re.sub(r'[^\w\- ]', '', text.strip().lower()).replace(' ', '-')
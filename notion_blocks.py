@@ -0,0 +1,221 @@
+"""
+Markdown to Notion Blocks
+Converts generated guides into real Notion blocks (headings, lists, code/mermaid fences,
+links, images) and publishes them in 100-block batches through a pooled async client.
+"""
+
+import os
+import asyncio
+
+from asset_upload import upload_page_assets_async
+from markdown_ast import inline, parse_markdown, tokenize
+from rate_limiter import async_transport
+
+# Notion API limits
+MAX_BLOCKS_PER_REQUEST = 100
+MAX_TEXT_LENGTH = 2000
+MAX_RICH_TEXT_ITEMS = 100
+
+# Fence languages Notion accepts that differ from common markdown spellings
+CODE_LANGUAGE_ALIASES = {
+    'py': 'python',
+    'js': 'javascript',
+    'ts': 'typescript',
+    'sh': 'shell',
+    'bash': 'bash',
+    'yml': 'yaml',
+    'md': 'markdown',
+    '': 'plain text',
+}
+CODE_LANGUAGES = {
+    'python', 'javascript', 'typescript', 'shell', 'bash', 'yaml', 'markdown', 'sql',
+    'json', 'html', 'css', 'java', 'go', 'rust', 'r', 'scala', 'c', 'c++', 'mermaid',
+    'plain text',
+}
+
+def is_external_url(url):
+    """Notion only accepts absolute http(s) URLs for links and external images"""
+    return url.startswith('http://') or url.startswith('https://')
+
+
+def _text_item(content, link=None, **annotations):
+    """Build rich_text items for a run of text, splitting at the per-item length limit"""
+    items = []
+    for start in range(0, len(content), MAX_TEXT_LENGTH):
+        item = {"type": "text", "text": {"content": content[start:start + MAX_TEXT_LENGTH]}}
+        if link:
+            item["text"]["link"] = {"url": link}
+        if annotations:
+            item["annotations"] = annotations
+        items.append(item)
+    return items
+
+
+def rich_text(text):
+    """Convert inline markdown (bold, italic, code, links) into Notion rich_text"""
+    return _rich_text_items(tokenize(text))
+
+
+def _rich_text_items(tokens):
+    items = []
+    plain = ''  # Consecutive plain runs (text, bare URLs, empty-text links) form one item
+    for token in tokens:
+        kind = token["type"]
+        if kind == 'text':
+            plain += token["text"]
+            continue
+        if kind == 'url' or (kind == 'link' and not token["text"]):
+            plain += token["raw"]
+            continue
+        if plain:
+            items.extend(_text_item(plain))
+            plain = ''
+        if kind == 'image':
+            items.extend(_text_item(token["alt"] or token["url"]))
+        elif kind == 'link':
+            url = token["url"]
+            items.extend(_text_item(token["text"], link=url if is_external_url(url) else None))
+        elif kind == 'code':
+            items.extend(_text_item(token["text"], code=True))
+        elif kind == 'bold':
+            items.extend(_text_item(token["text"], bold=True))
+        else:
+            items.extend(_text_item(token["text"], italic=True))
+    if plain:
+        items.extend(_text_item(plain))
+    return items[:MAX_RICH_TEXT_ITEMS]
+
+
+def _block(block_type, **body):
+    return {"object": "block", "type": block_type, block_type: body}
+
+
+def _code_block(lines, language):
+    language = CODE_LANGUAGE_ALIASES.get(language, language)
+    if language not in CODE_LANGUAGES:
+        language = 'plain text'
+    return _block("code", rich_text=_text_item('\n'.join(lines))[:MAX_RICH_TEXT_ITEMS], language=language)
+
+
+def _image_block(alt, url):
+    if is_external_url(url):
+        return _block("image", type="external", external={"url": url},
+                      caption=rich_text(alt) if alt else [])
+    # Local assets that weren't uploaded (see asset_upload) can't be shown; keep the alt text
+    return _block("paragraph", rich_text=_text_item(alt or url, italic=True))
+
+
+def markdown_to_blocks(markdown):
+    """Convert a markdown document into a flat list of top-level Notion blocks"""
+    blocks = []
+    for node in parse_markdown(markdown)["nodes"]:
+        kind = node["type"]
+        if kind == 'paragraph':
+            blocks.append(_block("paragraph", rich_text=_rich_text_items(inline(node))))
+        elif kind == 'code':
+            blocks.append(_code_block(node["lines"], node["language"]))
+        elif kind == 'heading':
+            # Notion has three heading levels; deeper headings collapse into heading_3
+            level = min(node["level"], 3)
+            blocks.append(_block(f"heading_{level}", rich_text=_rich_text_items(inline(node))))
+        elif kind == 'divider':
+            blocks.append(_block("divider"))
+        elif kind == 'image':
+            blocks.append(_image_block(node["alt"], node["url"]))
+        elif kind == 'quote':
+            blocks.append(_block("quote", rich_text=_rich_text_items(inline(node))))
+        else:
+            block_type = "bulleted_list_item" if kind == 'bullet' else "numbered_list_item"
+            item = _block(block_type, rich_text=_rich_text_items(inline(node)))
+            parent = blocks[-1] if blocks else None
+            nested = node["indent"] >= 2 and parent is not None and parent["type"] in (
+                "bulleted_list_item", "numbered_list_item")
+            if nested:
+                # One level of nesting keeps every block within a single append request
+                parent[parent["type"]].setdefault("children", []).append(item)
+            else:
+                blocks.append(item)
+            for continuation in node["continuations"]:
+                # Continuation lines extend the enclosing top-level item
+                body = blocks[-1][blocks[-1]["type"]]
+                body["rich_text"] = (body["rich_text"] + _rich_text_items(inline(continuation)))[:MAX_RICH_TEXT_ITEMS]
+    return blocks
+
+
+def chunk_blocks(blocks, size=MAX_BLOCKS_PER_REQUEST):
+    """Split blocks into API-sized batches"""
+    return [blocks[i:i + size] for i in range(0, len(blocks), size)]
+
+
+def page_payload(parent_id, title, blocks):
+    """Build the pages.create payload carrying the first batch of blocks"""
+    return {
+        "parent": {"page_id": parent_id},
+        "properties": {"title": {"title": [{"text": {"content": title}}]}},
+        "children": blocks[:MAX_BLOCKS_PER_REQUEST],
+    }
+
+
+def mock_url(title):
+    """URL returned when publishing fails, matching publish_to_notion's fallback"""
+    return f"https://www.notion.so/mock-{title.lower().replace(' ', '-')}-page"
+
+
+def create_async_client(token=None, base_url=None, max_connections=10):
+    """Create a pooled AsyncClient; base_url (or NOTION_BASE_URL) points it at a local stand-in"""
+    import httpx
+    from notion_client import AsyncClient
+
+    options = {"auth": token or os.environ["NOTION_TOKEN"]}
+    base_url = base_url or os.environ.get("NOTION_BASE_URL")
+    if base_url:
+        options["base_url"] = base_url
+    # Requests share the "notion" token bucket, which also handles 429 Retry-After
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    http_client = httpx.AsyncClient(transport=async_transport("notion", limits=limits), timeout=30)
+    return AsyncClient(client=http_client, **options)
+
+
+async def publish_page_async(notion, parent_id, title, markdown_content):
+    """Create one page with its first 100 blocks, then append the rest in 100-block batches"""
+    batches = chunk_blocks(markdown_to_blocks(markdown_content))
+    first = batches[0] if batches else []
+    page = await notion.pages.create(**page_payload(parent_id, title, first))
+    # Batches must land in order, so appends within one page stay sequential
+    for batch in batches[1:]:
+        await notion.blocks.children.append(block_id=page["id"], children=batch)
+    return page["url"]
+
+
+async def publish_pages_async(pages, parent_id=None, token=None, base_url=None, concurrency=5, base_dir='.'):
+    """Publish {title: markdown} concurrently over one pooled client, returning {title: url}.
+
+    base_dir is where the markdown was written (or {title: directory}); local images resolve against it.
+    """
+    try:
+        parent_id = parent_id or os.environ["NOTION_PARENT"]
+        notion = create_async_client(token, base_url, max_connections=concurrency)
+    except Exception as e:
+        print(f"Error publishing to Notion: {e}")
+        return {title: mock_url(title) for title in pages}
+    pages, _ = await upload_page_assets_async(pages, base_dir=base_dir)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def publish_one(title, markdown_content):
+        async with semaphore:
+            try:
+                return title, await publish_page_async(notion, parent_id, title, markdown_content)
+            except Exception as e:
+                print(f"Error publishing {title} to Notion: {e}")
+                return title, mock_url(title)
+
+    try:
+        results = await asyncio.gather(*(publish_one(t, md) for t, md in pages.items()))
+    finally:
+        await notion.aclose()
+    return dict(results)
+
+
+def publish_pages(pages, **kwargs):
+    """Synchronous wrapper around publish_pages_async"""
+    return asyncio.run(publish_pages_async(pages, **kwargs))
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Notion Stub
+A local, in-memory stand-in for the Notion pages/blocks endpoints used by publishing, so
+the real publish code can be benchmarked and exercised offline via NOTION_BASE_URL.
+
+It can behave like the real API under load: per-request latency, a server-side rate limit
+and random 429s (both with Retry-After), and Notion's request limits (100 children per
+request, 2000 characters per text item, two levels of nesting) answered with 400s.
+Published pages are served as HTML at their URL, so the self-test can check them.
+
+Usage:
+    python notion_stub.py --port 8765 [--latency 0.05] [--rate-limit 3] [--throttle 0.05]
+    export NOTION_BASE_URL="http://127.0.0.1:8765" NOTION_TOKEN=stub NOTION_PARENT=parent
+"""
+
+import re
+import sys
+import html
+import json
+import math
+import time
+import uuid
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGE_PATH = re.compile(r'^/v1/pages/?(?P<page_id>[^/]*)$')
+BLOCK_PATH = re.compile(r'^/v1/blocks/(?P<block_id>[^/]+)(?P<children>/children)?$')
+PUBLIC_PAGE_PATH = re.compile(r'^/(?P<page_id>[0-9a-f]{32})$')
+
+# Notion API request limits
+MAX_CHILDREN = 100
+MAX_TEXT_LENGTH = 2000
+MAX_RICH_TEXT_ITEMS = 100
+MAX_NESTING = 2
+
+
+def _rich_text(block):
+    return block.get(block.get("type"), {}).get("rich_text", [])
+
+
+def validate_children(children, depth=1):
+    """The first Notion limit a list of blocks breaks, or None"""
+    if len(children) > MAX_CHILDREN:
+        return f"body.children.length should be ≤ `{MAX_CHILDREN}`, instead was `{len(children)}`."
+    for block in children:
+        items = _rich_text(block)
+        if len(items) > MAX_RICH_TEXT_ITEMS:
+            return f"rich_text.length should be ≤ `{MAX_RICH_TEXT_ITEMS}`, instead was `{len(items)}`."
+        for item in items:
+            length = len(item.get("text", {}).get("content", ""))
+            if length > MAX_TEXT_LENGTH:
+                return f"text.content.length should be ≤ `{MAX_TEXT_LENGTH}`, instead was `{length}`."
+        nested = block.get(block.get("type"), {}).get("children")
+        if nested:
+            if depth >= MAX_NESTING:
+                return f"children may only be nested {MAX_NESTING} levels deep in one request."
+            problem = validate_children(nested, depth + 1)
+            if problem:
+                return problem
+    return None
+
+
+class NotionStore:
+    """Pages and their top-level block lists, guarded by one lock"""
+
+    def __init__(self, rate_limit=None):
+        self.lock = threading.Lock()
+        self.pages = {}
+        self.children = {}
+        self.blocks = {}
+        self.requests = 0
+        self.throttled = 0
+        self.rejected = 0
+        # Server-side token bucket (requests/second); None disables it
+        self.rate_limit = rate_limit
+        self._tokens = float(rate_limit or 0)
+        self._updated = time.monotonic()
+
+    def take_token(self):
+        """0 if the request may proceed, otherwise the Retry-After in seconds"""
+        if not self.rate_limit:
+            return 0
+        with self.lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._updated) * self.rate_limit)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return max(1, math.ceil((1 - self._tokens) / self.rate_limit))
+
+    def create_page(self, body, base_url):
+        page_id = str(uuid.uuid4())
+        page = {"object": "page", "id": page_id, "url": f"{base_url}/{page_id.replace('-', '')}",
+                "parent": body.get("parent"), "properties": body.get("properties", {}),
+                "archived": False}
+        with self.lock:
+            self.pages[page_id] = page
+            self.children[page_id] = []
+        self.append(page_id, body.get("children", []))
+        return page
+
+    def append(self, parent_id, children, after=None):
+        created = [dict(block, id=str(uuid.uuid4()), object="block") for block in children]
+        with self.lock:
+            siblings = self.children[parent_id]
+            position = len(siblings) if after is None else siblings.index(after) + 1
+            siblings[position:position] = [block["id"] for block in created]
+            for block in created:
+                self.blocks[block["id"]] = (parent_id, block)
+        return created
+
+    def page_html(self, page_id):
+        """The page's title and block text as a minimal HTML document"""
+        with self.lock:
+            page = self.pages[page_id]
+            blocks = [self.blocks[i][1] for i in self.children[page_id]]
+        title = ''.join(t.get("text", {}).get("content", "")
+                        for t in page["properties"].get("title", {}).get("title", []))
+        lines = [f"<h1>{html.escape(title)}</h1>"]
+        for block in blocks:
+            text = ''.join(item.get("text", {}).get("content", "") for item in _rich_text(block))
+            lines.append(f"<p>{html.escape(text)}</p>")
+        return f"<html><body>{''.join(lines)}</body></html>"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    store = None
+    latency = 0.0
+    jitter = 0.0
+    throttle = 0.0
+
+    def _send(self, status, data, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status, body, headers=None):
+        self._send(status, json.dumps(body).encode('utf-8'), "application/json", headers)
+
+    def _error(self, status, code, message, headers=None):
+        self._send_json(status, {"object": "error", "status": status, "code": code, "message": message}, headers)
+
+    def _invalid(self, message):
+        with self.store.lock:
+            self.store.rejected += 1
+        return self._error(400, "validation_error", message)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _base_url(self):
+        return f"http://{self.headers.get('Host', 'localhost')}"
+
+    def _handle(self, method):
+        store = self.store
+        with store.lock:
+            store.requests += 1
+        path = self.path.split('?')[0]
+        body = self._body() if method in ("POST", "PATCH") else {}
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+
+        match = PUBLIC_PAGE_PATH.match(path)
+        if match and method == "GET":
+            page_id = str(uuid.UUID(match.group("page_id")))
+            if page_id not in store.pages:
+                return self._send(404, b"Not found", "text/plain")
+            return self._send(200, store.page_html(page_id).encode('utf-8'), "text/html; charset=utf-8")
+
+        retry_after = store.take_token()
+        if not retry_after and self.throttle and random.random() < self.throttle:
+            retry_after = 1
+        if retry_after:
+            with store.lock:
+                store.throttled += 1
+            return self._error(429, "rate_limited", "You have been rate limited. Please try again in a few minutes.",
+                               {"Retry-After": str(retry_after)})
+
+        match = PAGE_PATH.match(path)
+        if match:
+            page_id = match.group("page_id")
+            if method == "POST" and not page_id:
+                problem = validate_children(body.get("children", []))
+                if problem:
+                    return self._invalid(problem)
+                return self._send_json(200, store.create_page(body, self._base_url()))
+            page = store.pages.get(page_id)
+            if page is None:
+                return self._error(404, "object_not_found", f"Could not find page with ID: {page_id}")
+            if method == "PATCH":
+                page.update({k: v for k, v in body.items() if k in ("archived", "properties")})
+            return self._send_json(200, page)
+
+        match = BLOCK_PATH.match(path)
+        if match:
+            block_id = match.group("block_id")
+            if match.group("children"):
+                if block_id not in store.children:
+                    return self._error(404, "object_not_found", f"Could not find block with ID: {block_id}")
+                if method == "PATCH":
+                    problem = validate_children(body.get("children", []))
+                    if problem:
+                        return self._invalid(problem)
+                    created = store.append(block_id, body.get("children", []), body.get("after"))
+                    return self._send_json(200, {"object": "list", "results": created, "has_more": False})
+                results = [store.blocks[i][1] for i in store.children[block_id]]
+                return self._send_json(200, {"object": "list", "results": results, "has_more": False})
+            entry = store.blocks.get(block_id)
+            if entry is None:
+                return self._error(404, "object_not_found", f"Could not find block with ID: {block_id}")
+            parent_id, block = entry
+            if method == "DELETE":
+                with store.lock:
+                    store.children[parent_id].remove(block_id)
+                    del store.blocks[block_id]
+                return self._send_json(200, dict(block, archived=True))
+            if method == "PATCH":
+                block.update({k: v for k, v in body.items() if k == block["type"]})
+            return self._send_json(200, block)
+
+        self._error(404, "invalid_request_url", f"Invalid request URL: {path}")
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=8765, latency=0.0, jitter=0.0, rate_limit=None, throttle=0.0):
+    """Create (but don't start) a stub server with a fresh store; port 0 picks a free port.
+
+    latency + uniform(0, jitter) seconds are added to every request; rate_limit caps
+    requests/second and throttle is the chance of a random 429 on any API request.
+    """
+    handler = type("Handler", (StubHandler,), {
+        "store": NotionStore(rate_limit),
+        "latency": latency,
+        "jitter": jitter,
+        "throttle": throttle,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve an in-memory Notion API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds, at random")
+    parser.add_argument("--rate-limit", type=float, default=None,
+                        help="Requests/second before answering 429 (Notion allows about 3)")
+    parser.add_argument("--throttle", type=float, default=0.0, help="Chance of a random 429 per request")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.latency, args.jitter, args.rate_limit, args.throttle)
+    print(f"Notion stub listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
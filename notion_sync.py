@@ -0,0 +1,215 @@
+"""
+Notion Upsert
+Idempotent publishing: a local manifest records title -> page id and the id and content
+hash of every top-level block. On republish the new blocks are diffed against the manifest
+and only changed blocks are updated, inserted or deleted, so API calls scale with the edit
+rather than with the document.
+"""
+
+import os
+import json
+import asyncio
+import hashlib
+import difflib
+
+from asset_upload import upload_page_assets_async
+from notion_blocks import (
+    MAX_BLOCKS_PER_REQUEST,
+    markdown_to_blocks,
+    create_async_client,
+    mock_url,
+)
+
+MANIFEST_PATH = os.environ.get("NOTION_MANIFEST", "notion_manifest.json")
+
+
+def block_hash(block):
+    """Content hash of a block, including any nested children"""
+    return hashlib.sha256(json.dumps(block, sort_keys=True).encode('utf-8')).hexdigest()[:24]
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _updatable(old_type, block):
+    # blocks.update can't change a block's type or its children
+    return old_type == block["type"] and "children" not in block[block["type"]]
+
+
+def plan_changes(old_blocks, new_blocks):
+    """Diff manifest entries against new blocks.
+
+    Returns (new_ids, updates, deletes): new_ids has the reused block id for each new
+    block or None where it must be inserted; updates is [(block_id, new_index)];
+    deletes is [block_id].
+    """
+    old_hashes = [b["hash"] for b in old_blocks]
+    new_hashes = [block_hash(b) for b in new_blocks]
+    new_ids = [None] * len(new_blocks)
+    updates, deletes = [], []
+
+    matcher = difflib.SequenceMatcher(None, old_hashes, new_hashes, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for k in range(i2 - i1):
+                new_ids[j1 + k] = old_blocks[i1 + k]["id"]
+            continue
+        paired = min(i2 - i1, j2 - j1) if tag == 'replace' else 0
+        for k in range(paired):
+            old = old_blocks[i1 + k]
+            if _updatable(old["type"], new_blocks[j1 + k]):
+                new_ids[j1 + k] = old["id"]
+                updates.append((old["id"], j1 + k))
+            else:
+                deletes.append(old["id"])
+        deletes.extend(b["id"] for b in old_blocks[i1 + paired:i2])
+
+    # The API can only insert after an existing block, so a change at the very top
+    # means re-appending everything that follows it
+    if new_ids and new_ids[0] is None and any(new_ids):
+        deletes.extend(i for i in new_ids if i)
+        updates = []
+        new_ids = [None] * len(new_ids)
+    return new_ids, updates, deletes
+
+
+async def _insert_runs(notion, page_id, new_blocks, new_ids, stats):
+    """Insert every unresolved block, in order, after its preceding block"""
+    j = 0
+    while j < len(new_blocks):
+        if new_ids[j] is not None:
+            j += 1
+            continue
+        end = j
+        while end < len(new_blocks) and new_ids[end] is None:
+            end += 1
+        anchor = new_ids[j - 1] if j > 0 else None
+        for start in range(j, end, MAX_BLOCKS_PER_REQUEST):
+            batch = new_blocks[start:min(end, start + MAX_BLOCKS_PER_REQUEST)]
+            kwargs = {"after": anchor} if anchor else {}
+            response = await notion.blocks.children.append(block_id=page_id, children=batch, **kwargs)
+            stats["calls"] += 1
+            created = response["results"]
+            # With "after", the response lists the page's children from the insertion point
+            if anchor:
+                created = created[:len(batch)]
+            else:
+                created = created[-len(batch):]
+            for offset, block in enumerate(created):
+                new_ids[start + offset] = block["id"]
+            anchor = new_ids[start + len(batch) - 1]
+            stats["inserted"] += len(batch)
+        j = end
+
+
+async def upsert_page_async(notion, manifest, parent_id, title, markdown_content, concurrency=3):
+    """Create or incrementally update one page; returns (url, stats)"""
+    new_blocks = markdown_to_blocks(markdown_content)
+    pages = manifest.setdefault(parent_id, {})
+    entry = pages.get(title)
+    stats = {"calls": 0, "inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+
+    if entry:
+        new_ids, updates, deletes = plan_changes(entry["blocks"], new_blocks)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(coro):
+            async with semaphore:
+                stats["calls"] += 1
+                return await coro
+
+        try:
+            await asyncio.gather(*(call(notion.blocks.delete(block_id=b)) for b in deletes))
+            await asyncio.gather(*(
+                call(notion.blocks.update(block_id=block_id, **{
+                    new_blocks[j]["type"]: new_blocks[j][new_blocks[j]["type"]]}))
+                for block_id, j in updates))
+        except Exception as e:
+            # Page or blocks were removed outside this tool; fall back to a fresh page
+            print(f"Note: Could not update '{title}' in place ({e}); recreating it")
+            try:
+                await notion.pages.update(page_id=entry["page_id"], archived=True)
+            except Exception as e:
+                print(f"Note: Could not archive the old '{title}' page {entry['page_id']} ({e})")
+            pages.pop(title, None)
+            entry = None
+        else:
+            stats["deleted"], stats["updated"] = len(deletes), len(updates)
+            stats["unchanged"] = sum(1 for i in new_ids if i) - len(updates)
+            page_id, url = entry["page_id"], entry["url"]
+
+    if not entry:
+        page = await notion.pages.create(
+            parent={"page_id": parent_id},
+            properties={"title": {"title": [{"text": {"content": title}}]}},
+        )
+        stats["calls"] += 1
+        page_id, url = page["id"], page["url"]
+        new_ids = [None] * len(new_blocks)
+
+    try:
+        await _insert_runs(notion, page_id, new_blocks, new_ids, stats)
+    finally:
+        # After a partial insert the page holds exactly the blocks with ids, in order, so
+        # recording just those lets the next run insert the rest instead of a second page
+        pages[title] = {
+            "page_id": page_id,
+            "url": url,
+            "blocks": [{"id": i, "hash": block_hash(b), "type": b["type"]}
+                       for i, b in zip(new_ids, new_blocks) if i is not None],
+        }
+    return url, stats
+
+
+async def upsert_pages_async(pages, parent_id=None, token=None, base_url=None,
+                             concurrency=5, manifest_path=MANIFEST_PATH, base_dir='.'):
+    """Upsert {title: markdown} concurrently, returning ({title: url}, {title: stats}).
+
+    base_dir is where the markdown was written (or {title: directory}); local images resolve against it.
+    """
+    try:
+        parent_id = parent_id or os.environ["NOTION_PARENT"]
+        notion = create_async_client(token, base_url, max_connections=concurrency)
+    except Exception as e:
+        print(f"Error publishing to Notion: {e}")
+        return {title: mock_url(title) for title in pages}, {}
+
+    # Hosted URLs are content addressed, so an unchanged chart leaves its image block unchanged
+    pages, _ = await upload_page_assets_async(pages, base_dir=base_dir)
+    manifest = load_manifest(manifest_path)
+    semaphore = asyncio.Semaphore(concurrency)
+    urls, stats = {}, {}
+
+    async def upsert_one(title, markdown_content):
+        async with semaphore:
+            try:
+                urls[title], stats[title] = await upsert_page_async(
+                    notion, manifest, parent_id, title, markdown_content)
+            except Exception as e:
+                print(f"Error publishing {title} to Notion: {e}")
+                # The manifest keeps whatever reached the page, so the next run resumes it
+                urls[title] = mock_url(title)
+
+    try:
+        await asyncio.gather(*(upsert_one(t, md) for t, md in pages.items()))
+    finally:
+        await notion.aclose()
+        save_manifest(manifest, manifest_path)
+    return urls, stats
+
+
+def upsert_pages(pages, **kwargs):
+    """Synchronous wrapper around upsert_pages_async"""
+    return asyncio.run(upsert_pages_async(pages, **kwargs))
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+OpenAI Stub
+A local stand-in for the chat completions API that returns deterministic text, so the
+generation layer can be exercised without network access or cost.
+
+Usage:
+    python openai_stub.py --port 8766 --latency 0.2 [--fail-status 400]
+    export OPENAI_BASE_URL="http://127.0.0.1:8766/v1"
+"""
+
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    fail_status = None
+    counter = {"requests": 0}
+    lock = threading.Lock()
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "stub-model", "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        with self.lock:
+            self.counter["requests"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_status:
+            # Lets callers exercise their fallback when completions fail
+            self._send_json(self.fail_status, {"error": {"message": "stub failure", "type": "stub_error"}})
+            return
+
+        prompt = request.get("messages", [{}])[-1].get("content", "")
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8]
+        text = f"Stub completion {digest}: {prompt[:80]}"
+        prompt_tokens = sum(len(m.get("content", "")) // 4 + 1 for m in request.get("messages", []))
+        completion_tokens = len(text) // 4 + 1
+        self._send_json(200, {
+            "id": f"chatcmpl-{digest}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub-model"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": text}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=8766, latency=0.0, fail_status=None):
+    """Create (but don't start) a stub server; port 0 picks a free port, and fail_status
+    answers every completion with that HTTP error"""
+    handler = type("Handler", (StubHandler,), {"latency": latency, "fail_status": fail_status,
+                                               "counter": {"requests": 0}})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local OpenAI chat completions stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait per completion")
+    parser.add_argument("--fail-status", type=int, default=None,
+                        help="Answer every completion with this HTTP error status")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.latency, args.fail_status)
+    print(f"OpenAI stub listening on http://{args.host}:{server.server_address[1]}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Incremental Pipeline Executor
+Runs the `plan` from takehome.yaml as a DAG: steps whose dependencies are satisfied run
+concurrently, and each step's output is memoized under a hash of its code and inputs, so
+reruns only execute the steps downstream of whatever actually changed.
+
+Usage:
+    python pipeline.py [--force] [--workers 4]
+"""
+
+import os
+import ast
+import sys
+import json
+import time
+import pickle
+import hashlib
+import inspect
+import argparse
+import textwrap
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import tracing
+
+PIPELINE_CACHE_DIR = os.path.join(".cache", "pipeline")
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+WORKFLOW_PATH = "takehome.yaml"
+
+MEESHO_TITLE = "Meesho Data Scientist Guide"
+META_TITLE = "Meta Supply-Chain Viz Question"
+
+
+def fingerprint(value):
+    """Stable content hash for a step output"""
+    if hasattr(value, 'fingerprint'):
+        return value.fingerprint()
+    if isinstance(value, (tuple, list)):
+        payload = '|'.join(fingerprint(v) for v in value)
+    elif isinstance(value, dict):
+        payload = '|'.join(f"{k}={fingerprint(v)}" for k, v in sorted(value.items(), key=lambda kv: str(kv[0])))
+    elif isinstance(value, bytes):
+        return hashlib.sha256(value).hexdigest()
+    elif isinstance(value, (str, int, float, bool)) or value is None:
+        payload = repr(value)
+    else:
+        return hashlib.sha256(pickle.dumps(value)).hexdigest()
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _module_path(name):
+    """Source file of a module in this repository, or None for the stdlib and third parties"""
+    path = os.path.join(MODULE_DIR, name.split('.')[0] + '.py')
+    return path if os.path.isfile(path) else None
+
+
+def _imported_paths(tree):
+    # Imports inside functions count too: heavy modules are imported where they are used
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            path = _module_path(name)
+            if path:
+                yield path
+
+
+def dependencies(functions):
+    """(functions, paths): the functions plus the same-module helpers they call, and the
+    source files of the repository modules they use, followed through their imports"""
+    # Tracing (--profile/--trace) wraps stage functions; hash what they wrap, so traced and
+    # plain runs share memos
+    functions, stack, seen = [inspect.unwrap(fn) for fn in functions], [], set()
+    for fn in functions:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(fn)))
+        stack.extend(_imported_paths(tree))
+        for node in ast.walk(tree):
+            value = fn.__globals__.get(node.id) if isinstance(node, ast.Name) else None
+            if inspect.isfunction(value):
+                value = inspect.unwrap(value)
+            if inspect.isfunction(value) and value.__module__ == fn.__module__:
+                if value not in functions:
+                    functions.append(value)
+                continue
+            name = value.__name__ if inspect.ismodule(value) else getattr(value, '__module__', None)
+            path = _module_path(name) if isinstance(name, str) else None
+            if path:
+                stack.append(path)
+    while stack:
+        path = stack.pop()
+        if path not in seen:
+            seen.add(path)
+            with open(path, 'rb') as f:
+                stack.extend(_imported_paths(ast.parse(f.read())))
+    return functions, sorted(seen)
+
+
+def code_hash(functions, files=()):
+    """Hash the source of the functions a step depends on, of every repository module they
+    reach (directly or through imports), and of the template and config files it reads"""
+    functions, paths = dependencies(functions)
+    digest = hashlib.sha256()
+    for fn in functions:
+        digest.update(inspect.getsource(fn).encode('utf-8'))
+    for path in paths + list(files):
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def default_registry():
+    """Map plan step names to their implementations.
+
+    Each entry has "run" (called with the outputs of its needs, by step name),
+    "code" (functions whose source, with that of the repository modules they use, is
+    part of the cache key), optional "files" (templates and config hashed the same way)
+    and "cache" (whether the output is memoized; steps that are already cached elsewhere
+    or must always run, like QA, opt out). An optional "cache_if" predicate can veto memoizing a result.
+    """
+    import notion_sync
+    import quality_linter
+    import template_engine
+    import takehome_implementation as ti
+
+    def template(name):
+        return os.path.join(template_engine.TEMPLATE_DIR, name)
+
+    def parse_briefs(inputs):
+        return ti.scrape_spec_requirements()
+
+    def gather_data(inputs):
+        return ti.load_data()
+
+    def build_meesho(inputs):
+        df_q, _ = inputs["Gather data"]
+        spec_requirements = inputs["Parse briefs"]
+        meesho_md = ti.build_meesho_guide(df_q, spec_requirements)
+        meesho_md, _ = ti.grade_and_refine_content(meesho_md, None, spec_requirements)
+        return meesho_md
+
+    def build_meta(inputs):
+        _, df_ops = inputs["Gather data"]
+        return ti.build_meta_viz_question(df_ops=df_ops)
+
+    def publish(inputs):
+        urls, _ = notion_sync.upsert_pages({
+            MEESHO_TITLE: inputs["Build Meesho Guide"],
+            META_TITLE: inputs["Build Meta Viz Question"],
+        })
+        return urls
+
+    def qa(inputs):
+        urls = inputs["Publish to Notion"]
+        return ti.self_test_urls({"Meesho Guide": urls[MEESHO_TITLE], "Meta Viz Question": urls[META_TITLE]})
+
+    def output(inputs):
+        urls = inputs["Publish to Notion"]
+        meesho_url, meta_url = urls[MEESHO_TITLE], urls[META_TITLE]
+        return {
+            "meesho_url": meesho_url,
+            "meta_url": meta_url,
+            "form_blurb": f"Take-home 1: {meesho_url}\nTake-home 2: {meta_url}",
+        }
+
+    return {
+        "Parse briefs": {"run": parse_briefs, "code": [ti.scrape_spec_requirements], "cache": False},
+        "Gather data": {"run": gather_data, "code": [ti.load_data], "cache": False},
+        "Build Meesho Guide": {"run": build_meesho, "cache": True,
+                               "code": [ti.build_meesho_guide, ti.grade_and_refine_content],
+                               "files": [template("company_guide.md"), template("guide_conclusion.md"),
+                                         quality_linter.WORKFLOW_PATH]},
+        # Chart rendering is content-cached by chart_service; rerunning keeps the PNG on disk
+        "Build Meta Viz Question": {"run": build_meta, "cache": False,
+                                    "code": [ti.build_meta_viz_question, ti.create_funnel_chart]},
+        # Each page is diffed against the upsert manifest, so an unchanged page costs no API
+        # calls and a failed page is resumed next run without republishing the other
+        "Publish to Notion": {"run": publish, "cache": False, "code": [notion_sync.upsert_pages]},
+        "QA & Self-Test": {"run": qa, "code": [ti.self_test_urls], "cache": False},
+        "Output Submission": {"run": output, "code": [], "cache": False},
+    }
+
+
+def load_plan(path=WORKFLOW_PATH):
+    """Read the plan steps (name, goal, needs) from the workflow file"""
+    import yaml
+
+    with open(path, encoding='utf-8') as f:
+        plan = yaml.safe_load(f)['plan']
+    for step in plan:
+        step.setdefault('needs', [])
+    return plan
+
+
+def _run_step(name, step, entry, inputs, input_prints, force, cache_dir):
+    """Run one step or load its memoized output; returns (value, fingerprint, status, seconds)"""
+    started = time.perf_counter()
+    key = hashlib.sha256(json.dumps({
+        "step": name,
+        "code": code_hash(entry["code"], entry.get("files", ())),
+        "inputs": [input_prints[n] for n in step['needs']],
+    }).encode('utf-8')).hexdigest()
+    path = os.path.join(cache_dir, f"{key}.pkl")
+
+    if entry["cache"] and not force:
+        try:
+            with open(path, 'rb') as f:
+                cached = pickle.load(f)
+            return cached["value"], cached["fingerprint"], "cached", time.perf_counter() - started
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+    value = entry["run"](inputs)
+    value_print = fingerprint(value)
+    if entry["cache"] and entry.get("cache_if", lambda v: True)(value):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({"value": value, "fingerprint": value_print}, f)
+        os.replace(tmp_path, path)
+    return value, value_print, "ran", time.perf_counter() - started
+
+
+def run_plan(plan=None, registry=None, max_workers=4, force=False, cache_dir=PIPELINE_CACHE_DIR):
+    """Execute the plan as a DAG, returning ({step: output}, {step: report})"""
+    plan = plan if plan is not None else load_plan()
+    registry = registry if registry is not None else default_registry()
+    steps = {step['name']: step for step in plan}
+    for name, step in steps.items():
+        if name not in registry:
+            raise ValueError(f"No implementation registered for plan step: {name}")
+        for dep in step['needs']:
+            if dep not in steps:
+                raise ValueError(f"Step '{name}' needs unknown step '{dep}'")
+
+    outputs, prints, report = {}, {}, {}
+    pending = list(steps)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            for name in list(pending):
+                needs = steps[name]['needs']
+                if any(report.get(dep, {}).get("status") in ("failed", "skipped") for dep in needs):
+                    report[name] = {"status": "skipped", "seconds": 0.0}
+                    pending.remove(name)
+                elif all(dep in outputs for dep in needs):
+                    inputs = {dep: outputs[dep] for dep in needs}
+                    future = pool.submit(_run_step, name, steps[name], registry[name],
+                                         inputs, prints, force, cache_dir)
+                    running[future] = name
+                    pending.remove(name)
+
+            if not running:
+                if pending:
+                    raise ValueError(f"Plan has a dependency cycle among: {pending}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    value, value_print, status, seconds = future.result()
+                    outputs[name], prints[name] = value, value_print
+                    report[name] = {"status": status, "seconds": seconds}
+                except Exception as e:
+                    report[name] = {"status": "failed", "seconds": 0.0, "error": str(e)}
+
+    return outputs, report
+
+
+def main(argv=None):
+    """Command-line entry point for incremental runs"""
+    parser = argparse.ArgumentParser(description="Run the takehome.yaml plan incrementally")
+    parser.add_argument("--force", action="store_true", help="Ignore memoized step outputs")
+    parser.add_argument("--workers", type=int, default=4, help="Steps to run concurrently")
+    parser.add_argument("--workflow", default=WORKFLOW_PATH, help="Workflow file with the plan")
+    tracing.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    tracer = None
+    if args.profile or args.trace:
+        import takehome_implementation
+        tracer = tracing.enable(takehome_implementation)
+
+    print("Starting Interview Query Take-Home Auto-Builder (incremental)...")
+    started = time.perf_counter()
+    try:
+        outputs, report = run_plan(load_plan(args.workflow), max_workers=args.workers, force=args.force)
+    finally:
+        if tracer:
+            tracing.finish(tracer, args)
+
+    print("\nStep summary:")
+    for name, entry in report.items():
+        line = f"  {entry['status']:>7}  {entry['seconds']:6.2f}s  {name}"
+        if entry.get("error"):
+            line += f" ({entry['error']})"
+        print(line)
+    print(f"Total: {time.perf_counter() - started:.2f}s")
+
+    if "Output Submission" in outputs:
+        print("\n" + "=" * 50)
+        print("FINAL OUTPUT:")
+        print("=" * 50)
+        print(json.dumps(outputs["Output Submission"], indent=2))
+    return 0 if all(e["status"] in ("ran", "cached") for e in report.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
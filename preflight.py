@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Preflight
+Checks the OpenAI key, Notion token/parent page and the spec URL concurrently using only
+the standard library, so it starts in well under 200ms (no openai, notion_client,
+pandas or matplotlib imports).
+
+Usage:
+    python preflight.py [--timeout 5]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from spec_scraper import SPEC_URL, USER_AGENT
+
+OPENAI_MODELS_URL = "https://api.openai.com/v1/models"
+NOTION_API_URL = "https://api.notion.com/v1"
+NOTION_VERSION = "2022-06-28"
+
+
+def _get_json(url, headers, timeout):
+    request = urllib.request.Request(url, headers=headers)
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.status, json.loads(response.read().decode('utf-8'))
+
+
+def check_openai(timeout=5):
+    """Verify OPENAI_API_KEY by listing models"""
+    key = os.environ.get("OPENAI_API_KEY")
+    if not key:
+        return {"ok": False, "detail": "OPENAI_API_KEY is not set"}
+    _, body = _get_json(OPENAI_MODELS_URL, {"Authorization": f"Bearer {key}"}, timeout)
+    models = [m["id"] for m in body.get("data", [])]
+    return {"ok": True, "detail": f"first 3 models: {models[:3]}"}
+
+
+def check_notion(timeout=5):
+    """Verify NOTION_TOKEN can read the NOTION_PARENT page"""
+    token = os.environ.get("NOTION_TOKEN")
+    parent = os.environ.get("NOTION_PARENT")
+    if not token or not parent:
+        return {"ok": False, "detail": "NOTION_TOKEN and NOTION_PARENT must be set"}
+    base_url = os.environ.get("NOTION_BASE_URL", "https://api.notion.com").rstrip('/') + "/v1"
+    _, page = _get_json(f"{base_url}/pages/{parent}", {
+        "Authorization": f"Bearer {token}",
+        "Notion-Version": NOTION_VERSION,
+    }, timeout)
+    title = page.get("properties", {}).get("title", {}).get("title", [])
+    title = title[0]["plain_text"] if title else page.get("id", parent)
+    return {"ok": True, "detail": f"page title: {title}"}
+
+
+def check_spec(timeout=5):
+    """Verify the spec page is reachable"""
+    request = urllib.request.Request(SPEC_URL, method='HEAD', headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return {"ok": response.status < 400, "detail": f"HTTP {response.status}"}
+
+
+CHECKS = {
+    "OpenAI": check_openai,
+    "Notion": check_notion,
+    "Spec URL": check_spec,
+}
+
+
+def _run_check(check, timeout):
+    started = time.perf_counter()
+    try:
+        result = check(timeout)
+    except urllib.error.HTTPError as e:
+        result = {"ok": False, "detail": f"HTTP {e.code} {e.reason}"}
+    except Exception as e:
+        result = {"ok": False, "detail": str(e) or type(e).__name__}
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def run_preflight(timeout=5, checks=CHECKS):
+    """Run every check concurrently, returning {name: {"ok", "detail", "seconds"}}"""
+    with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+        futures = {name: pool.submit(_run_check, check, timeout) for name, check in checks.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check API keys and the spec URL")
+    parser.add_argument("--timeout", type=float, default=5, help="Per-check timeout in seconds")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    results = run_preflight(args.timeout)
+    for name, result in results.items():
+        mark = "✅" if result["ok"] else "❌"
+        print(f"{mark} {name}: {result['detail']} ({result['seconds'] * 1000:.0f} ms)")
+    print(f"Preflight finished in {time.perf_counter() - started:.2f}s")
+    return 0 if all(r["ok"] for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Markdown Quality-Gate Linter
+Walks a guide's parsed markdown tree (markdown_ast, shared with the Notion converter and
+HTML exporter) once and evaluates every document-level rule from the takehome.yaml
+quality_gates (H4+ headers, bullets per list, anchored links) plus the required outline
+sections in that same pass. Returns structured violations with line numbers.
+"""
+
+import re
+import operator
+from functools import lru_cache
+
+from markdown_ast import INLINE_TYPES, children, inline, line_of, parse_markdown
+
+WORKFLOW_PATH = "takehome.yaml"
+DEFAULT_QUALITY_GATES = [
+    'n_headers_H4_or_deeper == 0',
+    'bullets_per_list <= 5',
+    'links_are_anchored == true',
+    'QA_status == "PASS"',
+]
+
+GATE_PATTERN = re.compile(r'^\s*(\w+)\s*(==|!=|<=|>=|<|>)\s*(.+?)\s*$')
+OPERATORS = {'==': operator.eq, '!=': operator.ne, '<=': operator.le,
+             '>=': operator.ge, '<': operator.lt, '>': operator.gt}
+
+
+def _parse_value(raw):
+    raw = raw.strip().strip('"\'')
+    if raw.lower() in ('true', 'false'):
+        return raw.lower() == 'true'
+    try:
+        return int(raw)
+    except ValueError:
+        return raw
+
+
+def parse_gate(gate):
+    """Split a gate like 'bullets_per_list <= 5' into (metric, operator, value)"""
+    match = GATE_PATTERN.match(gate)
+    if not match:
+        raise ValueError(f"Unrecognized quality gate: {gate}")
+    metric, op, value = match.groups()
+    return metric, op, _parse_value(value)
+
+
+@lru_cache(maxsize=None)
+def _parse_gates(quality_gates):
+    return [parse_gate(g) for g in quality_gates]
+
+
+@lru_cache(maxsize=None)
+def load_quality_gates(path=WORKFLOW_PATH):
+    """Read quality_gates from the workflow file, falling back to the defaults"""
+    try:
+        import yaml
+        with open(path, encoding='utf-8') as f:
+            gates = (yaml.safe_load(f) or {}).get('quality_gates')
+        return tuple(gates or DEFAULT_QUALITY_GATES)
+    except (OSError, ImportError) as e:
+        print(f"Warning: Could not read quality gates from {path}: {e}")
+        return tuple(DEFAULT_QUALITY_GATES)
+
+
+def _may_link(text):
+    return '](' in text or 'http' in text
+
+
+def _link_violations(node, tokens, violations):
+    """Unanchored links and bare URLs among a node's inline tokens (code spans are skipped)"""
+    for token in tokens:
+        kind = token["type"]
+        if kind == 'link':
+            anchor = token["text"].strip()
+            if not anchor or anchor == token["url"]:
+                violations.append({"rule": "links_are_anchored", "line": line_of(node, token["start"]),
+                                   "message": f"Link without anchor text: {token['url']}"})
+        elif kind == 'url':
+            violations.append({"rule": "links_are_anchored", "line": line_of(node, token["start"]),
+                               "message": f"Bare URL: {token['url']}"})
+        elif (kind == 'bold' or kind == 'italic') and _may_link(token["text"]):
+            _link_violations(node, children(token), violations)
+
+
+def lint_document(doc, required_sections=(), quality_gates=None):
+    """Lint a parsed document (see markdown_ast.parse_markdown) in a single walk.
+
+    Returns {"passed", "metrics", "gates", "violations", "missing_sections"}; each violation
+    is a dict with "rule", "line" (1-based, or None for document-level findings) and "message".
+    Gates on metrics the document can't provide (e.g. QA_status) are reported as None.
+    """
+    quality_gates = tuple(quality_gates or load_quality_gates())
+    limits = {metric: (op, value) for metric, op, value in _parse_gates(quality_gates)}
+    max_bullets = limits.get('bullets_per_list', ('<=', None))[1]
+    violations = []
+
+    h4_count = 0
+    max_list = 0
+    remaining_sections = list(required_sections)
+    open_lists = {}  # indent -> [start_line, count]
+
+    def close_lists(min_indent=0):
+        nonlocal max_list
+        for indent in [i for i in open_lists if i >= min_indent]:
+            start, count = open_lists.pop(indent)
+            max_list = max(max_list, count)
+            if isinstance(max_bullets, int) and count > max_bullets:
+                violations.append({"rule": "bullets_per_list", "line": start,
+                                   "message": f"Bullet list has {count} items (max {max_bullets})"})
+
+    for node in doc["nodes"]:
+        kind = node["type"]
+        if kind == 'bullet':
+            indent = node["indent"]
+            if open_lists:
+                close_lists(indent + 1)
+            open_lists.setdefault(indent, [node["line"], 0])[1] += 1
+        elif open_lists:
+            # Lists end where the renderers end them: blank lines and continuation lines
+            # don't, any other block does (a numbered item only the lists nested in it)
+            close_lists(node["indent"] if kind == 'numbered' else 0)
+
+        if kind == 'heading':
+            level = node["level"]
+            if level >= 4:
+                h4_count += 1
+                violations.append({"rule": "n_headers_H4_or_deeper", "line": node["line"],
+                                   "message": f"H{level} header: {node['text']}"})
+            if remaining_sections:
+                text = node["text"]
+                remaining_sections = [s for s in remaining_sections if s not in text]
+
+        # Only tokenize text that could hold a link
+        if kind in INLINE_TYPES and _may_link(node["text"]):
+            _link_violations(node, inline(node), violations)
+        if kind == 'bullet' or kind == 'numbered':
+            for continuation in node["continuations"]:
+                if _may_link(continuation["text"]):
+                    _link_violations(continuation, inline(continuation), violations)
+
+    close_lists()
+    unanchored = sum(v["rule"] == "links_are_anchored" for v in violations)
+    metrics = {
+        'n_headers_H4_or_deeper': h4_count,
+        'bullets_per_list': max_list,
+        'links_are_anchored': unanchored == 0,
+        'n_lines': doc["n_lines"],
+    }
+    return _report(metrics, violations, remaining_sections, quality_gates)
+
+
+def _report(metrics, violations, remaining_sections, quality_gates):
+    for section in remaining_sections:
+        violations.append({"rule": "required_sections", "line": None,
+                           "message": f"Missing section: {section}"})
+    metrics['required_sections_present'] = not remaining_sections
+    results = {}
+    for (metric, op, value), gate in zip(_parse_gates(quality_gates), quality_gates):
+        results[gate] = OPERATORS[op](metrics[metric], value) if metric in metrics else None
+
+    violations.sort(key=lambda v: (v["line"] is None, v["line"] or 0))
+    return {
+        "passed": all(r is not False for r in results.values()) and not remaining_sections,
+        "metrics": metrics,
+        "gates": results,
+        "violations": violations,
+        "missing_sections": list(remaining_sections),
+    }
+
+
+def merge_reports(parts, required_sections=(), quality_gates=None):
+    """Combine the reports of consecutive slices of one document into the report for the
+    whole document. parts is [(line offset, report)], each linted with the same
+    required_sections; slices must start at headings so no list spans two of them."""
+    quality_gates = tuple(quality_gates or load_quality_gates())
+    violations = []
+    missing = set(required_sections)
+    metrics = {'n_headers_H4_or_deeper': 0, 'bullets_per_list': 0, 'links_are_anchored': True, 'n_lines': 0}
+    for offset, report in parts:
+        part = report["metrics"]
+        metrics['n_headers_H4_or_deeper'] += part['n_headers_H4_or_deeper']
+        metrics['bullets_per_list'] = max(metrics['bullets_per_list'], part['bullets_per_list'])
+        metrics['links_are_anchored'] = metrics['links_are_anchored'] and part['links_are_anchored']
+        metrics['n_lines'] += part['n_lines']
+        missing.intersection_update(report["missing_sections"])
+        violations.extend(dict(v, line=v["line"] + offset) for v in report["violations"] if v["line"] is not None)
+    remaining_sections = [s for s in required_sections if s in missing]
+    return _report(metrics, violations, remaining_sections, quality_gates)
+
+
+def lint_markdown(markdown, required_sections=(), quality_gates=None):
+    """Lint a markdown string"""
+    return lint_document(parse_markdown(markdown), required_sections, quality_gates)
+
+
+def lint_lines(lines, required_sections=(), quality_gates=None):
+    """Lint an iterable of markdown lines"""
+    return lint_markdown('\n'.join(line.rstrip('\n') for line in lines), required_sections, quality_gates)
+
+
+def lint_file(path, required_sections=(), quality_gates=None):
+    """Lint a markdown file"""
+    with open(path, encoding='utf-8') as f:
+        return lint_lines(f, required_sections, quality_gates)
+
+
+def format_violation(violation):
+    """One-line human-readable form of a violation"""
+    where = f"line {violation['line']}" if violation['line'] else "document"
+    return f"Quality gate violation ({violation['rule']}, {where}): {violation['message']}"
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Questions
+Clusters near-identical question wordings in roughly linear time: MinHash signatures over
+word-bigram shingles, locality-sensitive hashing into bands, a signature-agreement check
+on each candidate pair, then connected components. Signatures and cluster labels are saved
+next to the bank's table cache, so selection only pays for them once per bank version.
+
+Usage:
+    python question_dedup.py bank.csv [--threshold 0.7] [--show 10]
+"""
+
+import os
+import sys
+import argparse
+
+from lazy_import import lazy_import
+from question_selection import TOKEN_PATTERN
+
+np = lazy_import("numpy")
+
+NUM_PERM = 128
+BANDS = 16  # 16 bands x 8 rows: pairs above ~0.7 Jaccard almost always share a bucket
+THRESHOLD = 0.7
+SEED = 1
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+VERIFY_BATCH = 100_000
+
+
+def shingle_hashes(texts):
+    """64-bit hashes of each text's word bigrams (its single word if it has only one).
+
+    Returns (hashes, doc_ids) with doc_ids ascending.
+    """
+    import pandas as pd
+
+    tokens = pd.Series(texts, dtype=object).fillna('').str.lower().str.findall(TOKEN_PATTERN).explode()
+    tokens = tokens[tokens.notna()]
+    docs = tokens.index.to_numpy(dtype=np.int64)
+    words = tokens.to_numpy(dtype=object)
+
+    same = docs[:-1] == docs[1:]
+    bigrams = pd.Series(words[:-1][same]) + ' ' + pd.Series(words[1:][same])
+    counts = np.bincount(docs, minlength=len(texts))
+    single = counts[docs] == 1
+
+    shingles = np.concatenate([bigrams.to_numpy(dtype=object), words[single]])
+    doc_ids = np.concatenate([docs[:-1][same], docs[single]])
+    order = np.argsort(doc_ids, kind='stable')
+    return pd.util.hash_array(shingles[order]), doc_ids[order]
+
+
+def minhash_signatures(texts, num_perm=NUM_PERM, seed=SEED):
+    """(len(texts), num_perm) uint32 MinHash signatures; texts without words keep MAX_HASH"""
+    hashes, doc_ids = shingle_hashes(texts)
+    signatures = np.full((len(texts), num_perm), MAX_HASH, dtype=np.uint32)
+    if len(hashes) == 0:
+        return signatures
+
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    starts = np.flatnonzero(np.r_[True, doc_ids[1:] != doc_ids[:-1]])
+    rows = doc_ids[starts]
+    for i in range(num_perm):
+        # Universal hashing; uint64 products wrap, which is fine for hashing
+        permuted = ((a[i] * hashes + b[i]) % MERSENNE_PRIME) & MAX_HASH
+        signatures[rows, i] = np.minimum.reduceat(permuted, starts)
+    return signatures
+
+
+def _band_keys(band):
+    """Collapse each row of a band into one 64-bit key"""
+    keys = band[:, 0].astype(np.uint64)
+    for j in range(1, band.shape[1]):
+        keys = keys * np.uint64(1_000_003) + band[:, j].astype(np.uint64)
+    return keys
+
+
+def lsh_clusters(signatures, bands=BANDS, threshold=THRESHOLD):
+    """Cluster label per row; rows whose signatures agree on >= threshold of positions join"""
+    from scipy import sparse
+    from scipy.sparse.csgraph import connected_components
+
+    n, num_perm = signatures.shape
+    rows_per_band = num_perm // bands
+    has_words = np.flatnonzero((signatures != MAX_HASH).any(axis=1))
+    if len(has_words) < 2:
+        return np.arange(n, dtype=np.int64)
+    edges_u, edges_v = [], []
+    for band in range(bands):
+        keys = _band_keys(signatures[has_words, band * rows_per_band:(band + 1) * rows_per_band])
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        # Link every bucket member to the bucket's first (earliest) row
+        leader = order[np.maximum.accumulate(np.where(starts, np.arange(len(order)), 0))]
+        members = ~starts
+        edges_u.append(has_words[order[members]])
+        edges_v.append(has_words[leader[members]])
+
+    u = np.concatenate(edges_u) if edges_u else np.zeros(0, dtype=np.int64)
+    v = np.concatenate(edges_v) if edges_v else np.zeros(0, dtype=np.int64)
+    if len(u):
+        pairs = np.unique(np.stack([u, v], axis=1), axis=0)
+        u, v = pairs[:, 0], pairs[:, 1]
+    # Bucket collisions are only candidates: keep pairs whose estimated Jaccard passes
+    keep = np.zeros(len(u), dtype=bool)
+    for start in range(0, len(u), VERIFY_BATCH):
+        stop = start + VERIFY_BATCH
+        agreement = (signatures[u[start:stop]] == signatures[v[start:stop]]).mean(axis=1)
+        keep[start:stop] = agreement >= threshold
+    graph = sparse.coo_matrix((np.ones(int(keep.sum()), dtype=np.int8), (u[keep], v[keep])), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    return labels.astype(np.int64)
+
+
+def representative_mask(labels):
+    """True for the first (earliest stored) row of each cluster"""
+    mask = np.zeros(len(labels), dtype=bool)
+    _, first = np.unique(labels, return_index=True)
+    mask[first] = True
+    return mask
+
+
+def _sidecar(bank, name):
+    # A subdirectory, so the table loader doesn't map these as columns
+    return os.path.join(bank.path, "derived", f"{name}.npy") if getattr(bank, 'path', None) else None
+
+
+def _load_sidecar(path):
+    try:
+        return np.load(path, mmap_mode='r') if path else None
+    except (OSError, ValueError):
+        return None
+
+
+def _save_sidecar(path, array):
+    if not path:
+        return
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: Could not cache {os.path.basename(path)}: {e}")
+
+
+def cluster_questions(bank, column='Question', num_perm=NUM_PERM, bands=BANDS, threshold=THRESHOLD):
+    """Cluster labels for a CachedTable column (stored row order), cached beside the table"""
+    signature_name = f"minhash-{column}-{num_perm}-{SEED}"
+    cluster_name = f"{signature_name}-lsh-{bands}-{threshold:g}"
+    labels = _load_sidecar(_sidecar(bank, cluster_name))
+    if labels is not None and len(labels) == len(bank):
+        return labels
+
+    signatures = _load_sidecar(_sidecar(bank, signature_name))
+    if signatures is None or len(signatures) != len(bank):
+        signatures = minhash_signatures(bank.column(column), num_perm)
+        _save_sidecar(_sidecar(bank, signature_name), signatures)
+    labels = lsh_clusters(np.asarray(signatures), bands, threshold)
+    _save_sidecar(_sidecar(bank, cluster_name), labels)
+    return labels
+
+
+def main(argv=None):
+    from question_store import load_table
+
+    parser = argparse.ArgumentParser(description="Find near-duplicate questions in a bank")
+    parser.add_argument("source", help="Question bank CSV")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Estimated Jaccard to merge")
+    parser.add_argument("--show", type=int, default=10, help="Largest clusters to print")
+    args = parser.parse_args(argv)
+
+    bank = load_table(args.source, index_column='Category')
+    labels = np.asarray(cluster_questions(bank, threshold=args.threshold))
+    sizes = np.bincount(labels)
+    print(f"{len(bank)} questions, {len(sizes)} clusters, "
+          f"{int((sizes > 1).sum())} with near-duplicates ({len(bank) - len(sizes)} rows dropped)")
+
+    questions = bank.column('Question')
+    for label in np.argsort(-sizes, kind='stable')[:args.show]:
+        if sizes[label] < 2:
+            break
+        members = np.flatnonzero(labels == label)
+        print(f"\n{sizes[label]} near-duplicates:")
+        for row in members[:5]:
+            print(f"  - {questions[row]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Question Selection Engine
+Scores every question in the bank against every outline section in one sparse
+matrix product (BM25 weights) and keeps the top-k per section with a partial sort.
+"""
+
+import re
+
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+TOKEN_PATTERN = r'[a-z0-9]+'
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'for', 'from', 'how',
+    'in', 'is', 'it', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'what', 'when',
+    'which', 'with', 'would', 'you', 'your',
+}
+
+# Extra query terms per outline section; section titles alone are too short to rank well
+SECTION_KEYWORDS = {
+    'Role Overview & Culture': 'role culture team values ownership business impact',
+    'Interview Process': 'interview process rounds recruiter screening onsite hiring manager',
+    'SQL Challenges': 'sql query queries join joins window aggregate aggregation table group',
+    'Python for Data Science': 'python pandas function implement code algorithm dataframe',
+    'Machine Learning': 'machine learning model models ml classification regression feature '
+                        'features recommendation training overfitting',
+    'Experiment Design': 'experiment experiments ab test testing hypothesis significance '
+                         'variant control',
+    'Metric Definition': 'metric metrics kpi measure measuring engagement conversion retention '
+                         'funnel success',
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text):
+    """Lowercase word tokens with stopwords removed"""
+    return [t for t in re.findall(TOKEN_PATTERN, text.lower()) if t not in STOPWORDS]
+
+
+def section_queries(sections):
+    """Query text for each section: its title plus any configured keywords"""
+    return [f"{section} {SECTION_KEYWORDS.get(section, '')}" for section in sections]
+
+
+def term_counts(documents, vocabulary):
+    """Raw query-term counts as a (n_documents x len(vocabulary)) CSR matrix, plus document lengths.
+
+    Only query terms are kept as columns, but document lengths count every token,
+    so the matrix stays narrow even for very large banks.
+    """
+    import pandas as pd
+    from scipy import sparse
+
+    n_docs = len(documents)
+    tokens = pd.Series(documents, dtype=object).fillna('').str.lower().str.findall(TOKEN_PATTERN).explode()
+    tokens = tokens[~tokens.isin(STOPWORDS) & tokens.notna()]
+    lengths = np.bincount(tokens.index.to_numpy(dtype=np.int64), minlength=n_docs).astype(np.float32)
+
+    term_ids = tokens.map(vocabulary)
+    matched = term_ids.notna()
+    rows = term_ids.index.to_numpy(dtype=np.int64)[matched.to_numpy()]
+    cols = term_ids[matched].to_numpy(dtype=np.int64)
+    tf = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)),
+                           shape=(n_docs, len(vocabulary)))
+    tf.sum_duplicates()
+    return tf, lengths
+
+
+def document_frequencies(tf):
+    """Number of documents containing each vocabulary term"""
+    return np.bincount(tf.indices, minlength=tf.shape[1]).astype(np.int64)
+
+
+def bm25_weights(tf, lengths, doc_freq, n_docs, avg_length):
+    """Turn raw counts into BM25 weights in place, using corpus-wide statistics.
+
+    Passing the statistics in lets a chunk of a larger corpus be weighted exactly as it
+    would be in a single in-memory pass.
+    """
+    doc_freq = np.asarray(doc_freq).astype(np.float32)
+    idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+    row_norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / avg_length)
+    norm = np.repeat(row_norm, np.diff(tf.indptr))
+    tf.data = tf.data * (BM25_K1 + 1) / (tf.data + norm) * idf[tf.indices]
+    return tf
+
+
+def average_length(total_length, n_docs):
+    return float(total_length) / n_docs if n_docs and total_length > 0 else 1.0
+
+
+def bm25_matrix(documents, vocabulary):
+    """BM25-weighted (n_documents x len(vocabulary)) CSR matrix"""
+    tf, lengths = term_counts(documents, vocabulary)
+    n_docs = len(documents)
+    return bm25_weights(tf, lengths, document_frequencies(tf), n_docs,
+                        average_length(lengths.sum(dtype=np.float64), n_docs))
+
+
+def top_k_rows(scores, k):
+    """Indices of the k highest positive scores, best first (ties keep bank order)"""
+    positive = np.flatnonzero(scores > 0)
+    if len(positive) > k:
+        values = scores[positive]
+        kth = np.partition(values, len(values) - k)[len(values) - k]
+        above = positive[values > kth]
+        # Deterministic tie-break at the cut-off: earliest rows win
+        tied = positive[values == kth][:k - len(above)]
+        positive = np.concatenate([above, tied])
+    return positive[np.lexsort((positive, -scores[positive]))]
+
+
+def query_vocabulary(sections):
+    """Unique query terms per section and a term -> column index vocabulary"""
+    queries = [list(dict.fromkeys(tokenize(q))) for q in section_queries(sections)]
+    vocabulary = {}
+    for terms in queries:
+        for term in terms:
+            vocabulary.setdefault(term, len(vocabulary))
+    return queries, vocabulary
+
+
+def query_matrix(queries, vocabulary):
+    """(n_sections x len(vocabulary)) indicator matrix of each section's query terms"""
+    from scipy import sparse
+
+    query_rows = [i for i, terms in enumerate(queries) for _ in terms]
+    query_cols = [vocabulary[t] for terms in queries for t in terms]
+    return sparse.csr_matrix(
+        (np.ones(len(query_cols), dtype=np.float32), (query_rows, query_cols)),
+        shape=(len(queries), len(vocabulary)))
+
+
+def section_scores(weights, queries_matrix):
+    """Dense (n_documents, n_sections) scores from BM25 weights"""
+    return np.asarray((weights @ queries_matrix.T).todense(), dtype=np.float32)
+
+
+def score_sections(documents, sections):
+    """Score every document against every section; returns a dense (n, n_sections) array"""
+    queries, vocabulary = query_vocabulary(sections)
+    return section_scores(bm25_matrix(documents, vocabulary), query_matrix(queries, vocabulary))
+
+
+def question_documents(bank, questions):
+    """Text scored for each question: its category followed by the question itself"""
+    if 'Category' in bank.columns:
+        return [f"{c or ''} {q or ''}" for c, q in zip(bank.column('Category'), questions)]
+    return [q or '' for q in questions]
+
+
+def select_questions(bank, sections, k=5, dedupe=False):
+    """Pick the ≤k most specific questions for each section, returning {section: [question]}.
+
+    With dedupe, only the first question of each near-duplicate cluster can be picked.
+    """
+    if not sections or len(bank) == 0 or 'Question' not in bank.columns:
+        return {section: [] for section in sections}
+
+    questions = bank.column('Question')
+    scores = score_sections(question_documents(bank, questions), sections)
+    if dedupe:
+        from question_dedup import cluster_questions, representative_mask
+        scores[~representative_mask(cluster_questions(bank))] = 0
+    selections = {}
+    for j, section in enumerate(sections):
+        selections[section] = [questions[r] for r in top_k_rows(scores[:, j], k)]
+    return selections
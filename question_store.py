@@ -0,0 +1,284 @@
+"""
+Cached Question-Bank Store
+Parses a CSV once into a columnar on-disk cache (categorical codes, compact numeric dtypes,
+NUL-separated UTF-8 text blobs) that is memory-mapped on later runs. Rows are grouped by
+an index column so per-category lookups are a single slice instead of a full-frame scan.
+
+The cache is keyed on the source file: a matching mtime and size is a warm hit without
+reading the CSV; otherwise the SHA-256 is compared before deciding to rebuild.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+
+from lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+CACHE_DIR = os.path.join(".cache", "tables")
+CACHE_VERSION = 1
+# Object columns with at most this share of distinct values are stored as categoricals
+CATEGORICAL_MAX_RATIO = 0.5
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Hash a file in chunks without loading it into memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _codes_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _compact_numeric(values):
+    """Downcast integers to the smallest dtype and floats to float32 when lossless"""
+    import pandas as pd
+
+    if values.dtype.kind in 'iu':
+        return pd.to_numeric(values, downcast='integer')
+    if values.dtype.kind == 'f':
+        compact = values.astype(np.float32)
+        if np.array_equal(compact.astype(values.dtype), values, equal_nan=True):
+            return compact
+    return values
+
+
+def _encode_frame(df, index_column=None):
+    """Encode a DataFrame into (arrays, meta), with rows grouped by index_column"""
+    import pandas as pd
+
+    n_rows = len(df)
+    if index_column not in df.columns:
+        index_column = None
+
+    if index_column is not None:
+        index_codes, index_categories = pd.factorize(df[index_column], sort=False)
+        n_categories = len(index_categories)
+        # Nulls (code -1) sort after every real category
+        sort_key = np.where(index_codes < 0, n_categories, index_codes)
+        order = np.argsort(sort_key, kind='stable')
+        index_offsets = np.searchsorted(sort_key[order], np.arange(n_categories + 1)).astype(np.int64)
+    else:
+        order = np.arange(n_rows)
+        index_categories = []
+        index_offsets = np.zeros(1, dtype=np.int64)
+
+    arrays = {"order": order.astype(np.int64), "index_offsets": index_offsets}
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name].iloc[order]
+        column = {"name": str(name)}
+        if series.dtype.kind in 'biuf':
+            column["kind"] = "numeric"
+            arrays[f"{i}.values"] = np.asarray(_compact_numeric(series.to_numpy()))
+        elif name == index_column or (
+                series.nunique(dropna=True) <= max(1, CATEGORICAL_MAX_RATIO * n_rows)):
+            if name == index_column:
+                # Reuse the index codes so they stay aligned with index_offsets
+                codes, categories = index_codes[order], index_categories
+            else:
+                codes, categories = pd.factorize(series, sort=False)
+            column["kind"] = "category"
+            column["categories"] = [str(c) for c in categories]
+            arrays[f"{i}.codes"] = codes.astype(_codes_dtype(len(categories)))
+        else:
+            nulls = series.isna().to_numpy()
+            texts = series.fillna('').astype(str).str.replace('\x00', '', regex=False).tolist()
+            encoded = [t.encode('utf-8') for t in texts]
+            lengths = np.fromiter((len(b) + 1 for b in encoded), dtype=np.int64, count=len(encoded))
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            column["kind"] = "text"
+            arrays[f"{i}.text"] = np.frombuffer(b'\x00'.join(encoded) + b'\x00', dtype=np.uint8)
+            arrays[f"{i}.offsets"] = offsets
+            if nulls.any():
+                arrays[f"{i}.nulls"] = nulls
+        columns.append(column)
+
+    meta = {
+        "version": CACHE_VERSION,
+        "n_rows": n_rows,
+        "index_column": index_column,
+        "index_categories": [str(c) for c in index_categories],
+        "columns": columns,
+    }
+    return arrays, meta
+
+
+class CachedTable:
+    """Columnar table backed by in-memory or memory-mapped numpy arrays"""
+
+    def __init__(self, arrays, meta, path=None):
+        self._arrays = arrays
+        self.meta = meta
+        # Cache directory when memory-mapped; derived data (e.g. MinHash signatures) lives beside it
+        self.path = path
+        self.index_column = meta["index_column"]
+        self.index_categories = meta["index_categories"]
+        self._columns = {c["name"]: (i, c) for i, c in enumerate(meta["columns"])}
+        offsets = arrays["index_offsets"]
+        self._index = {cat: (int(offsets[i]), int(offsets[i + 1]))
+                       for i, cat in enumerate(self.index_categories)}
+
+    @classmethod
+    def from_frame(cls, df, index_column=None):
+        """Build an uncached table from an in-memory DataFrame"""
+        return cls(*_encode_frame(df, index_column))
+
+    def fingerprint(self):
+        """Content hash of the table: the source file's SHA-256, or of the arrays themselves"""
+        if self.meta.get("sha256"):
+            return f"{self.meta['sha256']}:{self.index_column}"
+        digest = hashlib.sha256(json.dumps(self.meta, sort_keys=True).encode('utf-8'))
+        for name in sorted(self._arrays):
+            digest.update(np.ascontiguousarray(self._arrays[name]).tobytes())
+        return digest.hexdigest()
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def __len__(self):
+        return self.meta["n_rows"]
+
+    def category_slice(self, category):
+        """Return the (start, stop) rows for a category of the index column"""
+        return self._index.get(category, (0, 0))
+
+    def categories(self, name):
+        """Labels of a categorical column, or None if the column isn't stored as categories"""
+        i, column = self._columns[name]
+        return column["categories"] if column["kind"] == "category" else None
+
+    def codes(self, name):
+        """Integer codes of a categorical column, in stored (grouped) row order"""
+        i, column = self._columns[name]
+        return self._arrays[f"{i}.codes"]
+
+    def column(self, name, start=0, stop=None):
+        """Decode rows [start, stop) of a column in stored (grouped) row order"""
+        i, column = self._columns[name]
+        stop = len(self) if stop is None else min(stop, len(self))
+        if column["kind"] == "numeric":
+            return self._arrays[f"{i}.values"][start:stop]
+        if column["kind"] == "category":
+            categories = column["categories"]
+            return [categories[c] if c >= 0 else None for c in self._arrays[f"{i}.codes"][start:stop]]
+        offsets = self._arrays[f"{i}.offsets"]
+        raw = self._arrays[f"{i}.text"][offsets[start]:max(offsets[stop] - 1, offsets[start])]
+        values = raw.tobytes().decode('utf-8').split('\x00') if stop > start else []
+        nulls = self._arrays.get(f"{i}.nulls")
+        if nulls is not None:
+            values = [None if is_null else v for v, is_null in zip(values, nulls[start:stop])]
+        return values
+
+    def rows(self, category, name, n=None):
+        """First n values of a column for one category of the index column"""
+        start, stop = self.category_slice(category)
+        if n is not None:
+            stop = min(stop, start + n)
+        return self.column(name, start, stop)
+
+    def frame(self):
+        """Materialize a pandas DataFrame in the source's original row order"""
+        import pandas as pd
+
+        data = {}
+        for name, (i, column) in self._columns.items():
+            if column["kind"] == "category":
+                data[name] = pd.Categorical.from_codes(
+                    np.asarray(self._arrays[f"{i}.codes"], dtype=np.int64), column["categories"])
+            elif column["kind"] == "numeric":
+                data[name] = np.asarray(self._arrays[f"{i}.values"])
+            else:
+                data[name] = self.column(name)
+        order = self._arrays["order"]
+        restore = np.empty_like(order)
+        restore[order] = np.arange(len(order))
+        return pd.DataFrame(data).take(restore).reset_index(drop=True)
+
+
+def _cache_path(source, cache_dir):
+    key = hashlib.sha1(os.path.abspath(source).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, key)
+
+
+def _read_meta(path):
+    try:
+        with open(os.path.join(path, "meta.json"), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(path, arrays, meta):
+    """Write arrays and meta to a temp directory, then swap it into place"""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name, array in arrays.items():
+        if name.endswith(".text"):
+            array.tofile(os.path.join(tmp_path, f"{name}.bin"))
+        else:
+            np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+    with open(os.path.join(tmp_path, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+
+
+def _open_cache(path, meta):
+    """Memory-map every array of a cache directory"""
+    arrays = {}
+    for filename in os.listdir(path):
+        full = os.path.join(path, filename)
+        if filename.endswith(".npy"):
+            arrays[filename[:-4]] = np.load(full, mmap_mode='r')
+        elif filename.endswith(".bin"):
+            arrays[filename[:-4]] = (np.memmap(full, dtype=np.uint8, mode='r')
+                                     if os.path.getsize(full) else np.zeros(0, dtype=np.uint8))
+    return CachedTable(arrays, meta, path)
+
+
+def load_table(source, index_column=None, cache_dir=CACHE_DIR, **read_csv_kwargs):
+    """Load a CSV through the columnar cache, rebuilding only when its content changed"""
+    import pandas as pd
+
+    stat = os.stat(source)
+    path = _cache_path(source, cache_dir)
+    meta = _read_meta(path)
+
+    if meta and meta.get("version") == CACHE_VERSION and meta.get("index_column_requested") == index_column:
+        if meta["mtime_ns"] == stat.st_mtime_ns and meta["size"] == stat.st_size:
+            return _open_cache(path, meta)
+        # Touched but possibly unchanged: confirm by content hash before rebuilding
+        if meta["size"] == stat.st_size and meta["sha256"] == file_sha256(source):
+            meta["mtime_ns"] = stat.st_mtime_ns
+            with open(os.path.join(path, "meta.json"), 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            return _open_cache(path, meta)
+
+    df = pd.read_csv(source, **read_csv_kwargs)
+    arrays, meta = _encode_frame(df, index_column)
+    meta.update({
+        "source": os.path.abspath(source),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": file_sha256(source),
+        "index_column_requested": index_column,
+    })
+    try:
+        _write_cache(path, arrays, meta)
+        return _open_cache(path, meta)
+    except OSError as e:
+        print(f"Warning: Could not write table cache for {source}: {e}")
+        return CachedTable(arrays, meta)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Streaming Question Selection
+Selects the top-k questions per outline section from a CSV bank whose text doesn't fit
+in memory. Without dedupe, two chunked passes keep memory flat regardless of file size:
+the first collects the corpus statistics BM25 needs (document count, total length,
+per-term document frequency, category order), the second scores each chunk with those
+statistics and keeps a bounded heap per section.
+
+Selections match select_questions() on the same bank loaded with load_table(...,
+index_column='Category'), including the order ties are broken in; check_parity() verifies
+that for a given file. With dedupe, an extra chunked pass writes MinHash signatures to a
+temporary file on disk (in the table's stored row order) and clusters them with the same
+LSH banding as question_dedup, so the same representative of each near-duplicate cluster
+is kept as in memory. The text and signature matrix stay on disk, but dedupe is not flat:
+RAM holds a few bytes per row (category rank, stored position and keep flag) plus one
+LSH band at a time, so it grows linearly, if slowly, with the bank.
+
+Usage:
+    python question_stream.py bank.csv [--chunksize 100000] [--k 5] [--check-parity]
+"""
+
+import os
+import sys
+import heapq
+import argparse
+import tempfile
+
+from lazy_import import lazy_import
+from question_selection import (
+    term_counts,
+    document_frequencies,
+    bm25_weights,
+    average_length,
+    query_vocabulary,
+    query_matrix,
+    section_scores,
+    select_questions,
+)
+
+np = lazy_import("numpy")
+
+DEFAULT_CHUNKSIZE = 100_000
+DEFAULT_SECTIONS = ['Role Overview & Culture', 'Interview Process', 'SQL Challenges',
+                    'Python for Data Science', 'Machine Learning', 'Experiment Design',
+                    'Metric Definition']
+
+
+def _read_chunks(source, chunksize, index_column):
+    """Yield (categories, questions) lists per chunk, with None for missing values"""
+    import pandas as pd
+
+    header = pd.read_csv(source, nrows=0).columns
+    columns = [c for c in (index_column, 'Question') if c in header]
+    if 'Question' not in columns:
+        return
+    for chunk in pd.read_csv(source, usecols=columns, dtype=str, chunksize=chunksize):
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        questions = chunk['Question'].tolist()
+        categories = chunk[index_column].tolist() if index_column in chunk else [None] * len(questions)
+        yield categories, questions
+
+
+def _documents(categories, questions, has_category):
+    # Same text as question_selection.question_documents
+    if has_category:
+        return [f"{c or ''} {q or ''}" for c, q in zip(categories, questions)]
+    return [q or '' for q in questions]
+
+
+def _has_column(source, name):
+    import pandas as pd
+
+    return name in pd.read_csv(source, nrows=0).columns
+
+
+def corpus_statistics(source, vocabulary, chunksize=DEFAULT_CHUNKSIZE, index_column='Category'):
+    """First pass: document count, total length, document frequencies and category ranks"""
+    has_category = _has_column(source, index_column)
+    n_docs = 0
+    total_length = 0.0
+    doc_freq = np.zeros(len(vocabulary), dtype=np.int64)
+    category_rank = {}
+    for categories, questions in _read_chunks(source, chunksize, index_column):
+        tf, lengths = term_counts(_documents(categories, questions, has_category), vocabulary)
+        n_docs += len(questions)
+        total_length += lengths.sum(dtype=np.float64)
+        doc_freq += document_frequencies(tf)
+        for category in categories:
+            if category is not None and category not in category_rank:
+                category_rank[category] = len(category_rank)
+    return {"n_docs": n_docs, "total_length": total_length, "doc_freq": doc_freq,
+            "category_rank": category_rank, "has_category": has_category}
+
+
+def stream_representatives(source, chunksize=DEFAULT_CHUNKSIZE, index_column='Category'):
+    """True per CSV row (file order) for the rows select_questions(..., dedupe=True) may pick:
+    the first row, in the table's stored order, of each near-duplicate cluster.
+
+    Signatures go to disk; the per-row ranks, stored order and mask held here are O(rows).
+    """
+    from question_dedup import NUM_PERM, lsh_clusters, minhash_signatures, representative_mask
+
+    has_category = _has_column(source, index_column)
+    category_rank = {}
+    ranks = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_path = os.path.join(tmp_dir, "signatures.raw")
+        with open(raw_path, 'wb') as f:
+            for categories, questions in _read_chunks(source, chunksize, index_column):
+                f.write(minhash_signatures(questions, NUM_PERM).tobytes())
+                chunk_ranks = np.empty(len(categories), dtype=np.int32)
+                for i, category in enumerate(categories):
+                    if not has_category:
+                        chunk_ranks[i] = 0
+                    elif category is None:
+                        chunk_ranks[i] = -1
+                    else:
+                        chunk_ranks[i] = category_rank.setdefault(category, len(category_rank))
+                ranks.append(chunk_ranks)
+        ranks = np.concatenate(ranks) if ranks else np.zeros(0, dtype=np.int32)
+        n = len(ranks)
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+
+        # Stored order groups rows by category (first appearance, missing last), file order within
+        ranks[ranks < 0] = len(category_rank)
+        stored = np.argsort(ranks, kind='stable').astype(np.int32 if n < 2 ** 31 else np.int64)
+        del ranks
+        file_signatures = np.memmap(raw_path, dtype=np.uint32, mode='r', shape=(n, NUM_PERM))
+        stored_signatures = np.lib.format.open_memmap(os.path.join(tmp_dir, "stored.npy"), mode='w+',
+                                                      dtype=np.uint32, shape=(n, NUM_PERM))
+        for start in range(0, n, chunksize):
+            stored_signatures[start:start + chunksize] = file_signatures[stored[start:start + chunksize]]
+        mask = representative_mask(lsh_clusters(stored_signatures))
+        del file_signatures, stored_signatures
+
+    keep = np.empty(n, dtype=bool)
+    keep[stored] = mask
+    return keep
+
+
+def stream_select_questions(source, sections, k=5, chunksize=DEFAULT_CHUNKSIZE, index_column='Category',
+                            dedupe=False):
+    """Pick the ≤k most specific questions per section from a CSV, streaming it in chunks.
+
+    With dedupe, only the first question of each near-duplicate cluster can be picked,
+    exactly as in select_questions(..., dedupe=True).
+    """
+    if not sections:
+        return {}
+    queries, vocabulary = query_vocabulary(sections)
+    stats = corpus_statistics(source, vocabulary, chunksize, index_column)
+    if stats["n_docs"] == 0:
+        return {section: [] for section in sections}
+
+    n_docs = stats["n_docs"]
+    avg_length = average_length(stats["total_length"], n_docs)
+    queries_matrix = query_matrix(queries, vocabulary)
+    category_rank = stats["category_rank"]
+    # A table indexed on the category column stores rows grouped by category in order of
+    # first appearance (missing categories last); ties break on that stored position
+    null_rank = len(category_rank)
+    keep = stream_representatives(source, chunksize, index_column) if dedupe else None
+
+    # Min-heaps of (score, -rank, -row, question): the root is the entry to evict next
+    heaps = [[] for _ in sections]
+    row_offset = 0
+    for categories, questions in _read_chunks(source, chunksize, index_column):
+        tf, lengths = term_counts(_documents(categories, questions, stats["has_category"]), vocabulary)
+        scores = section_scores(bm25_weights(tf, lengths, stats["doc_freq"], n_docs, avg_length),
+                                queries_matrix)
+        if keep is not None:
+            scores[~keep[row_offset:row_offset + len(questions)]] = 0
+        ranks = np.fromiter((category_rank.get(c, null_rank) if stats["has_category"] else 0
+                             for c in categories), dtype=np.int64, count=len(categories))
+        rows = np.arange(row_offset, row_offset + len(questions), dtype=np.int64)
+
+        for j, heap in enumerate(heaps):
+            column = scores[:, j]
+            candidates = np.flatnonzero(column > 0)
+            if len(candidates) > k:
+                values = column[candidates]
+                kth = np.partition(values, len(values) - k)[len(values) - k]
+                candidates = candidates[values >= kth]
+            # Best k in this chunk: highest score, then earliest stored position
+            order = np.lexsort((rows[candidates], ranks[candidates], -column[candidates]))
+            for i in candidates[order[:k]]:
+                entry = (float(column[i]), -int(ranks[i]), -int(rows[i]), questions[i])
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+        row_offset += len(questions)
+
+    return {section: [entry[3] for entry in sorted(heap, reverse=True)]
+            for section, heap in zip(sections, heaps)}
+
+
+def check_parity(source, sections=DEFAULT_SECTIONS, k=5, chunksize=DEFAULT_CHUNKSIZE, cache_dir=None,
+                 dedupe=True):
+    """Compare streaming selections with the in-memory path; returns a list of mismatches.
+
+    dedupe defaults to True, as build_meesho_guide selects with it on both paths.
+    """
+    from question_store import CACHE_DIR, load_table
+
+    bank = load_table(source, index_column='Category', cache_dir=cache_dir or CACHE_DIR)
+    expected = select_questions(bank, sections, k, dedupe=dedupe)
+    actual = stream_select_questions(source, sections, k, chunksize, dedupe=dedupe)
+    return [f"{section}: expected {expected[section]!r}, got {actual.get(section)!r}"
+            for section in sections if expected[section] != actual.get(section)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Select questions from a large CSV bank in chunks")
+    parser.add_argument("source", help="Question bank CSV (Category, Question columns)")
+    parser.add_argument("--k", type=int, default=5, help="Questions per section")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows per chunk")
+    parser.add_argument("--check-parity", action="store_true",
+                        help="Also run the in-memory selection and compare")
+    parser.add_argument("--no-dedupe", action="store_true",
+                        help="Keep near-duplicate questions (the guide builder drops them)")
+    args = parser.parse_args(argv)
+    dedupe = not args.no_dedupe
+
+    if args.check_parity:
+        mismatches = check_parity(args.source, k=args.k, chunksize=args.chunksize, dedupe=dedupe)
+        for mismatch in mismatches:
+            print(f"MISMATCH {mismatch}")
+        print("Parity: PASS" if not mismatches else f"Parity: FAIL ({len(mismatches)} section(s))")
+        return 1 if mismatches else 0
+
+    for section, questions in stream_select_questions(args.source, DEFAULT_SECTIONS, args.k,
+                                                      args.chunksize, dedupe=dedupe).items():
+        print(f"\n{section}")
+        for i, question in enumerate(questions, 1):
+            print(f"  {i}. {question}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
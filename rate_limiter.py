@@ -0,0 +1,389 @@
+"""
+Rate Limiter
+One client-side scheduler for all outbound HTTP. Each service (Notion, OpenAI, the web)
+has a token bucket sized to its documented limit; waiting requests are served by priority
+lane (interactive, normal, batch) and then in arrival order. A 429/503 with Retry-After
+pauses the whole service rather than just the request that saw it, and other retryable
+failures back off exponentially with full jitter, so batch runs settle at the API's
+allowed rate instead of retry storms. Waiters sleep until their turn or the next token
+rather than polling, and no transport retries hosts that fail DNS resolution or refuse
+the connection.
+
+It plugs in at the transport layer (httpx transports, a requests adapter), so notion_client,
+the OpenAI SDK, httpx and requests callers share the same buckets within a process.
+"""
+
+import os
+import time
+import heapq
+import socket
+import random
+import asyncio
+import itertools
+import threading
+import contextvars
+import email.utils
+from functools import lru_cache
+from contextlib import contextmanager
+
+# Requests per second and burst size per service
+SERVICE_LIMITS = {
+    "notion": (3.0, 3),     # Notion allows an average of 3 requests/second per integration
+    "openai": (8.0, 16),
+    "web": (10.0, 20),
+}
+PRIORITIES = {"interactive": 0, "normal": 1, "batch": 2}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Rejected before processing, so resending is safe for any method
+ALWAYS_RETRY_STATUSES = {429, 503}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+
+_priority = contextvars.ContextVar("rate_limit_priority", default=None)
+_default_priority = "normal"
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def set_default_priority(lane):
+    """Process-wide lane for requests made outside a priority() block (e.g. batch workers)"""
+    global _default_priority
+    _default_priority = lane
+
+
+@contextmanager
+def priority(lane):
+    """Run the enclosed requests in a priority lane ("interactive", "normal" or "batch")"""
+    token = _priority.set(lane)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    return _priority.get() or _default_priority
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def retry_after_seconds(headers):
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date), or None"""
+    value = headers.get("Retry-After") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_unreachable(error):
+    """True when a connection failed on DNS resolution or was refused: the host won't come
+    back within a retry's backoff, so the caller should fall back at once"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (socket.gaierror, ConnectionRefusedError)):
+            return True
+        # requests and urllib3 wrap the socket error as an argument or a "reason"
+        wrapped = getattr(error, "reason", None)
+        if not isinstance(wrapped, BaseException):
+            wrapped = next((a for a in getattr(error, "args", ()) if isinstance(a, BaseException)), None)
+        error = wrapped or error.__cause__ or error.__context__
+    return False
+
+
+class TokenBucket:
+    """Token bucket whose waiters are granted tokens in (priority, arrival) order"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.stats = {"granted": 0, "throttled": 0, "wait_s": 0.0}
+        self._waiters = []
+        self._wakers = {}  # ticket -> callable that wakes its waiter
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _enqueue(self, lane, waker):
+        ticket = (PRIORITIES.get(lane or current_priority(), PRIORITIES["normal"]), next(self._seq))
+        with self._lock:
+            heapq.heappush(self._waiters, ticket)
+            self._wakers[ticket] = waker
+        return ticket
+
+    def _wake_head(self):
+        # Called with the lock held whenever the head of the line is served or leaves
+        if self._waiters:
+            self._wakers[self._waiters[0]]()
+
+    def _try_acquire(self, ticket):
+        """0 if the ticket got a token, None while someone is ahead of it in line (its waker
+        is called once it reaches the head), otherwise how long until the next token"""
+        with self._lock:
+            if self._waiters[0] != ticket:
+                return None
+            now = time.monotonic()
+            self._refill(now)
+            if now < self.paused_until:
+                return self.paused_until - now
+            if self.tokens >= 1:
+                heapq.heappop(self._waiters)
+                del self._wakers[ticket]
+                self.tokens -= 1
+                self.stats["granted"] += 1
+                self._wake_head()
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def _cancel(self, ticket):
+        with self._lock:
+            if ticket in self._wakers:
+                head = self._waiters[0] == ticket
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                del self._wakers[ticket]
+                if head:
+                    self._wake_head()
+
+    def acquire(self, lane=None):
+        """Block the calling thread until a token is granted"""
+        turn = threading.Event()
+        ticket = self._enqueue(lane, turn.set)
+        started = time.monotonic()
+        try:
+            while True:
+                delay = self._try_acquire(ticket)
+                if delay is None:
+                    turn.wait()
+                    turn.clear()
+                elif delay:
+                    time.sleep(delay)
+                else:
+                    break
+        except BaseException:
+            self._cancel(ticket)
+            raise
+        self.stats["wait_s"] += time.monotonic() - started
+
+    async def acquire_async(self, lane=None):
+        """Wait (without blocking the event loop) until a token is granted"""
+        loop = asyncio.get_running_loop()
+        turn = asyncio.Event()
+
+        def wake():
+            # Tokens may be released from another thread or event loop
+            try:
+                loop.call_soon_threadsafe(turn.set)
+            except RuntimeError:
+                pass  # the loop has closed; its waiter is gone
+
+        ticket = self._enqueue(lane, wake)
+        started = time.monotonic()
+        try:
+            while True:
+                delay = self._try_acquire(ticket)
+                if delay is None:
+                    await turn.wait()
+                    turn.clear()
+                elif delay:
+                    await asyncio.sleep(delay)
+                else:
+                    break
+        except BaseException:
+            self._cancel(ticket)
+            raise
+        self.stats["wait_s"] += time.monotonic() - started
+
+    def pause(self, seconds):
+        """Hold every request to this service for `seconds` (from Retry-After)"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.stats["throttled"] += 1
+
+
+def _env_limits(service):
+    """RATE_LIMIT_<SERVICE>="rate[:burst]" overrides the built-in limits"""
+    value = os.environ.get(f"RATE_LIMIT_{service.upper()}")
+    if not value:
+        return None
+    rate, _, burst = value.partition(':')
+    return float(rate), int(burst) if burst else max(1, int(float(rate)))
+
+
+def bucket(service):
+    """The shared bucket for a service (unknown services use the "web" limits)"""
+    with _buckets_lock:
+        limiter = _buckets.get(service)
+        if limiter is None:
+            rate, burst = _env_limits(service) or SERVICE_LIMITS.get(service, SERVICE_LIMITS["web"])
+            limiter = _buckets[service] = TokenBucket(rate, burst)
+        return limiter
+
+
+def configure(service, rate=None, burst=None):
+    """Change a service's limits, e.g. to split an API's quota across worker processes"""
+    limiter = bucket(service)
+    with limiter._lock:
+        if rate is not None:
+            limiter.rate = rate
+        if burst is not None:
+            limiter.burst = burst
+            limiter.tokens = min(limiter.tokens, burst)
+
+
+def _should_retry(method, status):
+    return status in ALWAYS_RETRY_STATUSES or (status in RETRY_STATUSES and method.upper() in IDEMPOTENT_METHODS)
+
+
+def _retry_wait(limiter, headers, attempt):
+    """Seconds the caller should sleep before retrying; Retry-After pauses the service instead"""
+    retry_after = retry_after_seconds(headers)
+    if retry_after is not None:
+        limiter.pause(retry_after)
+        return 0.0
+    return backoff_delay(attempt)
+
+
+@lru_cache(maxsize=None)
+def _httpx_transport_classes():
+    import httpx
+
+    class RateLimitedTransport(httpx.BaseTransport):
+        def __init__(self, service, max_retries, **transport_kwargs):
+            self.service = service
+            self.max_retries = max_retries
+            self._inner = httpx.HTTPTransport(**transport_kwargs)
+
+        def handle_request(self, request):
+            limiter = bucket(self.service)
+            for attempt in range(self.max_retries + 1):
+                limiter.acquire()
+                try:
+                    response = self._inner.handle_request(request)
+                except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                    # Timeouts are retried; DNS failures and refusals fail fast
+                    if attempt == self.max_retries or is_unreachable(e):
+                        raise
+                    time.sleep(backoff_delay(attempt))
+                    continue
+                if attempt < self.max_retries and _should_retry(request.method, response.status_code):
+                    response.close()
+                    time.sleep(_retry_wait(limiter, response.headers, attempt))
+                    continue
+                return response
+
+        def close(self):
+            self._inner.close()
+
+    class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+        def __init__(self, service, max_retries, **transport_kwargs):
+            self.service = service
+            self.max_retries = max_retries
+            self._inner = httpx.AsyncHTTPTransport(**transport_kwargs)
+
+        async def handle_async_request(self, request):
+            limiter = bucket(self.service)
+            for attempt in range(self.max_retries + 1):
+                await limiter.acquire_async()
+                try:
+                    response = await self._inner.handle_async_request(request)
+                except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                    # Timeouts are retried; DNS failures and refusals fail fast
+                    if attempt == self.max_retries or is_unreachable(e):
+                        raise
+                    await asyncio.sleep(backoff_delay(attempt))
+                    continue
+                if attempt < self.max_retries and _should_retry(request.method, response.status_code):
+                    await response.aclose()
+                    await asyncio.sleep(_retry_wait(limiter, response.headers, attempt))
+                    continue
+                return response
+
+        async def aclose(self):
+            await self._inner.aclose()
+
+    return RateLimitedTransport, AsyncRateLimitedTransport
+
+
+def sync_transport(service, max_retries=MAX_RETRIES, **transport_kwargs):
+    """httpx transport for httpx.Client(transport=...), e.g. limits=httpx.Limits(...)"""
+    return _httpx_transport_classes()[0](service, max_retries, **transport_kwargs)
+
+
+def async_transport(service, max_retries=MAX_RETRIES, **transport_kwargs):
+    """httpx transport for httpx.AsyncClient(transport=...)"""
+    return _httpx_transport_classes()[1](service, max_retries, **transport_kwargs)
+
+
+@lru_cache(maxsize=None)
+def _requests_adapter_class():
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    class RateLimitedAdapter(HTTPAdapter):
+        def __init__(self, service, max_retries_=MAX_RETRIES, **kwargs):
+            self.service = service
+            self.retries = max_retries_
+            super().__init__(**kwargs)
+
+        def send(self, request, **kwargs):
+            limiter = bucket(self.service)
+            for attempt in range(self.retries + 1):
+                limiter.acquire()
+                try:
+                    response = super().send(request, **kwargs)
+                except requests.ConnectionError as e:
+                    # Timeouts and resets are retried; DNS failures and refusals fail fast
+                    if attempt == self.retries or is_unreachable(e):
+                        raise
+                    time.sleep(backoff_delay(attempt))
+                    continue
+                if attempt < self.retries and _should_retry(request.method, response.status_code):
+                    response.close()
+                    time.sleep(_retry_wait(limiter, response.headers, attempt))
+                    continue
+                return response
+
+    return RateLimitedAdapter
+
+
+_sessions = {}
+
+
+def requests_session(service):
+    """A shared requests.Session whose requests go through the service's bucket"""
+    import requests
+
+    with _buckets_lock:
+        session = _sessions.get(service)
+        if session is None:
+            session = requests.Session()
+            adapter = _requests_adapter_class()(service)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[service] = session
+        return session
+
+
+def stats():
+    """{service: {"granted", "throttled", "wait_s"}} for buckets used so far"""
+    with _buckets_lock:
+        return {service: dict(limiter.stats) for service, limiter in _buckets.items()}
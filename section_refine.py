@@ -0,0 +1,184 @@
+"""
+Section Refine
+Iterates a guide toward its quality gates one section at a time. The guide is split at
+its H1/H2 headings into sections keyed by content hash; each pass lints only sections
+whose hash hasn't been linted yet, rewrites only sections that still fail a gate, and the
+loop stops as soon as every gate passes (or a pass changes nothing). Section reports are
+merged into the same report lint_markdown gives for the whole guide, so a multi-pass
+refinement costs about as much as the sections it edits.
+
+Refiners are keyed by gate metric and take (section markdown, section report, gate value):
+    n_headers_H4_or_deeper  H4+ headings become bold lines
+    bullets_per_list        over-long lists are split into introduced lists within the limit
+    links_are_anchored      bare URLs and anchorless links get host/path anchor text
+"""
+
+import os
+import re
+from urllib.parse import urlsplit
+
+from markdown_ast import children, content_hash, parse_markdown, tokenize
+from quality_linter import lint_markdown, load_quality_gates, merge_reports, parse_gate
+
+MAX_PASSES = 3
+
+
+def split_sections(markdown):
+    """[{"key", "line", "text"}] slices of the markdown, each starting at an H1/H2 heading
+    (the first holds anything before it); joining the texts with newlines restores it"""
+    lines = markdown.split('\n')
+    starts = [0] + [node["line"] - 1 for node in parse_markdown(markdown)["nodes"]
+                    if node["type"] == 'heading' and node["level"] <= 2 and node["line"] > 1]
+    sections = []
+    for start, end in zip(starts, starts[1:] + [len(lines)]):
+        sections.append(_section('\n'.join(lines[start:end]), start))
+    return sections
+
+
+def _section(text, line):
+    return {"key": content_hash(text), "line": line, "text": text}
+
+
+def _anchor(url):
+    parts = urlsplit(url)
+    anchor = parts.netloc + parts.path.rstrip('/')
+    if not parts.netloc:
+        # Relative links: the file name, made readable
+        name = os.path.splitext(os.path.basename(parts.path.rstrip('/')))[0]
+        anchor = name.replace('-', ' ').replace('_', ' ').strip().capitalize()
+    return anchor if anchor and anchor != url else f"Link to {url}"
+
+
+def _anchored(tokens):
+    parts = []
+    for token in tokens:
+        kind = token["type"]
+        if kind == 'url' or (kind == 'link' and token["text"].strip() in ('', token["url"])):
+            parts.append(f"[{_anchor(token['url'])}]({token['url']})")
+        elif (kind == 'bold' or kind == 'italic') and ('](' in token["text"] or 'http' in token["text"]):
+            marker = '**' if kind == 'bold' else '*'
+            parts.append(marker + _anchored(children(token)) + marker)
+        else:
+            parts.append(token["raw"] if "raw" in token else token["text"])
+    return ''.join(parts)
+
+
+def anchor_links(markdown, report, value=True):
+    """Give bare URLs and links without anchor text a readable anchor (code is left alone)"""
+    lines = markdown.split('\n')
+    in_fence = False
+    for i, line in enumerate(lines):
+        if line.strip()[:3] in ('```', '~~~'):
+            in_fence = not in_fence
+        elif not in_fence and ('](' in line or 'http' in line):
+            lines[i] = _anchored(tokenize(line))
+    return '\n'.join(lines)
+
+
+def flatten_deep_headings(markdown, report, value=0):
+    """Turn H4 and deeper headings into bold lines"""
+    lines = markdown.split('\n')
+    for node in parse_markdown(markdown)["nodes"]:
+        if node["type"] == 'heading' and node["level"] >= 4:
+            lines[node["line"] - 1] = f"**{node['text']}**"
+    return '\n'.join(lines)
+
+
+def _list_items(nodes, start, indent):
+    """Lines of the items of the bullet list starting at nodes[start], ending it where the linter does"""
+    items = []
+    for node in nodes[start:]:
+        kind = node["type"]
+        if kind == 'bullet' and node["indent"] == indent:
+            items.append(node["line"])
+        elif not ((kind == 'bullet' or kind == 'numbered') and node["indent"] > indent):
+            break
+    return items
+
+
+def split_long_lists(markdown, report, value=5):
+    """Split each bullet list longer than `value` items into lists of at most `value`, each
+    after its own lead-in line (a blank line alone leaves it one list when rendered)"""
+    lines = markdown.split('\n')
+    nodes = parse_markdown(markdown)["nodes"]
+    starts = {node["line"]: i for i, node in enumerate(nodes) if node["type"] == 'bullet'}
+    breaks = []
+    for violation in report["violations"]:
+        if violation["rule"] != "bullets_per_list" or violation["line"] not in starts:
+            continue
+        start = starts[violation["line"]]
+        items = _list_items(nodes, start, nodes[start]["indent"])
+        for first in range(value, len(items), value):
+            last = min(first + value, len(items))
+            label = f"items {first + 1}–{last}" if last > first + 1 else f"item {last}"
+            breaks.append((items[first] - 1, f"Continued, {label}:"))
+    for i, lead_in in sorted(breaks, reverse=True):
+        lines[i:i] = ['', lead_in, '']
+    return '\n'.join(lines)
+
+
+REFINERS = {
+    'n_headers_H4_or_deeper': flatten_deep_headings,
+    'bullets_per_list': split_long_lists,
+    'links_are_anchored': anchor_links,
+}
+
+
+def refine_sections(markdown, required_sections=(), quality_gates=None, refiners=None, max_passes=MAX_PASSES):
+    """Refine markdown section by section until its quality gates pass.
+
+    Returns (markdown, report, stats); report is what lint_markdown would return for the
+    refined markdown, stats counts passes, sections linted and sections rewritten.
+    """
+    quality_gates = tuple(quality_gates or load_quality_gates())
+    refiners = REFINERS if refiners is None else refiners
+    gates = {gate: parse_gate(gate) for gate in quality_gates}
+    sections = split_sections(markdown)
+    reports = {}  # content hash -> section report
+    stats = {"sections": len(sections), "passes": 0, "linted": 0, "rewritten": 0}
+
+    def lint(text, key):
+        if key not in reports:
+            reports[key] = lint_markdown(text, required_sections, quality_gates)
+            stats["linted"] += 1
+        return reports[key]
+
+    while True:
+        line = 0
+        for section in sections:
+            section["line"] = line
+            line += section["text"].count('\n') + 1
+            lint(section["text"], section["key"])
+        report = merge_reports([(s["line"], reports[s["key"]]) for s in sections], required_sections, quality_gates)
+        if report["passed"] or stats["passes"] >= max_passes:
+            break
+
+        # Only sections that still fail a gate some refiner can fix are rewritten
+        failing = []
+        for i, section in enumerate(sections):
+            metrics = [gates[gate] for gate, passed in reports[section["key"]]["gates"].items()
+                       if passed is False and gates[gate][0] in refiners]
+            if metrics:
+                failing.append((i, metrics))
+        if not failing:
+            break
+
+        stats["passes"] += 1
+        changed = False
+        for i, metrics in failing:
+            section = sections[i]
+            text = section["text"]
+            section_report = reports[section["key"]]
+            for metric, _, value in metrics:
+                refined = refiners[metric](text, section_report, value)
+                if refined != text:
+                    text = refined
+                    section_report = lint(text, content_hash(text))
+            if text != section["text"]:
+                sections[i] = _section(text, section["line"])
+                stats["rewritten"] += 1
+                changed = True
+        if not changed:
+            break
+
+    return '\n'.join(s["text"] for s in sections), report, stats
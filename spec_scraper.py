@@ -0,0 +1,197 @@
+"""
+Spec Scraper
+Fetches the official spec page through an on-disk HTTP cache (TTL plus ETag /
+If-Modified-Since revalidation) and extracts requirements with a single-pass
+Aho-Corasick keyword matcher. Extracted requirements are cached per body hash,
+so an unchanged spec costs neither a download nor a parse.
+"""
+
+import os
+import json
+import time
+import hashlib
+from collections import deque
+
+from rate_limiter import requests_session
+
+SPEC_URL = "https://www.notion.so/Content-Intern-Takehome-Interview-Query-20344d2a2c28803da9dfeddee9bfb30f"
+HTTP_CACHE_DIR = os.path.join(".cache", "http")
+DEFAULT_TTL = 6 * 60 * 60
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+# (keyword, requirement list, value, case_sensitive), in the order they are reported
+SPEC_KEYWORDS = [
+    ('Role Overview & Culture', 'meesho_sections', 'Role Overview & Culture', True),
+    ('Interview Process', 'meesho_sections', 'Interview Process', True),
+    ('SQL Challenges', 'meesho_sections', 'SQL Challenges', True),
+    ('Python for Data Science', 'meesho_sections', 'Python for Data Science', True),
+    ('Machine Learning', 'meesho_sections', 'Machine Learning', True),
+    ('Experiment Design', 'meesho_sections', 'Experiment Design', True),
+    ('Metric Definition', 'meesho_sections', 'Metric Definition', True),
+    ('success story', 'conclusion_links', 'success_story', False),
+    ('question list', 'conclusion_links', 'question_list', False),
+    ('learning path', 'conclusion_links', 'learning_path', False),
+]
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton: finds any number of keywords in one pass over the text.
+
+    Matching runs on lowercased text; case-sensitive keywords are confirmed against
+    the original text at the match position.
+    """
+
+    def __init__(self, keywords, case_sensitive=None):
+        self.keywords = list(keywords)
+        self.case_sensitive = list(case_sensitive or [False] * len(self.keywords))
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for i, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword.lower():
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append(i)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text):
+        """Return the set of keyword indices present in text, stopping once all are found"""
+        found = set()
+        remaining = len(self.keywords)
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for pos, char in enumerate(text.lower()):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for i in output[state]:
+                if i in found:
+                    continue
+                keyword = self.keywords[i]
+                if self.case_sensitive[i] and text[pos - len(keyword) + 1:pos + 1] != keyword:
+                    continue
+                found.add(i)
+                remaining -= 1
+                if not remaining:
+                    return found
+        return found
+
+
+SPEC_MATCHER = KeywordMatcher([k[0] for k in SPEC_KEYWORDS], [k[3] for k in SPEC_KEYWORDS])
+KEYWORDS_FINGERPRINT = hashlib.sha1(json.dumps(SPEC_KEYWORDS).encode('utf-8')).hexdigest()[:12]
+
+
+def _cache_paths(url, cache_dir):
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{key}.json"), os.path.join(cache_dir, f"{key}.body")
+
+
+def _save_meta(meta_path, meta):
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+
+def cached_get(url, headers=None, ttl=DEFAULT_TTL, cache_dir=HTTP_CACHE_DIR, timeout=10):
+    """GET through the on-disk cache, returning (body_text, meta).
+
+    Fresh entries are served without a request; stale ones are revalidated with
+    If-None-Match / If-Modified-Since and reused on 304.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path, body_path = _cache_paths(url, cache_dir)
+    meta = None
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(body_path, encoding='utf-8') as f:
+            body = f.read()
+    except (OSError, ValueError):
+        meta = None
+
+    if meta and time.time() - meta["fetched_at"] < ttl:
+        return body, meta
+
+    request_headers = dict(headers or {})
+    if meta:
+        if meta.get("etag"):
+            request_headers['If-None-Match'] = meta["etag"]
+        if meta.get("last_modified"):
+            request_headers['If-Modified-Since'] = meta["last_modified"]
+
+    response = requests_session("web").get(url, headers=request_headers, timeout=timeout)
+    if response.status_code == 304 and meta:
+        meta["fetched_at"] = time.time()
+        _save_meta(meta_path, meta)
+        return body, meta
+    response.raise_for_status()
+
+    body = response.text
+    meta = {
+        "url": url,
+        "fetched_at": time.time(),
+        "etag": response.headers.get('ETag'),
+        "last_modified": response.headers.get('Last-Modified'),
+        "sha256": hashlib.sha256(body.encode('utf-8')).hexdigest(),
+        "extracted": {},
+    }
+    with open(body_path, 'w', encoding='utf-8') as f:
+        f.write(body)
+    _save_meta(meta_path, meta)
+    return body, meta
+
+
+def html_to_text(html):
+    """Extract visible text, preferring the lxml parser when it is installed"""
+    from bs4 import BeautifulSoup
+
+    try:
+        import lxml  # noqa: F401
+        parser = 'lxml'
+    except ImportError:
+        parser = 'html.parser'
+    return BeautifulSoup(html, parser).get_text()
+
+
+def extract_requirements(text):
+    """Map keywords found in the spec text to the requirements structure"""
+    spec_requirements = {
+        'meesho_sections': [],
+        'meta_requirements': [],
+        'quality_gates': [],
+        'conclusion_links': []
+    }
+    found = SPEC_MATCHER.find(text)
+    for i, (_, group, value, _) in enumerate(SPEC_KEYWORDS):
+        if i in found:
+            spec_requirements[group].append(value)
+    return spec_requirements
+
+
+def load_spec_requirements(url=SPEC_URL, ttl=DEFAULT_TTL, cache_dir=HTTP_CACHE_DIR):
+    """Fetch (or reuse) the spec page and return its extracted requirements"""
+    body, meta = cached_get(url, headers={'User-Agent': USER_AGENT}, ttl=ttl, cache_dir=cache_dir)
+    # Parsed results are keyed on body hash and keyword table, so edits to either re-extract
+    key = f"{meta['sha256']}:{KEYWORDS_FINGERPRINT}"
+    if key in meta.get("extracted", {}):
+        return meta["extracted"][key]
+
+    spec_requirements = extract_requirements(html_to_text(body))
+    meta["extracted"] = {key: spec_requirements}
+    _save_meta(_cache_paths(url, cache_dir)[0], meta)
+    return spec_requirements
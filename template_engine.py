@@ -0,0 +1,160 @@
+"""
+Template Engine
+Compiles markdown templates once into Python render functions that emit parts through a
+write callback, so output is built with a single join (or streamed straight to a file or
+socket) instead of repeated string concatenation.
+
+Syntax:
+    {{ expression }}                      substitute a value
+    {% for target in expression %}...{% endfor %}
+    {% if expression %}...{% elif expression %}...{% else %}...{% endif %}
+
+A block tag alone on its line consumes that whole line, so tags don't leave blank lines.
+Expressions are Python, evaluated against the render context (builtins are available).
+"""
+
+import os
+import re
+import ast
+import builtins
+from functools import lru_cache
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+TOKEN_PATTERN = re.compile(
+    r'^[ \t]*(?P<line_tag>\{%.*?%\})[ \t]*(?:\n|\Z)|(?P<expr>\{\{.*?\}\})|(?P<tag>\{%.*?%\})',
+    re.MULTILINE | re.DOTALL,
+)
+
+
+class TemplateSyntaxError(ValueError):
+    pass
+
+
+def _names(expression, filename):
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as e:
+        raise TemplateSyntaxError(f"{filename}: invalid expression '{expression}': {e}") from e
+    return {n.id for n in ast.walk(tree) if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load)}
+
+
+def _target_names(target, filename):
+    try:
+        tree = ast.parse(f"{target} = None")
+    except SyntaxError as e:
+        raise TemplateSyntaxError(f"{filename}: invalid loop target '{target}'") from e
+    return {n.id for n in ast.walk(tree.body[0].targets[0]) if isinstance(n, ast.Name)}
+
+
+def compile_template(source, filename='<template>'):
+    """Compile template source into a render(ctx, write) function"""
+    body = []
+    depth = 1
+    stack = []
+    free_names = set()
+    bound_names = set()
+    pos = 0
+
+    def emit(line):
+        body.append('    ' * depth + line)
+
+    def text(chunk):
+        if chunk:
+            emit(f"_write({chunk!r})")
+
+    for match in TOKEN_PATTERN.finditer(source):
+        text(source[pos:match.start()])
+        pos = match.end()
+
+        if match.group('expr'):
+            expression = match.group('expr')[2:-2].strip()
+            free_names |= _names(expression, filename)
+            emit(f"_write(_str({expression}))")
+            continue
+
+        tag = (match.group('line_tag') or match.group('tag'))[2:-2].strip()
+        keyword, _, rest = tag.partition(' ')
+        rest = rest.strip()
+        if keyword == 'for':
+            target, sep, expression = rest.partition(' in ')
+            if not sep:
+                raise TemplateSyntaxError(f"{filename}: expected 'for target in expression'")
+            bound_names |= _target_names(target.strip(), filename)
+            free_names |= _names(expression.strip(), filename)
+            emit(f"for {target.strip()} in {expression.strip()}:")
+            stack.append('for')
+            depth += 1
+            emit("pass")
+        elif keyword == 'if':
+            free_names |= _names(rest, filename)
+            emit(f"if {rest}:")
+            stack.append('if')
+            depth += 1
+            emit("pass")
+        elif keyword in ('elif', 'else'):
+            if not stack or stack[-1] != 'if':
+                raise TemplateSyntaxError(f"{filename}: '{keyword}' outside of 'if'")
+            depth -= 1
+            if keyword == 'elif':
+                free_names |= _names(rest, filename)
+                emit(f"elif {rest}:")
+            else:
+                emit("else:")
+            depth += 1
+            emit("pass")
+        elif keyword in ('endfor', 'endif'):
+            if not stack or stack.pop() != keyword[3:]:
+                raise TemplateSyntaxError(f"{filename}: unexpected '{keyword}'")
+            depth -= 1
+        else:
+            raise TemplateSyntaxError(f"{filename}: unknown tag '{keyword}'")
+
+    text(source[pos:])
+    if stack:
+        raise TemplateSyntaxError(f"{filename}: unclosed '{stack[-1]}'")
+
+    prologue = []
+    for name in sorted(free_names - bound_names):
+        if hasattr(builtins, name):
+            prologue.append(f"    {name} = _ctx[{name!r}] if {name!r} in _ctx else _builtins.{name}")
+        else:
+            prologue.append(f"    {name} = _ctx[{name!r}]")
+    code = '\n'.join(["def render(_ctx, _write):"] + prologue + body + ["    pass"])
+
+    namespace = {"_str": str, "_builtins": builtins}
+    exec(compile(code, filename, 'exec'), namespace)
+    return namespace["render"]
+
+
+class Template:
+    """A compiled template; render() joins parts once, render_to() streams them"""
+
+    def __init__(self, source, name='<template>'):
+        self.name = name
+        self._render = compile_template(source, name)
+
+    def render_to(self, stream, **context):
+        """Write the rendered parts to any object with a write() method (file, socket file)"""
+        self._render(context, stream.write)
+
+    def render(self, **context):
+        parts = []
+        self._render(context, parts.append)
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=None)
+def _load(path, mtime_ns):
+    with open(path, encoding='utf-8') as f:
+        return Template(f.read(), os.path.basename(path))
+
+
+def get_template(name, template_dir=TEMPLATE_DIR):
+    """Load and compile a template once; recompiled only if the file changes"""
+    path = os.path.join(template_dir, name)
+    return _load(path, os.stat(path).st_mtime_ns)
+
+
+def render_template(name, **context):
+    return get_template(name).render(**context)
@@ -1,18 +1,13 @@
-# test_key.py  – works with openai ≥ 1.0
-import os
-from openai import OpenAI
-from notion_client import Client
+# test_key.py  – lightweight credential check (see preflight.py)
+from preflight import check_openai, check_notion
 
 # ── 1. Keys ────────────────────────────────────────────────
-
+# Read from OPENAI_API_KEY, NOTION_TOKEN and NOTION_PARENT
 
 # ── 2. Verify OpenAI key ───────────────────────────────────
-client = OpenAI()                       # uses env var
-models = [m.id for m in client.models.list().data]
-print("✅ OpenAI key OK — first 3 models:", models[:3])
+result = check_openai()
+print("✅ OpenAI key OK —" if result["ok"] else "❌ OpenAI key check failed —", result["detail"])
 
 # ── 3. Verify Notion access ─────────────────────────────────
-notion = Client(auth=NOTION_TOKEN)
-page   = notion.pages.retrieve(page_id=NOTION_PARENT)
-title  = page["properties"]["title"]["title"][0]["plain_text"]
-print("✅ Notion token OK — page title:", title)
+result = check_notion()
+print("✅ Notion token OK —" if result["ok"] else "❌ Notion token check failed —", result["detail"])
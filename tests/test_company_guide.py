@@ -0,0 +1,42 @@
+"""Guides state only the company facts they were given"""
+
+import takehome_implementation as ti
+
+SELECTIONS = {'SQL Challenges': ['Write a query to rank sellers by revenue']}
+
+
+def build(company, profile=None):
+    return ti.build_meesho_guide(None, {}, company=company, selections=SELECTIONS, profile=profile)
+
+
+def test_known_company_uses_its_profile():
+    guide = build("Meesho")
+    assert "India's tier 2+ cities" in guide
+    assert "[Meesho Engineering Blog](https://medium.com/meesho-tech)" in guide
+
+
+def test_unknown_company_omits_missing_facts():
+    guide = build("Flipkart")
+    assert "meesho" not in guide.lower() and "tier 2+" not in guide
+    assert "Engineering Blog" not in guide and "e-commerce metrics" not in guide
+    assert "Flipkart depends on data-driven decision-making" in guide
+
+
+def test_profile_overrides_and_adds_facts():
+    guide = build("Swiggy", {"industry": "food delivery", "blog_url": "https://bytes.swiggy.com"})
+    assert "- Understand food delivery metrics" in guide
+    assert "- [Swiggy Engineering Blog](https://bytes.swiggy.com)" in guide
+
+
+def conclusion(company, profile=None):
+    guide, _ = ti.grade_and_refine_content("# Guide\n", None, {'meesho_sections': []}, verbose=False,
+                                           company=company, profile=profile)
+    return guide
+
+
+def test_conclusion_states_only_known_business_facts():
+    assert "Meesho's user segments, supply chain model, and mobile-first approach" in conclusion("Meesho")
+    flipkart = conclusion("Flipkart")
+    assert "supply chain" not in flipkart and "mobile-first" not in flipkart
+    assert "Flipkart's user segments and business model." in flipkart
+    assert "Swiggy's user segments, delivery network" in conclusion("Swiggy", {"business_model": "delivery network"})
@@ -0,0 +1,142 @@
+"""guide_server routes requests, rejects bad ones with 4xx, sheds load and cleans up build directories"""
+
+import os
+import json
+import time
+import threading
+import http.client
+
+import pytest
+
+import guide_server
+import takehome_implementation as ti
+
+SECTIONS = ['SQL Challenges']
+
+
+class TinyState(guide_server.WarmState):
+    """Warm state without the bank or chart backend; /reload blocks while `gate` is cleared"""
+
+    def __init__(self, output_dir, max_builds=guide_server.MAX_BUILDS):
+        self.gate = threading.Event()
+        self.gate.set()
+        super().__init__(output_dir, max_builds)
+
+    def reload(self):
+        self.gate.wait(5)
+        self.df_q, self.df_ops = None, None
+        self.spec_requirements = {'meesho_sections': SECTIONS}
+        self.loaded_at, self.load_seconds = 0, 0
+
+    def selections(self, sections):
+        return {section: ["Write a query to rank sellers by revenue"] for section in sections}
+
+
+@pytest.fixture
+def serve(tmp_path):
+    servers = []
+
+    def start(**kwargs):
+        state = TinyState(str(tmp_path / "builds"))
+        server = guide_server.make_server(port=0, state=state, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return state, server.server_address[1]
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+        server.RequestHandlerClass.pool.shutdown()
+
+
+def request(port, method, path, body=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        data = body if isinstance(body, bytes) or body is None else json.dumps(body)
+        connection.request(method, path, data, {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_routes_and_unknown_paths(serve):
+    _, port = serve()
+    status, _, body = request(port, "GET", "/health")
+    assert status == 200 and body["pending"] == 0
+    assert request(port, "GET", "/nope")[0] == 404
+    assert request(port, "POST", "/nope", {})[0] == 404
+    status, _, body = request(port, "POST", "/lint", {"markdown": "# Guide\n"})
+    assert status == 200 and "violations" in body
+
+
+def test_bad_requests_answer_400(serve):
+    _, port = serve()
+    assert request(port, "POST", "/lint", b"{not json")[0] == 400
+    for body in ([], "x", 1):
+        status, _, answer = request(port, "POST", "/build", body)
+        assert status == 400 and answer["error"] == "request body must be a JSON object"
+    status, _, answer = request(port, "POST", "/lint", {})
+    assert status == 400 and answer["error"].startswith("missing field")
+    status, _, answer = request(port, "POST", "/build", {"spec_requirements": "x"})
+    assert status == 400 and answer["error"] == "spec_requirements must be an object"
+    status, _, answer = request(port, "POST", "/publish", {"build_id": "nope"})
+    assert status == 400 and answer["error"] == "unknown build_id nope"
+
+
+def test_oversized_body_answers_413(serve, monkeypatch):
+    monkeypatch.setattr(guide_server, "MAX_BODY_BYTES", 16)
+    _, port = serve()
+    status, _, answer = request(port, "POST", "/lint", {"markdown": "x" * 32})
+    assert status == 413 and answer["error"] == "request body too large"
+
+
+def test_full_queue_answers_503_with_retry_after(serve):
+    state, port = serve(workers=1, max_queue=0)
+    state.gate.clear()
+    blocked = threading.Thread(target=request, args=(port, "POST", "/reload", {}))
+    blocked.start()
+    try:
+        for _ in range(100):
+            if request(port, "GET", "/health")[2]["pending"]:
+                break
+            time.sleep(0.01)
+        status, headers, _ = request(port, "POST", "/lint", {"markdown": "# Guide\n"})
+        assert status == 503 and headers["Retry-After"] == "1"
+    finally:
+        state.gate.set()
+        blocked.join()
+
+
+def test_builds_can_be_published_by_id(serve, monkeypatch):
+    state, port = serve()
+    status, _, built = request(port, "POST", "/build", {"company": "Flipkart", "viz": False})
+    assert status == 200 and "viz" not in built
+    assert state.get_build(built["build_id"])["company"] == "Flipkart"
+    monkeypatch.setattr(ti, "publish_pages", lambda pages, base_dir: {title: base_dir for title in pages})
+    status, _, published = request(port, "POST", "/publish", {"build_id": built["build_id"]})
+    build_dir = os.path.join(state.output_dir, built["build_id"])
+    assert status == 200 and published["urls"] == {"Flipkart Data Scientist Guide": build_dir}
+
+
+def test_failed_build_removes_its_directory(serve, monkeypatch):
+    state, port = serve()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("grading failed")
+    monkeypatch.setattr(ti, "grade_and_refine_content", fail)
+    status, _, answer = request(port, "POST", "/build", {"viz": False})
+    assert status == 500 and answer["error"] == "grading failed"
+    assert os.listdir(state.output_dir) == []
+
+
+def test_remember_evicts_and_deletes_the_oldest_builds(tmp_path):
+    state = TinyState(str(tmp_path), max_builds=2)
+    builds = [state.new_build_dir() for _ in range(3)]
+    for build_id, build_dir in builds:
+        state.remember(build_id, {"company": "Meesho", "pages": {}, "dir": build_dir})
+    (oldest_id, oldest_dir), *kept = builds
+    assert state.get_build(oldest_id) is None and not os.path.exists(oldest_dir)
+    for build_id, build_dir in kept:
+        assert state.get_build(build_id)["dir"] == build_dir and os.path.isdir(build_dir)
@@ -0,0 +1,86 @@
+"""Generation against openai_stub: disk cache, coalescing, token budget and static fallback"""
+
+import threading
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("openai")
+
+import openai_stub  # noqa: E402
+import takehome_implementation as ti  # noqa: E402
+from llm_generation import (  # noqa: E402
+    DEFAULT_PARAMS,
+    SYSTEM_PROMPT,
+    estimate_tokens,
+    generate_sections,
+    section_intro_prompts,
+)
+
+
+def serve(**kwargs):
+    server = openai_stub.make_server(port=0, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+@pytest.fixture
+def stub():
+    server, base_url = serve(latency=0.05)
+    yield server, base_url
+    server.shutdown()
+    server.server_close()
+
+
+def requests_served(server):
+    return server.RequestHandlerClass.counter["requests"]
+
+
+def test_disk_cache_serves_reruns(stub, tmp_path):
+    server, base_url = stub
+    prompts = section_intro_prompts(['SQL Challenges', 'Machine Learning'])
+    first, stats = generate_sections(prompts, base_url=base_url, cache_dir=str(tmp_path))
+    assert all(first.values()) and stats["requests"] == 2
+
+    second, stats = generate_sections(prompts, base_url=base_url, cache_dir=str(tmp_path))
+    assert second == first and stats["cache_hits"] == 2 and stats["requests"] == 0
+    assert requests_served(server) == 2
+
+
+def test_identical_prompts_in_flight_share_one_request(stub, tmp_path):
+    server, base_url = stub
+    prompt = section_intro_prompts(['SQL Challenges'])['SQL Challenges']
+    texts, stats = generate_sections({"a": prompt, "b": prompt, "c": prompt},
+                                     base_url=base_url, cache_dir=str(tmp_path))
+    assert texts["a"] and texts["a"] == texts["b"] == texts["c"]
+    assert stats["requests"] == 1 and stats["coalesced"] == 2
+    assert requests_served(server) == 1
+
+
+def test_token_budget_cuts_off_requests(stub, tmp_path):
+    server, base_url = stub
+    prompts = section_intro_prompts(['SQL Challenges', 'Machine Learning', 'Experiment Design'])
+    # Every prompt reserves its estimate before any completes: room for one, not two
+    reserve = max(estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(p) + DEFAULT_PARAMS["max_tokens"]
+                  for p in prompts.values())
+    texts, stats = generate_sections(prompts, base_url=base_url, cache_dir=str(tmp_path),
+                                     token_budget=reserve + reserve // 2)
+    assert sum(text is not None for text in texts.values()) == 1
+    assert stats["over_budget"] == 2 and requests_served(server) == 1
+
+
+def test_failed_generation_keeps_static_text(tmp_path, monkeypatch):
+    server, base_url = serve(fail_status=400)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OPENAI_BASE_URL", base_url)
+    sections = ['SQL Challenges', 'Machine Learning']
+    spec_requirements = {'meesho_sections': sections}
+    selections = {section: [f"A {section} question"] for section in sections}
+
+    static = ti.build_meesho_guide(None, spec_requirements, selections=selections)
+    try:
+        generated = ti.build_meesho_guide(None, spec_requirements, selections=selections, generate=True)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert generated == static and requests_served(server) == len(sections)
@@ -0,0 +1,90 @@
+"""Async publishing: pages go out in 100-block batches that land in document order"""
+
+import random
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import notion_stub
+from notion_blocks import MAX_BLOCKS_PER_REQUEST, chunk_blocks, markdown_to_blocks, publish_page_async
+
+
+def paragraphs(title, n):
+    return '\n\n'.join(f"{title} paragraph {i}" for i in range(n))
+
+
+def block_texts(blocks):
+    return [''.join(item["text"]["content"] for item in block[block["type"]]["rich_text"]) for block in blocks]
+
+
+class FakeNotion:
+    """Records each page's blocks in the order requests complete, with random latency"""
+
+    def __init__(self):
+        self.children_of = {}
+        self.batch_sizes = []
+        self.pages = SimpleNamespace(create=self.create_page)
+        self.blocks = SimpleNamespace(children=SimpleNamespace(append=self.append))
+
+    async def create_page(self, parent, properties, children):
+        await asyncio.sleep(random.uniform(0, 0.01))
+        page_id = properties["title"]["title"][0]["text"]["content"]
+        self.children_of[page_id] = list(children)
+        self.batch_sizes.append(len(children))
+        return {"id": page_id, "url": f"https://notion.test/{page_id}"}
+
+    async def append(self, block_id, children):
+        await asyncio.sleep(random.uniform(0, 0.01))
+        self.children_of[block_id].extend(children)
+        self.batch_sizes.append(len(children))
+        return {"results": children}
+
+
+def test_chunk_blocks_respects_the_request_limit():
+    blocks = markdown_to_blocks(paragraphs("Guide", 250))
+    assert [len(batch) for batch in chunk_blocks(blocks)] == [100, 100, 50]
+
+
+def test_concurrent_pages_keep_their_batch_order():
+    notion = FakeNotion()
+    pages = {f"Page {i}": paragraphs(f"Page {i}", 120 * i + 5) for i in range(1, 4)}
+
+    async def publish_all():
+        return await asyncio.gather(*(publish_page_async(notion, "parent", title, markdown)
+                                      for title, markdown in pages.items()))
+
+    urls = asyncio.run(publish_all())
+    assert urls == [f"https://notion.test/{title}" for title in pages]
+    assert max(notion.batch_sizes) <= MAX_BLOCKS_PER_REQUEST
+    for title, markdown in pages.items():
+        assert block_texts(notion.children_of[title]) == block_texts(markdown_to_blocks(markdown))
+
+
+@pytest.fixture
+def stub():
+    server = notion_stub.make_server(port=0, jitter=0.01)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_publish_pages_against_the_stub(stub):
+    pytest.importorskip("httpx")
+    pytest.importorskip("notion_client")
+    from notion_blocks import publish_pages
+
+    server, base_url = stub
+    pages = {f"Page {i}": paragraphs(f"Page {i}", 100 * i + 30) for i in range(1, 4)}
+    urls = publish_pages(pages, parent_id="parent", token="stub", base_url=base_url, concurrency=3)
+
+    store = server.RequestHandlerClass.store
+    assert store.rejected == 0
+    for title, markdown in pages.items():
+        page_id = next(p["id"] for p in store.pages.values()
+                       if p["properties"]["title"]["title"][0]["text"]["content"] == title)
+        assert urls[title] == store.pages[page_id]["url"]
+        published = [store.blocks[i][1] for i in store.children[page_id]]
+        assert block_texts(published) == block_texts(markdown_to_blocks(markdown))
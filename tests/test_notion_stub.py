@@ -0,0 +1,88 @@
+"""notion_stub answers like the real API under load, and publishing recovers from its 429s"""
+
+import json
+import threading
+import http.client
+
+import pytest
+
+import notion_stub
+import rate_limiter
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(**kwargs):
+        server = notion_stub.make_server(port=0, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, server.server_address[1]
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def post(port, path, body):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        connection.request("POST", path, json.dumps(body), {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def paragraph(text):
+    return {"object": "block", "type": "paragraph",
+            "paragraph": {"rich_text": [{"type": "text", "text": {"content": text}}]}}
+
+
+def page_body(children=()):
+    return {"parent": {"page_id": "parent"}, "children": list(children),
+            "properties": {"title": {"title": [{"text": {"content": "Guide"}}]}}}
+
+
+def test_rate_limit_answers_429_with_retry_after(serve):
+    server, port = serve(rate_limit=1)
+    assert post(port, "/v1/pages", page_body())[0] == 200
+    status, headers, body = post(port, "/v1/pages", page_body())
+    assert status == 429 and body["code"] == "rate_limited"
+    assert int(headers["Retry-After"]) >= 1
+    assert server.RequestHandlerClass.store.throttled == 1
+
+
+def test_random_throttle_answers_429(serve):
+    _, port = serve(throttle=1.0)
+    status, headers, _ = post(port, "/v1/pages", page_body())
+    assert status == 429 and headers["Retry-After"] == "1"
+
+
+def test_request_limits_answer_400(serve):
+    server, port = serve()
+    status, _, body = post(port, "/v1/pages", page_body(paragraph("x") for _ in range(101)))
+    assert status == 400 and body["code"] == "validation_error"
+    status, _, _ = post(port, "/v1/pages", page_body([paragraph("x" * 2001)]))
+    assert status == 400 and server.RequestHandlerClass.store.rejected == 2
+
+
+def test_publishing_waits_out_retry_after(serve, monkeypatch):
+    pytest.importorskip("httpx")
+    pytest.importorskip("notion_client")
+    from notion_blocks import markdown_to_blocks, publish_pages
+
+    server, port = serve(rate_limit=2)
+    # A client bucket far above the server's limit, so only Retry-After keeps it in check
+    monkeypatch.setitem(rate_limiter._buckets, "notion", rate_limiter.TokenBucket(100, 100))
+    markdown = '\n\n'.join(f"Paragraph {i}" for i in range(450))
+    urls = publish_pages({"Guide": markdown}, parent_id="parent", token="stub",
+                         base_url=f"http://127.0.0.1:{port}")
+
+    store = server.RequestHandlerClass.store
+    assert store.throttled > 0 and rate_limiter.bucket("notion").stats["throttled"] > 0
+    (page_id, page), = store.pages.items()
+    assert urls["Guide"] == page["url"]
+    assert len(store.children[page_id]) == len(markdown_to_blocks(markdown))
@@ -0,0 +1,94 @@
+"""A publish that fails part-way must resume on the same page, not start a duplicate"""
+
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from notion_blocks import MAX_BLOCKS_PER_REQUEST
+from notion_sync import upsert_page_async
+
+
+class FakeNotion:
+    """In-memory pages and blocks endpoints; append call number `fail_on` raises"""
+
+    def __init__(self, fail_on=None):
+        self.ids = itertools.count()
+        self.children_of = {}  # page id -> [block id]
+        self.archived = set()
+        self.appends = 0
+        self.fail_on = fail_on
+        self.pages = SimpleNamespace(create=self.create_page, update=self.update_page)
+        self.blocks = SimpleNamespace(delete=self.delete_block, update=self.update_block,
+                                      children=SimpleNamespace(append=self.append))
+
+    async def create_page(self, parent, properties):
+        page_id = f"page-{next(self.ids)}"
+        self.children_of[page_id] = []
+        return {"id": page_id, "url": f"https://notion.test/{page_id}"}
+
+    async def update_page(self, page_id, archived=False, **body):
+        if archived:
+            self.archived.add(page_id)
+
+    async def delete_block(self, block_id):
+        for blocks in self.children_of.values():
+            if block_id in blocks:
+                blocks.remove(block_id)
+
+    async def update_block(self, block_id, **body):
+        pass
+
+    async def append(self, block_id, children, after=None):
+        self.appends += 1
+        if self.appends == self.fail_on:
+            raise RuntimeError("connection reset")
+        blocks = self.children_of[block_id]
+        at = blocks.index(after) + 1 if after else len(blocks)
+        blocks[at:at] = [f"block-{next(self.ids)}" for _ in children]
+        # Like the API: from the insertion point with "after", else the page's children
+        return {"results": [{"id": i} for i in (blocks[at:] if after else blocks)]}
+
+
+def markdown(n):
+    return '\n\n'.join(f"Paragraph {i}" for i in range(n))
+
+
+def upsert(notion, manifest, n):
+    return asyncio.run(upsert_page_async(notion, manifest, "parent", "Guide", markdown(n)))
+
+
+def test_failed_insert_resumes_on_the_same_page():
+    n = MAX_BLOCKS_PER_REQUEST * 2 + 10
+    notion = FakeNotion(fail_on=2)
+    manifest = {}
+    with pytest.raises(RuntimeError):
+        upsert(notion, manifest, n)
+    entry = manifest["parent"]["Guide"]
+    assert len(entry["blocks"]) == MAX_BLOCKS_PER_REQUEST
+    assert [b["id"] for b in entry["blocks"]] == notion.children_of[entry["page_id"]]
+
+    url, stats = upsert(notion, manifest, n)
+    assert url == entry["url"] and len(notion.children_of) == 1
+    assert stats["inserted"] == n - MAX_BLOCKS_PER_REQUEST and stats["unchanged"] == MAX_BLOCKS_PER_REQUEST
+    blocks = manifest["parent"]["Guide"]["blocks"]
+    assert [b["id"] for b in blocks] == notion.children_of[entry["page_id"]] and len(blocks) == n
+
+    _, stats = upsert(notion, manifest, n)
+    assert stats["calls"] == 0 and stats["unchanged"] == n
+
+
+def test_failed_in_place_update_archives_the_old_page():
+    notion = FakeNotion()
+    manifest = {}
+    upsert(notion, manifest, 3)
+    old_page = manifest["parent"]["Guide"]["page_id"]
+    notion.children_of[old_page].clear()  # blocks deleted outside this tool
+
+    async def gone(block_id):
+        raise RuntimeError("block not found")
+    notion.blocks.delete = gone
+    upsert(notion, manifest, 2)
+    assert notion.archived == {old_page}
+    assert manifest["parent"]["Guide"]["page_id"] != old_page
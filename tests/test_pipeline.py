@@ -0,0 +1,47 @@
+"""Memoized steps must be keyed on every module they depend on"""
+
+import os
+import importlib
+import importlib.util
+
+import pipeline
+import takehome_implementation as ti
+
+
+def module_names(functions):
+    _, paths = pipeline.dependencies(functions)
+    return {os.path.splitext(os.path.basename(path))[0] for path in paths}
+
+
+def test_guide_build_depends_on_the_modules_it_reaches():
+    names = module_names([ti.build_meesho_guide, ti.grade_and_refine_content])
+    # Imported directly, lazily inside the function, and only through other modules
+    assert {'question_selection', 'question_stream', 'llm_generation', 'section_refine',
+            'template_engine', 'question_dedup', 'quality_linter', 'markdown_ast'} <= names
+    assert 'takehome_implementation' not in names and 'notion_sync' not in names
+
+
+def test_same_module_helpers_are_hashed_as_functions():
+    functions, paths = pipeline.dependencies([ti.build_meta_viz_question])
+    assert ti.create_funnel_chart in functions
+    assert 'chart_service.py' in {os.path.basename(path) for path in paths}
+
+
+def test_tracing_leaves_code_hashes_unchanged(monkeypatch):
+    import tracing
+
+    steps = pipeline.default_registry()
+    plain = {name: pipeline.code_hash(step["code"]) for name, step in steps.items()}
+    # enable() patches module functions and HTTP clients in place; monkeypatch restores them
+    for name in tracing.PIPELINE_STAGES:
+        if hasattr(ti, name):
+            monkeypatch.setattr(ti, name, getattr(ti, name))
+    for module, cls in (("requests", "Session"), ("httpx", "Client"), ("httpx", "AsyncClient")):
+        if importlib.util.find_spec(module):
+            client = getattr(importlib.import_module(module), cls)
+            monkeypatch.setattr(client, "send", client.send)
+    tracing.enable(ti, trace_memory=False)
+
+    traced = pipeline.default_registry()
+    assert traced["Build Meesho Guide"]["code"][0] is not steps["Build Meesho Guide"]["code"][0]
+    assert {name: pipeline.code_hash(step["code"]) for name, step in traced.items()} == plain
@@ -0,0 +1,67 @@
+"""Streaming and in-memory question selection must build the same guide"""
+
+import functools
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+import question_stream  # noqa: E402
+import takehome_implementation as ti  # noqa: E402
+
+SECTIONS = ['SQL Challenges', 'Python for Data Science', 'Machine Learning', 'Experiment Design']
+
+# Categories interleave, so 3-row chunks split every category and file order differs
+# from the table's stored (category-grouped) order
+ROWS = [
+    ("SQL", "Write a SQL query to find the top 5 products by return rate"),
+    ("Python", "Implement a pandas function to detect outliers in a dataframe"),
+    ("Machine Learning", "How would you build a recommendation model for new users?"),
+    ("SQL", "Write a SQL query using a window function to rank sellers by revenue"),
+    ("Statistics", "Design an A/B test experiment for a new checkout button"),
+    ("Python", "Implement a pandas function to detect outliers in a dataframe quickly"),
+    (None, "Write a SQL query to find the top 5 products by return rate last month"),
+    ("Machine Learning", "Explain overfitting and how regularization helps a regression model"),
+    ("SQL", "Write a SQL query to find the top 5 products by return rate"),
+    ("Statistics", "Design an A/B test experiment for a new checkout button on mobile"),
+    ("Python", "Write Python code to merge two dataframes and aggregate orders"),
+    ("SQL", "Join the orders and sellers tables and aggregate by week"),
+]
+
+
+@pytest.fixture
+def bank(tmp_path):
+    df = pd.DataFrame(ROWS, columns=["Category", "Question"])
+    path = tmp_path / "bank.csv"
+    df.to_csv(path, index=False)
+    return df, str(path)
+
+
+@pytest.mark.parametrize("chunksize", [1, 3, 5, 100])
+def test_build_meesho_guide_streaming_matches_in_memory(bank, monkeypatch, chunksize):
+    df, path = bank
+    spec = {"meesho_sections": SECTIONS}
+    monkeypatch.setattr(ti, "stream_select_questions",
+                        functools.partial(question_stream.stream_select_questions, chunksize=chunksize))
+
+    assert ti.build_meesho_guide(path, spec) == ti.build_meesho_guide(df, spec)
+
+
+def test_streaming_keeps_one_question_per_cluster(bank):
+    from question_dedup import lsh_clusters, minhash_signatures
+
+    _, path = bank
+    selections = question_stream.stream_select_questions(path, SECTIONS, k=5, chunksize=3, dedupe=True)
+    # A question may suit several sections; within a section each cluster appears once
+    for questions in selections.values():
+        labels = lsh_clusters(minhash_signatures(questions))
+        assert len(set(labels.tolist())) == len(questions)
+    sql = selections['SQL Challenges']
+    assert sum(q.startswith("Write a SQL query to find the top 5 products") for q in sql) == 1
+
+
+def test_check_parity_uses_production_dedupe(bank, tmp_path):
+    _, path = bank
+    assert question_stream.check_parity(path, SECTIONS, k=5, chunksize=3, cache_dir=str(tmp_path / "cache")) == []
@@ -0,0 +1,103 @@
+"""Token buckets serve waiters by lane without polling, and unreachable hosts fail fast"""
+
+import time
+import socket
+import asyncio
+import threading
+
+import pytest
+
+import rate_limiter
+from rate_limiter import TokenBucket, is_unreachable
+
+
+def test_lanes_are_served_in_priority_order_without_polling():
+    limiter = TokenBucket(rate=10, burst=1)
+    limiter.acquire()
+    order = []
+
+    def request(lane, i):
+        limiter.acquire(lane)
+        order.append((lane, i))
+
+    batch = [threading.Thread(target=request, args=("batch", i)) for i in range(6)]
+    for thread in batch:
+        thread.start()
+    time.sleep(0.01)
+    interactive = [threading.Thread(target=request, args=("interactive", i)) for i in range(3)]
+    cpu = time.process_time()
+    for thread in interactive:
+        thread.start()
+    # The next token is due after 0.1s; by then every request is queued
+    for thread in batch + interactive:
+        thread.join()
+
+    assert [lane for lane, _ in order[:3]] == ["interactive"] * 3
+    assert [i for lane, i in order if lane == "batch"] == list(range(6))
+    # Waiters behind the head sleep on an event instead of waking every millisecond
+    assert time.process_time() - cpu < 0.1
+
+
+def test_cancelled_head_hands_over_its_turn():
+    limiter = TokenBucket(rate=20, burst=1)
+    limiter.acquire()
+
+    async def main():
+        first = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0.005)
+        second = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0.005)
+        first.cancel()
+        await asyncio.wait_for(second, timeout=1)
+
+    asyncio.run(main())
+    assert limiter.stats["granted"] == 2 and not limiter._waiters
+
+
+def refused_port():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+    listener.close()
+    return port
+
+
+def test_dns_failures_and_refusals_are_unreachable():
+    try:
+        socket.create_connection(("127.0.0.1", refused_port()), timeout=1)
+    except OSError as e:
+        refused = e
+    assert is_unreachable(refused)
+    try:
+        raise OSError("Failed to establish a new connection") from socket.gaierror(-2, "Name not known")
+    except OSError as e:
+        assert is_unreachable(RuntimeError(e))
+    assert not is_unreachable(TimeoutError("timed out"))
+    assert not is_unreachable(ConnectionResetError())
+
+
+def test_transports_do_not_retry_refused_connections():
+    httpx = pytest.importorskip("httpx")
+    url = f"http://127.0.0.1:{refused_port()}/"
+    limiter = rate_limiter.bucket("test-refused")
+
+    with httpx.Client(transport=rate_limiter.sync_transport("test-refused")) as client:
+        with pytest.raises(httpx.ConnectError):
+            client.get(url)
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=rate_limiter.async_transport("test-refused")) as client:
+            await client.get(url)
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(fetch())
+    # One attempt each: a retry would have taken a second token after a backoff sleep
+    assert limiter.stats["granted"] == 2
+
+
+def test_requests_adapter_does_not_retry_refused_connections():
+    requests = pytest.importorskip("requests")
+    session = rate_limiter.requests_session("test-refused-requests")
+    with pytest.raises(requests.ConnectionError):
+        session.get(f"http://127.0.0.1:{refused_port()}/", timeout=5)
+    assert rate_limiter.bucket("test-refused-requests").stats["granted"] == 1
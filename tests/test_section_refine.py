@@ -0,0 +1,49 @@
+"""List splitting must satisfy the bullets_per_list gate as the pages render, not just as text"""
+
+from markdown_ast import parse_markdown
+from quality_linter import lint_markdown
+from section_refine import refine_sections
+
+GATES = ["bullets_per_list <= 5"]
+
+
+def bullets(n, sep='\n'):
+    return sep.join(f"- item {i}" for i in range(1, n + 1))
+
+
+def test_blank_lines_do_not_end_a_list():
+    report = lint_markdown(bullets(8, sep='\n\n'), quality_gates=GATES)
+    assert report["metrics"]["bullets_per_list"] == 8
+    assert [v["rule"] for v in report["violations"]] == ["bullets_per_list"]
+
+
+def test_continuation_lines_do_not_end_a_list():
+    markdown = "- item 1\n   more about item 1\n" + bullets(6)
+    assert lint_markdown(markdown, quality_gates=GATES)["metrics"]["bullets_per_list"] == 7
+
+
+def test_other_blocks_end_a_list():
+    markdown = bullets(4) + "\n\nA paragraph\n\n" + bullets(4) + "\n1. numbered\n" + bullets(4)
+    report = lint_markdown(markdown, quality_gates=GATES)
+    assert report["metrics"]["bullets_per_list"] == 4
+    assert report["passed"]
+
+
+def test_long_lists_are_split_into_introduced_lists():
+    markdown = "# Guide\n\nIntro\n\n" + bullets(12) + "\n  - nested\n\n## Next\n\ntext\n"
+    refined, report, stats = refine_sections(markdown, quality_gates=GATES)
+    assert report["passed"] and stats["rewritten"] == 1
+    assert report == lint_markdown(refined, quality_gates=GATES)
+
+    # Each chunk follows its own lead-in paragraph and keeps its items in order
+    nodes = parse_markdown(refined)["nodes"]
+    runs, run = [], []
+    for node in nodes[:next(i for i, n in enumerate(nodes) if n["type"] == 'heading' and n["line"] > 1)]:
+        if node["type"] == 'bullet' and node["indent"] == 0:
+            run.append(node["text"])
+        elif node["type"] == 'paragraph' and run:
+            assert node["text"].startswith("Continued, item")
+            runs.append(run)
+            run = []
+    runs.append(run)
+    assert runs == [[f"item {i}" for i in range(a, b)] for a, b in ((1, 6), (6, 11), (11, 13))]
@@ -0,0 +1,51 @@
+"""URL self-test: markers are found in streamed pages, and unreachable hosts fail at once"""
+
+import time
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from url_verifier import verify_urls  # noqa: E402
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status, body = (200, b"<p>Published by Interview Query</p>") if self.path == "/ok" else (404, b"missing")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pages_are_checked_for_markers(site):
+    results = verify_urls({"ok": f"{site}/ok", "gone": f"{site}/gone"})
+    assert results["ok"]["status"] == "PASS" and results["ok"]["missing"] == []
+    assert results["gone"]["status"] == "FAIL" and results["gone"]["http_status"] == 404
+
+
+def test_unreachable_url_fails_without_retrying():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+    listener.close()
+
+    started = time.perf_counter()
+    result = verify_urls({"down": f"http://127.0.0.1:{port}/"})["down"]
+    assert result["status"] == "FAIL" and result["error"]
+    assert time.perf_counter() - started < 1.0
@@ -0,0 +1,226 @@
+"""
+Pipeline Tracing
+Wall/CPU timing spans with tracemalloc peak memory for each pipeline stage, plus per-call
+latency spans for outbound HTTP (requests and httpx, which covers Notion and OpenAI).
+Spans export as JSON or Chrome trace-event format (open in chrome://tracing or Perfetto).
+"""
+
+import os
+import json
+import time
+import threading
+import functools
+import tracemalloc
+from contextlib import contextmanager
+
+PIPELINE_STAGES = [
+    'load_data',
+    'scrape_spec_requirements',
+    'build_meesho_guide',
+    'create_funnel_chart',
+    'grade_and_refine_content',
+    'publish_to_notion',
+    'publish_pages',
+    'self_test_urls',
+]
+
+
+class Tracer:
+    """Collects finished spans; memory peaks are folded into enclosing stage spans"""
+
+    def __init__(self, trace_memory=True):
+        self.spans = []
+        self.trace_memory = trace_memory
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._memory_stack = []
+
+    @contextmanager
+    def span(self, name, category='stage', memory=True, **args):
+        memory = memory and self.trace_memory and tracemalloc.is_tracing()
+        entry = {"name": name, "cat": category, "args": args,
+                 "pid": os.getpid(), "tid": threading.get_ident()}
+        if memory:
+            with self._lock:
+                current, peak = tracemalloc.get_traced_memory()
+                for parent in self._memory_stack:
+                    parent["_peak"] = max(parent["_peak"], peak)
+                tracemalloc.reset_peak()
+                entry["_start_mem"] = entry["_peak"] = current
+                self._memory_stack.append(entry)
+
+        start = time.perf_counter_ns()
+        cpu_start = time.process_time()
+        try:
+            yield entry
+        except Exception as e:
+            entry["args"]["error"] = str(e)
+            raise
+        finally:
+            entry["ts_us"] = (start - self._origin) / 1000
+            entry["wall_s"] = (time.perf_counter_ns() - start) / 1e9
+            entry["cpu_s"] = time.process_time() - cpu_start
+            if memory:
+                with self._lock:
+                    _, peak = tracemalloc.get_traced_memory()
+                    entry["_peak"] = max(entry["_peak"], peak)
+                    if entry in self._memory_stack:
+                        self._memory_stack.remove(entry)
+                    for parent in self._memory_stack:
+                        parent["_peak"] = max(parent["_peak"], entry["_peak"])
+                    entry["peak_mem_bytes"] = entry.pop("_peak") - entry.pop("_start_mem")
+            with self._lock:
+                self.spans.append(entry)
+
+    def wrap(self, fn, name=None, category='stage', memory=True):
+        """Decorate a function so every call is recorded as a span"""
+        name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.span(name, category, memory):
+                return fn(*args, **kwargs)
+        wrapper.__wrapped_by_tracer__ = True
+        return wrapper
+
+    def summary(self):
+        """Aggregate spans by name: calls, total wall/CPU, max peak memory, latency percentiles"""
+        groups = {}
+        for span in self.spans:
+            groups.setdefault((span["cat"], span["name"]), []).append(span)
+        rows = []
+        for (category, name), spans in groups.items():
+            walls = sorted(s["wall_s"] for s in spans)
+            rows.append({
+                "category": category,
+                "name": name,
+                "calls": len(spans),
+                "wall_s": sum(walls),
+                "cpu_s": sum(s["cpu_s"] for s in spans),
+                "p50_s": walls[len(walls) // 2],
+                "p99_s": walls[min(len(walls) - 1, int(len(walls) * 0.99))],
+                "peak_mem_bytes": max((s.get("peak_mem_bytes", 0) for s in spans), default=0),
+                "errors": sum(1 for s in spans if "error" in s["args"]),
+            })
+        return sorted(rows, key=lambda r: (r["category"], -r["wall_s"]))
+
+    def print_summary(self):
+        print("\n" + "=" * 50)
+        print("PROFILE:")
+        print("=" * 50)
+        for row in self.summary():
+            line = (f"{row['category']:<6} {row['name']:<40} {row['calls']:>4}x "
+                    f"wall {row['wall_s']:8.3f}s  cpu {row['cpu_s']:8.3f}s")
+            if row["category"] == 'http':
+                line += f"  p50 {row['p50_s'] * 1000:7.1f}ms  p99 {row['p99_s'] * 1000:7.1f}ms"
+            else:
+                line += f"  peak {row['peak_mem_bytes'] / 1e6:8.2f} MB"
+            if row["errors"]:
+                line += f"  errors {row['errors']}"
+            print(line)
+
+    def to_json(self):
+        return {"spans": self.spans, "summary": self.summary()}
+
+    def to_chrome_trace(self):
+        """Complete ("X") events in the Chrome trace-event format"""
+        events = []
+        for span in self.spans:
+            args = dict(span["args"])
+            args.update(cpu_s=round(span["cpu_s"], 6))
+            if "peak_mem_bytes" in span:
+                args["peak_mem_bytes"] = span["peak_mem_bytes"]
+            events.append({"name": span["name"], "cat": span["cat"], "ph": "X",
+                           "ts": span["ts_us"], "dur": span["wall_s"] * 1e6,
+                           "pid": span["pid"], "tid": span["tid"], "args": args})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, json_path=None, chrome_path=None):
+        if json_path:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_json(), f, indent=2, default=str)
+        if chrome_path:
+            with open(chrome_path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_chrome_trace(), f, default=str)
+
+
+def _http_span_name(method, url):
+    url = str(url)
+    host = url.split('/')[2] if '://' in url else url
+    return f"{method} {host}"
+
+
+def instrument_http(tracer):
+    """Record a span for every requests / httpx call made while tracing"""
+    try:
+        import requests
+
+        original_send = requests.Session.send
+        if not getattr(original_send, '__wrapped_by_tracer__', False):
+            def send(self, request, **kwargs):
+                with tracer.span(_http_span_name(request.method, request.url), 'http',
+                                 memory=False, url=str(request.url)) as span:
+                    response = original_send(self, request, **kwargs)
+                    span["args"]["status"] = response.status_code
+                    return response
+            send.__wrapped_by_tracer__ = True
+            requests.Session.send = send
+    except ImportError:
+        pass
+
+    try:
+        import httpx
+
+        original_sync = httpx.Client.send
+        original_async = httpx.AsyncClient.send
+        if not getattr(original_sync, '__wrapped_by_tracer__', False):
+            def sync_send(self, request, **kwargs):
+                with tracer.span(_http_span_name(request.method, request.url), 'http',
+                                 memory=False, url=str(request.url)) as span:
+                    response = original_sync(self, request, **kwargs)
+                    span["args"]["status"] = response.status_code
+                    return response
+
+            async def async_send(self, request, **kwargs):
+                with tracer.span(_http_span_name(request.method, request.url), 'http',
+                                 memory=False, url=str(request.url)) as span:
+                    response = await original_async(self, request, **kwargs)
+                    span["args"]["status"] = response.status_code
+                    return response
+
+            sync_send.__wrapped_by_tracer__ = async_send.__wrapped_by_tracer__ = True
+            httpx.Client.send = sync_send
+            httpx.AsyncClient.send = async_send
+    except ImportError:
+        pass
+
+
+def enable(namespace, stages=PIPELINE_STAGES, trace_memory=True):
+    """Start tracing: wrap each stage function found in namespace (a module or globals dict)"""
+    tracer = Tracer(trace_memory=trace_memory)
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    attrs = namespace if isinstance(namespace, dict) else vars(namespace)
+    for stage in stages:
+        fn = attrs.get(stage)
+        if callable(fn) and not getattr(fn, '__wrapped_by_tracer__', False):
+            attrs[stage] = tracer.wrap(fn)
+    instrument_http(tracer)
+    return tracer
+
+
+def add_arguments(parser):
+    """Add --profile / --trace options to an argparse parser"""
+    parser.add_argument("--profile", nargs='?', const='profile.json', default=None, metavar='JSON',
+                        help="Time each stage and write a JSON profile (default: profile.json)")
+    parser.add_argument("--trace", default=None, metavar='PATH',
+                        help="Write a Chrome trace-event file of stages and HTTP calls")
+
+
+def finish(tracer, args):
+    """Print the summary and write the files requested on the command line"""
+    tracer.print_summary()
+    tracer.export(json_path=args.profile, chrome_path=args.trace)
+    for path in (args.profile, args.trace):
+        if path:
+            print(f"Wrote {path}")